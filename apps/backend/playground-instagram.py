@@ -3,7 +3,7 @@ Instagram Scraper Playground - Instaloader
 Test script with detailed logging and error handling
 
 Installation:
-    pip3 install instaloader
+    pip3 install instaloader orjson
 
 Usage:
     python3 playground-instagram.py <username> [max_posts]
@@ -12,11 +12,111 @@ Example:
     python3 playground-instagram.py designstudiocairo 10
 """
 
+import asyncio
+import heapq
 import instaloader
 import json
+import re
+import requests
+import shelve
 import sys
 import time
-from datetime import datetime
+from datetime import datetime, timezone
+from itertools import islice
+from playground_common import RateLimiter, call_with_backoff, write_json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Max posts whose metadata is fetched concurrently
+POST_FETCH_CONCURRENCY = 8
+
+# Public profile endpoint: profile metadata plus the first 12 posts in one response
+WEB_PROFILE_INFO_URL = 'https://www.instagram.com/api/v1/users/web_profile_info/'
+INSTAGRAM_WEB_APP_ID = '936619743392459'
+
+# Hashtags and mentions in one scan; a mention may contain inner (not trailing) dots
+CAPTION_TAG_RE = re.compile(r'#(\w+)|@(\w(?:[\w.]*\w)?)')
+
+# On-disk cache of built post records, keyed by shortcode
+POST_CACHE_PATH = 'instagram_post_cache'
+POST_CACHE_TTL = 3600  # seconds
+
+# Instagram allows roughly 150 requests per 90s before answering 429
+RATE_LIMIT_CALLS = 150
+RATE_LIMIT_PERIOD = 90  # seconds
+
+def encode_jsonl(record):
+    """
+    Serialize one record as a JSONL line (bytes), orjson when available
+    """
+    if orjson is not None:
+        return orjson.dumps(record, option=orjson.OPT_NON_STR_KEYS) + b'\n'
+    return (json.dumps(record, ensure_ascii=False, default=lambda o: o.isoformat()) + '\n').encode('utf-8')
+
+def read_jsonl(path):
+    """
+    Yield records from a JSONL file written by a previous run.
+    A missing file yields nothing; a line torn by a crash is skipped.
+    """
+    try:
+        f = open(path, 'rb')
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+class PostStats:
+    """
+    Running aggregates over post records, so records can be streamed
+    to disk instead of held in memory until the end of the scrape
+    """
+    def __init__(self, top_n=3):
+        self.count = 0
+        self.type_counts = {}
+        self.sum_likes = self.sum_comments = self.sum_engagement = 0
+        self.top_n = top_n
+        self.top_posts = []  # (engagement_rate, -index, post summary) so ties keep scrape order
+    
+    def add(self, post):
+        post_type = post['type']
+        self.type_counts[post_type] = self.type_counts.get(post_type, 0) + 1
+        self.sum_likes += post['likes']
+        self.sum_comments += post['comments']
+        self.sum_engagement += post['engagement_rate']
+        # Only the fields printed for top posts are kept
+        summary = {key: post[key] for key in ('shortcode', 'type', 'likes', 'engagement_rate')}
+        entry = (post['engagement_rate'], -self.count, summary)
+        if len(self.top_posts) < self.top_n:
+            heapq.heappush(self.top_posts, entry)
+        else:
+            heapq.heappushpop(self.top_posts, entry)
+        self.count += 1
+    
+    def averages(self):
+        if not self.count:
+            return 0, 0, 0
+        return (
+            self.sum_likes / self.count,
+            self.sum_comments / self.count,
+            self.sum_engagement / self.count,
+        )
+    
+    def top(self):
+        return [post for _, _, post in sorted(self.top_posts, reverse=True)]
+
+RATE_LIMITER = RateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+
+def is_rate_limited(error):
+    return isinstance(error, instaloader.exceptions.TooManyRequestsException) or '429' in str(error)
 
 def print_header(text):
     print("\n" + "="*60)
@@ -26,6 +126,202 @@ def print_header(text):
 def print_section(text):
     print(f"\n--- {text} ---")
 
+def configure_session(session):
+    """
+    Mount a keep-alive connection pool on Instaloader's requests session
+    so repeated GraphQL calls reuse TCP/TLS connections.
+    429 is left to call_with_backoff so it is not retried twice.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503]),
+    )
+    session.mount("https://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+def fetch_web_profile_info(session, username):
+    """
+    Fetch the public web_profile_info user node, or None when the endpoint
+    is gated (login wall, 4xx/5xx, non-JSON) so the caller falls back to Instaloader
+    """
+    RATE_LIMITER.acquire()
+    try:
+        response = session.get(
+            WEB_PROFILE_INFO_URL,
+            params={'username': username},
+            headers={'X-IG-App-ID': INSTAGRAM_WEB_APP_ID},
+            timeout=15,
+        )
+        if response.status_code != 200:
+            return None
+        return response.json()['data']['user']
+    except (requests.RequestException, ValueError, KeyError, TypeError):
+        return None
+
+def public_post_node(post):
+    """
+    Build the same node shape from Instaloader's public Post accessors,
+    used when the raw node is not exposed (its layout is private to Instaloader)
+    """
+    location = post.location
+    node = {
+        '__typename': post.typename,
+        'is_video': post.is_video,
+        'video_duration': post.video_duration,
+        'edge_media_to_caption': {'edges': [{'node': {'text': post.caption or ''}}]},
+        'edge_media_preview_like': {'count': post.likes},
+        'edge_media_to_comment': {'count': post.comments},
+        'location': {'name': location.name} if location else None,
+        'taken_at_timestamp': post.date_utc.replace(tzinfo=timezone.utc).timestamp(),
+    }
+    if post.typename == 'GraphSidecar':
+        node['edge_sidecar_to_children'] = {
+            'edges': [{'node': {'display_url': slide.display_url}} for slide in post.get_sidecar_nodes()]
+        }
+    return node
+
+def load_post_node(post):
+    """
+    Return one dict holding every field build_post_data reads.
+    Instaloader resolves attributes one by one and may hit the network per
+    attribute; here the shortcode_media node is fetched at most once, and
+    only when the node from get_posts() lacks a field this post needs.
+    Falls back to public_post_node if Instaloader stops exposing its node.
+    """
+    node = getattr(post, '_node', None)
+    if not isinstance(node, dict):
+        return public_post_node(post)
+    needed = ['location']
+    if node.get('is_video'):
+        needed.append('video_duration')
+    if node.get('__typename') == 'GraphSidecar':
+        needed.append('edge_sidecar_to_children')
+    if all(key in node for key in needed):
+        return node
+    # Instaloader caches the full node on the post, so later attribute reads stay offline
+    full_metadata = getattr(post, '_full_metadata', None)
+    if not isinstance(full_metadata, dict):
+        return public_post_node(post)
+    return {**node, **full_metadata}
+
+def node_count(node, *keys):
+    """
+    First available edge count among `keys` (Instagram renames these between endpoints)
+    """
+    for key in keys:
+        edge = node.get(key)
+        if edge and edge.get('count') is not None:
+            return edge['count']
+    return 0
+
+def parse_caption_tags(caption):
+    """
+    Return (hashtags, mentions) from one pass over the lowercased caption,
+    matching Instaloader's caption_hashtags/caption_mentions casing
+    """
+    hashtags = []
+    mentions = []
+    for hashtag, mention in CAPTION_TAG_RE.findall(caption.lower()):
+        if hashtag:
+            hashtags.append(hashtag)
+        else:
+            mentions.append(mention)
+    return hashtags, mentions
+
+def build_post_data(post, followers):
+    """
+    Build the post record from a single node dict instead of per-attribute lookups
+    """
+    node = load_post_node(post)
+    typename = node.get('__typename')
+    is_video = bool(node.get('is_video'))
+    video_duration = node.get('video_duration') if is_video else None
+    
+    # Determine post type
+    slides = []
+    if typename == 'GraphSidecar':
+        post_type = 'CAROUSEL'
+        slides = [edge['node'] for edge in node.get('edge_sidecar_to_children', {}).get('edges', [])]
+        type_detail = f"Carousel ({len(slides)} slides)"
+    elif typename == 'GraphVideo':
+        post_type = 'REEL'
+        type_detail = f"Video ({video_duration}s)"
+    elif typename == 'GraphImage':
+        post_type = 'SINGLE'
+        type_detail = "Image"
+    else:
+        post_type = typename
+        type_detail = typename
+    
+    caption_edges = node.get('edge_media_to_caption', {}).get('edges', [])
+    caption = (caption_edges[0]['node'].get('text') or '') if caption_edges else ''
+    hashtags, mentions = parse_caption_tags(caption)
+    
+    likes = node_count(node, 'edge_media_preview_like', 'edge_liked_by')
+    comments = node_count(node, 'edge_media_to_comment', 'edge_media_to_parent_comment', 'edge_media_preview_comment')
+    location = node.get('location')
+    
+    # Engagement metrics
+    engagement_rate = ((likes + comments) / followers * 100) if followers > 0 else 0
+    
+    post_data = {
+        'shortcode': post.shortcode,
+        'url': f'https://instagram.com/p/{post.shortcode}',
+        'type': post_type,
+        'typename': typename,
+        'caption': caption,
+        'likes': likes,
+        'comments': comments,
+        'engagement_rate': round(engagement_rate, 2),
+        'date': datetime.fromtimestamp(node['taken_at_timestamp'], timezone.utc),
+        'is_video': is_video,
+        'video_duration': video_duration,
+        'hashtags': hashtags,
+        'mentions': mentions,
+        'location': location.get('name') if location else None,
+        'sidecar_nodes': [slide.get('display_url') for slide in slides]
+    }
+    return post_data, type_detail
+
+async def fetch_posts_async(posts, followers, cache=None, concurrency=POST_FETCH_CONCURRENCY):
+    """
+    Fetch post metadata concurrently, bounded by a semaphore.
+    Fresh entries in `cache` (a shelve keyed by shortcode) skip the network entirely.
+    Returns (post_data, type_detail) or the InstaloaderException raised per post, in input order.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def fetch_post(post):
+        # Cache is only touched from the event loop thread, never from workers
+        shortcode = post.shortcode
+        entry = cache.get(shortcode) if cache is not None else None
+        if entry and time.time() - entry['cached_at'] < POST_CACHE_TTL:
+            return entry['post_data'], entry['type_detail']
+        
+        async with semaphore:
+            try:
+                outcome = await asyncio.to_thread(
+                    call_with_backoff, build_post_data, post, followers,
+                    limiter=RATE_LIMITER, is_rate_limited=is_rate_limited,
+                )
+            except instaloader.exceptions.InstaloaderException as e:
+                # Expected per-post failures (private/removed media, bad requests,
+                # connection drops); anything else is a bug and aborts the scrape
+                return e
+        
+        if cache is not None:
+            post_data, type_detail = outcome
+            cache[shortcode] = {
+                'cached_at': time.time(),
+                'post_data': post_data,
+                'type_detail': type_detail,
+            }
+        return outcome
+    
+    return await asyncio.gather(*(fetch_post(post) for post in posts))
+
 def scrape_instagram_profile(username, max_posts=20):
     """
     Scrape Instagram profile with detailed logging
@@ -44,6 +340,8 @@ def scrape_instagram_profile(username, max_posts=20):
     L.download_comments = False
     L.save_metadata = False
     
+    configure_session(L.context._session)
+    
     print("✓ Instaloader initialized")
     print(f"  Target: @{username}")
     print(f"  Max posts: {max_posts}")
@@ -53,7 +351,14 @@ def scrape_instagram_profile(username, max_posts=20):
         print_section("Fetching Profile Data")
         start_time = time.time()
         
-        profile = instaloader.Profile.from_username(L.context, username)
+        # One public JSON request covers the profile and its first page of posts;
+        # Instaloader's GraphQL handshake is only needed when that is gated
+        user_node = fetch_web_profile_info(L.context._session, username)
+        if user_node:
+            profile = instaloader.Profile(L.context, user_node)
+            print("✓ Using web_profile_info fast path")
+        else:
+            profile = instaloader.Profile.from_username(L.context, username)
         
         profile_time = time.time() - start_time
         print(f"✓ Profile loaded in {profile_time:.2f}s")
@@ -93,134 +398,113 @@ def scrape_instagram_profile(username, max_posts=20):
         
         # Scrape posts
         print_section(f"Scraping Posts (Max: {max_posts})")
-        posts_data = []
-        post_count = 0
+        
+        # Records are appended to a per-profile JSONL file as they arrive, so a
+        # crash keeps everything scraped so far and a rerun resumes from it
+        posts_file = f"instagram_{username}.jsonl"
+        stats = PostStats()
+        scraped_shortcodes = set()
+        for record in read_jsonl(posts_file):
+            scraped_shortcodes.add(record['shortcode'])
+            stats.add(record)
+        if scraped_shortcodes:
+            print(f"\n  Resuming: {len(scraped_shortcodes)} posts already in {posts_file}")
         
         print("\nFetching posts...")
-        for post in profile.get_posts():
-            if post_count >= max_posts:
-                break
-            
-            post_count += 1
-            print(f"\n  Post {post_count}/{max_posts}")
-            
-            try:
-                # Determine post type
-                if post.typename == 'GraphSidecar':
-                    post_type = 'CAROUSEL'
-                    slides = post.get_sidecar_nodes()
-                    slide_count = sum(1 for _ in slides)
-                    type_detail = f"Carousel ({slide_count} slides)"
-                elif post.typename == 'GraphVideo':
-                    post_type = 'REEL'
-                    type_detail = f"Video ({post.video_duration}s)"
-                elif post.typename == 'GraphImage':
-                    post_type = 'SINGLE'
-                    type_detail = "Image"
-                else:
-                    post_type = post.typename
-                    type_detail = post.typename
-                
-                # Caption preview
-                caption = post.caption or ''
-                caption_preview = caption[:50] + '...' if len(caption) > 50 else caption
+        feed_edges = user_node.get('edge_owner_to_timeline_media', {}).get('edges', []) if user_node else []
+        if feed_edges and len(feed_edges) >= min(max_posts, profile.mediacount):
+            # The fast-path response already holds every post asked for
+            post_iter = (instaloader.Post(L.context, edge['node'], profile) for edge in feed_edges)
+        else:
+            # Instaloader only paginates shortcodes here; per-post metadata is fetched concurrently
+            post_iter = profile.get_posts()
+        posts = [
+            post for post in islice(post_iter, max_posts)
+            if post.shortcode not in scraped_shortcodes
+        ]
+        with shelve.open(POST_CACHE_PATH) as cache:
+            fetched = asyncio.run(fetch_posts_async(posts, profile.followers, cache))
+        
+        with open(posts_file, 'ab') as out:
+            for post_count, outcome in enumerate(fetched, 1):
+                print(f"\n  Post {post_count}/{len(posts)}")
                 
-                # Engagement metrics
-                engagement_rate = ((post.likes + post.comments) / profile.followers * 100) if profile.followers > 0 else 0
+                match outcome:
+                    case instaloader.exceptions.TooManyRequestsException():
+                        print(f"    ✗ Rate limited, post skipped: {str(outcome)}")
+                        continue
+                    case instaloader.exceptions.InstaloaderException():
+                        print(f"    ✗ Error scraping post: {str(outcome)}")
+                        continue
+                    case (post_data, type_detail):
+                        pass
                 
-                post_data = {
-                    'shortcode': post.shortcode,
-                    'url': f'https://instagram.com/p/{post.shortcode}',
-                    'type': post_type,
-                    'typename': post.typename,
-                    'caption': caption,
-                    'likes': post.likes,
-                    'comments': post.comments,
-                    'engagement_rate': round(engagement_rate, 2),
-                    'date': post.date_utc.isoformat(),
-                    'is_video': post.is_video,
-                    'video_duration': post.video_duration if post.is_video else None,
-                    'hashtags': list(post.caption_hashtags) if post.caption_hashtags else [],
-                    'mentions': list(post.caption_mentions) if post.caption_mentions else [],
-                    'location': post.location.name if post.location else None
-                }
+                out.write(encode_jsonl(post_data))
+                out.flush()
+                stats.add(post_data)
                 
-                posts_data.append(post_data)
+                caption = post_data['caption']
+                caption_preview = caption[:50] + '...' if len(caption) > 50 else caption
                 
                 # Log details
                 print(f"    ✓ Type: {type_detail}")
-                print(f"    ✓ Likes: {post.likes:,}")
-                print(f"    ✓ Comments: {post.comments:,}")
-                print(f"    ✓ Engagement: {engagement_rate:.2f}%")
-                print(f"    ✓ Date: {post.date_utc.strftime('%Y-%m-%d')}")
+                print(f"    ✓ Likes: {post_data['likes']:,}")
+                print(f"    ✓ Comments: {post_data['comments']:,}")
+                print(f"    ✓ Engagement: {post_data['engagement_rate']:.2f}%")
+                print(f"    ✓ Date: {post_data['date'].strftime('%Y-%m-%d')}")
                 print(f"    ✓ Caption: {caption_preview}")
-                
-                # Small delay to avoid rate limiting
-                time.sleep(0.5)
-                
-            except Exception as e:
-                print(f"    ✗ Error scraping post: {str(e)}")
-                continue
         
         total_time = time.time() - start_time
         
         # Summary
         print_section("Scraping Summary")
-        print(f"  ✓ Total posts scraped: {len(posts_data)}")
+        print(f"  ✓ Total posts scraped: {stats.count}")
         print(f"  ✓ Total time: {total_time:.2f}s")
-        print(f"  ✓ Average time per post: {total_time/len(posts_data):.2f}s")
-        
-        # Post type breakdown
-        type_counts = {}
-        for post in posts_data:
-            post_type = post['type']
-            type_counts[post_type] = type_counts.get(post_type, 0) + 1
+        print(f"  ✓ Average time per post: {total_time/max(stats.count, 1):.2f}s")
         
         print("\n  Post Types:")
-        for post_type, count in type_counts.items():
-            percentage = (count / len(posts_data) * 100)
+        for post_type, count in stats.type_counts.items():
+            percentage = (count / stats.count * 100)
             print(f"    {post_type}: {count} ({percentage:.1f}%)")
         
+        avg_likes, avg_comments, avg_engagement = stats.averages()
+        
         # Engagement stats
-        if posts_data:
-            avg_likes = sum(p['likes'] for p in posts_data) / len(posts_data)
-            avg_comments = sum(p['comments'] for p in posts_data) / len(posts_data)
-            avg_engagement = sum(p['engagement_rate'] for p in posts_data) / len(posts_data)
-            
+        if stats.count:
             print("\n  Engagement Averages:")
             print(f"    Likes: {avg_likes:,.0f}")
             print(f"    Comments: {avg_comments:,.0f}")
             print(f"    Engagement Rate: {avg_engagement:.2f}%")
         
         # Top performing posts
-        if posts_data:
-            sorted_posts = sorted(posts_data, key=lambda x: x['engagement_rate'], reverse=True)
+        if stats.count:
             print("\n  Top 3 Posts by Engagement:")
-            for i, post in enumerate(sorted_posts[:3], 1):
+            for i, post in enumerate(stats.top(), 1):
                 print(f"    {i}. {post['engagement_rate']:.1f}% - {post['type']} - {post['likes']:,} likes")
         
-        # Save to JSON
-        output_file = f"instagram_{username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        # Save the summary next to the streamed posts
+        output_file = f"instagram_{username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_summary.json"
         result = {
             'success': True,
-            'scraped_at': datetime.now().isoformat(),
+            'scraped_at': datetime.now(),
             'profile': profile_data,
-            'posts': posts_data,
+            'posts_file': posts_file,
             'stats': {
-                'total_posts': len(posts_data),
+                'total_posts': stats.count,
                 'scraping_time': total_time,
-                'post_types': type_counts,
-                'avg_likes': avg_likes if posts_data else 0,
-                'avg_comments': avg_comments if posts_data else 0,
-                'avg_engagement_rate': avg_engagement if posts_data else 0
+                'post_types': stats.type_counts,
+                'avg_likes': avg_likes,
+                'avg_comments': avg_comments,
+                'avg_engagement_rate': avg_engagement,
+                'top_posts': stats.top()
             }
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        write_json(output_file, result)
         
         print_section("Output")
-        print(f"  ✓ Data saved to: {output_file}")
+        print(f"  ✓ Posts saved to: {posts_file}")
+        print(f"  ✓ Summary saved to: {output_file}")
         
         return result
         
@@ -268,7 +552,7 @@ def main():
     print_header("TEST COMPLETE")
     
     if result['success']:
-        print("✓ SUCCESS - Data scraped and saved to JSON")
+        print("✓ SUCCESS - Data scraped and saved to JSONL")
     else:
         print(f"✗ FAILED - {result.get('error', 'Unknown error')}")
     
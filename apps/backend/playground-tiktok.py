@@ -3,18 +3,19 @@ TikTok Scraper Playground (Resilient Version)
 Uses multiple methods to extract data even if TikTok blocks specific calls.
 
 Installation:
-    pip3 install yt-dlp fake-useragent
+    pip3 install yt-dlp fake-useragent orjson
 
 Usage:
     python3 playground-tiktok.py <username> [max_posts]
 """
 
+import asyncio
 import sys
-import json
 import time
 from datetime import datetime
+from itertools import islice
+from playground_common import RateLimiter, call_with_backoff, write_json
 import yt_dlp
-import random
 
 try:
     from fake_useragent import UserAgent
@@ -26,6 +27,89 @@ except ImportError:
             return "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.114 Safari/537.36"
     ua = UserAgent()
 
+# Max video detail refetches in flight at once
+DETAIL_FETCH_CONCURRENCY = 4
+
+# Detail refetches share one token bucket instead of fixed sleeps
+RATE_LIMIT_CALLS = 10
+RATE_LIMIT_PERIOD = 10  # seconds
+
+RATE_LIMITER = RateLimiter(RATE_LIMIT_CALLS, RATE_LIMIT_PERIOD)
+
+def is_rate_limited(error):
+    message = str(error)
+    return '429' in message or 'Too Many Requests' in message
+
+def fetch_video_details(detail_ydl, video_url):
+    return call_with_backoff(
+        lambda: detail_ydl.extract_info(video_url, download=False),
+        limiter=RATE_LIMITER,
+        is_rate_limited=is_rate_limited,
+    )
+
+def build_flat_post(entry, username):
+    """
+    Basic info is often available directly in the playlist entry
+    even if detailed extraction fails
+    """
+    post_id = entry.get('id')
+    return {
+        'id': post_id,
+        'url': entry.get('url') or f"https://www.tiktok.com/@{username}/video/{post_id}",
+        'description': entry.get('title', ''),
+        'views': entry.get('view_count', 0),
+        'likes': entry.get('like_count', 0),
+        'comments': entry.get('comment_count', 0),
+        'shares': entry.get('repost_count', 0),
+        'duration': entry.get('duration', 0),
+        'date': entry.get('upload_date'),
+        'thumbnail': entry.get('thumbnail'),
+        'extraction_method': 'playlist_metadata'
+    }
+
+def apply_video_details(post, vid_info):
+    post['likes'] = vid_info.get('like_count', post['likes'])
+    post['views'] = vid_info.get('view_count', post['views'])
+    post['comments'] = vid_info.get('comment_count', post['comments'])
+    post['shares'] = vid_info.get('repost_count', post['shares'])
+    post['description'] = vid_info.get('description') or post['description']
+    post['extraction_method'] = 'full_detail'
+
+async def collect_posts_async(entries, username, max_posts, detail_ydl, workers=DETAIL_FETCH_CONCURRENCY):
+    """
+    Producer walks the flat playlist entries and queues posts missing metrics;
+    `workers` consumers refetch those through the shared YoutubeDL while the
+    producer keeps going. Throughput is bounded by the rate limiter, not sleeps.
+    """
+    queue = asyncio.Queue(maxsize=16)
+    posts_data = []
+    
+    async def producer():
+        for i, entry in enumerate(islice(entries, max_posts)):
+            post = build_flat_post(entry, username)
+            print(f"  Post {i+1}/{max_posts}: {post['description'][:40]}...")
+            posts_data.append(post)
+            # If some metrics are missing (common in flat extraction), refetch the video
+            if post['likes'] == 0 and post['views'] == 0:
+                await queue.put(post)
+        for _ in range(workers):
+            await queue.put(None)
+    
+    async def worker():
+        while (post := await queue.get()) is not None:
+            try:
+                vid_info = await asyncio.to_thread(fetch_video_details, detail_ydl, post['url'])
+            except Exception:
+                vid_info = None
+            if not vid_info:
+                print(f"    ⚠️ {post['id']}: Detailed fetch blocked, using basic info")
+                continue
+            apply_video_details(post, vid_info)
+            print(f"    ✓ {post['id']}: Detailed fetch successful")
+    
+    await asyncio.gather(producer(), *(worker() for _ in range(workers)))
+    return posts_data
+
 def scrape_tiktok(username, max_posts=5):
     print(f"\n=== TIKTOK SCRAPER (Resilient) ===\n")
     print(f"Target: @{username}")
@@ -39,14 +123,12 @@ def scrape_tiktok(username, max_posts=5):
         'playlistend': max_posts,
         'ignoreerrors': True,
         'no_warnings': True,
-        # Rotate user agents and add delays
         'user_agent': ua.random,
-        'sleep_interval': 2,
-        'max_sleep_interval': 5,
     }
 
     start_time = time.time()
     posts_data = []
+    extraction_success = 0
     
     try:
         print("\nFetching profile...")
@@ -67,69 +149,25 @@ def scrape_tiktok(username, max_posts=5):
                 
             print(f"\nFound {len(entries)} videos. Fetching details...")
             
-            # Process each video
-            for i, entry in enumerate(entries):
-                if i >= max_posts:
-                    break
-                
-                # Basic info is often available directly in the entry
-                # even if detailed extraction fails
-                post_id = entry.get('id')
-                title = entry.get('title', '')
-                video_url = entry.get('url') or f"https://www.tiktok.com/@{username}/video/{post_id}"
-                
-                print(f"  Post {i+1}/{max_posts}: {title[:40]}...")
-                
-                post = {
-                    'id': post_id,
-                    'url': video_url,
-                    'description': title,
-                    'views': entry.get('view_count', 0),
-                    'likes': entry.get('like_count', 0),
-                    'comments': entry.get('comment_count', 0),
-                    'shares': entry.get('repost_count', 0),
-                    'duration': entry.get('duration', 0),
-                    'date': entry.get('upload_date'),
-                    'thumbnail': entry.get('thumbnail'),
-                    'extraction_method': 'playlist_metadata'
-                }
-                
-                # If some metrics are missing (common in flat extraction), 
-                # we could try to fetch individual video, but that often triggers blocks.
-                # Let's inspect what we got.
-                
-                if post['likes'] == 0 and post['views'] == 0:
-                    # Try to fetch individual video details cautiously
-                    try:
-                        time.sleep(random.uniform(1.0, 3.0)) # Random delay
-                        print(f"    Fetching extra details...")
-                        
-                        # Use a fresh instance with new UA for detail fetch
-                        detail_opts = {
-                            'quiet': True,
-                            'ignoreerrors': True,
-                            'no_warnings': True,
-                            'user_agent': ua.random
-                        }
-                        
-                        with yt_dlp.YoutubeDL(detail_opts) as detail_ydl:
-                            vid_info = detail_ydl.extract_info(video_url, download=False)
-                            if vid_info:
-                                post['likes'] = vid_info.get('like_count', post['likes'])
-                                post['views'] = vid_info.get('view_count', post['views'])
-                                post['comments'] = vid_info.get('comment_count', post['comments'])
-                                post['shares'] = vid_info.get('repost_count', post['shares'])
-                                post['description'] = vid_info.get('description') or post['description']
-                                post['extraction_method'] = 'full_detail'
-                                print(f"    ✓ Detailed fetch successful")
-                    except Exception as e:
-                        print(f"    ⚠️ Detailed fetch blocked, using basic info")
-                
-                posts_data.append(post)
-                
-                # Log what we found
-                print(f"    ✓ Views: {post.get('views', 'N/A')}")
-                print(f"    ✓ Likes: {post.get('likes', 'N/A')}")
+            # One YoutubeDL shared by every refetch: construction parses extractor
+            # configs and rebuilds the cookiejar, so it is not repeated per video.
+            # Errors must raise so rate limiting can be detected and backed off.
+            detail_opts = {
+                'quiet': True,
+                'ignoreerrors': False,
+                'no_warnings': True,
+                'user_agent': ua.random
+            }
+            
+            with yt_dlp.YoutubeDL(detail_opts) as detail_ydl:
+                posts_data = asyncio.run(collect_posts_async(entries, username, max_posts, detail_ydl))
+            
+            # Log what we found, counting posts with metrics in the same pass
+            print()
+            for i, post in enumerate(posts_data):
+                print(f"  Post {i+1}: ✓ Views: {post.get('views', 'N/A')}, ✓ Likes: {post.get('likes', 'N/A')}")
+                if post['likes'] > 0:
+                    extraction_success += 1
                 
     except Exception as e:
         print(f"\n✗ Critical Error: {str(e)}")
@@ -142,17 +180,16 @@ def scrape_tiktok(username, max_posts=5):
     result = {
         'success': True,
         'username': username,
-        'scraped_at': datetime.now().isoformat(),
+        'scraped_at': datetime.now(),
         'posts': posts_data,
         'stats': {
             'total_posts': len(posts_data),
-            'extraction_success': len([p for p in posts_data if p['likes'] > 0]),
+            'extraction_success': extraction_success,
             'time': total_time
         }
     }
     
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False)
+    write_json(output_file, result)
         
     print(f"\n✓ Data saved to: {output_file}")
     print(f"✓ Success rate: {result['stats']['extraction_success']}/{len(posts_data)} posts with metrics")
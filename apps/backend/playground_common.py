@@ -0,0 +1,68 @@
+"""
+Shared helpers for the scraper playgrounds (playground-instagram.py, playground-tiktok.py)
+"""
+
+import json
+import random
+import threading
+import time
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_DELAY = 2.0  # seconds, doubled per retry
+
+class RateLimiter:
+    """
+    Token bucket allowing `rate` calls per `period` seconds.
+    Only sleeps when the bucket is empty; thread-safe so workers can share it.
+    """
+    def __init__(self, rate, period):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.fill_rate = rate / period
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+def call_with_backoff(fn, *args, limiter, is_rate_limited, max_attempts=MAX_ATTEMPTS, base_delay=BACKOFF_BASE_DELAY):
+    """
+    Call fn through `limiter`; back off exponentially (with jitter)
+    only when the server signals rate limiting
+    """
+    for attempt in range(max_attempts):
+        limiter.acquire()
+        try:
+            return fn(*args)
+        except Exception as e:
+            if attempt == max_attempts - 1 or not is_rate_limited(e):
+                raise
+            delay = base_delay * (2 ** attempt) * random.uniform(0.8, 1.2)
+            print(f"    ⚠️ Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_attempts})")
+            time.sleep(delay)
+
+def write_json(path, data):
+    """
+    Write results with orjson when available (C serializer, native datetime),
+    falling back to stdlib json
+    """
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False, default=lambda o: o.isoformat())
@@ -4,6 +4,8 @@ Camoufox-based Instagram post-to-media resolver.
 Visits each post page, extracts direct image/video URLs (handles carousels).
 Output: JSON {success, mediaUrls: string[], thumbnailUrl?: string, error?} to stdout
 Run: python3 camoufox_insta_downloader.py <post_url>
+Worker mode: python3 camoufox_insta_downloader.py --stdin
+  (one post URL per stdin line, one JSON result per stdout line, single shared browser)
 """
 
 import json
@@ -12,16 +14,29 @@ import re
 import ssl
 import subprocess
 import sys
+import tempfile
+import threading
 import time
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from urllib.parse import unquote, urlparse
 
 try:
     import certifi
-    _SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+    _CA_BUNDLE = certifi.where()
+    _SSL_CTX = ssl.create_default_context(cafile=_CA_BUNDLE)
 except ImportError:
+    _CA_BUNDLE = None
     _SSL_CTX = ssl.create_default_context()
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:
+    requests = None
+
 def _env_true(name: str, fallback: bool = False) -> bool:
     raw = str(os.environ.get(name, "")).strip().lower()
     if not raw:
@@ -68,14 +83,50 @@ def with_proxy(cmd):
         return [*cmd, "--proxy", PROXY_URL]
     return cmd
 
-def open_url(req, timeout):
+def _build_opener():
+    """Build the urllib opener once; handlers and the SSL context are reused per request."""
     if PROXY_URL:
-        opener = urllib.request.build_opener(
+        return urllib.request.build_opener(
             urllib.request.ProxyHandler({"http": PROXY_URL, "https": PROXY_URL}),
             urllib.request.HTTPSHandler(context=_SSL_CTX),
         )
-        return opener.open(req, timeout=timeout)
-    return urllib.request.urlopen(req, timeout=timeout, context=_SSL_CTX)
+    return urllib.request.build_opener(urllib.request.HTTPSHandler(context=_SSL_CTX))
+
+_OPENER = _build_opener()
+
+def open_url(req, timeout):
+    return _OPENER.open(req, timeout=timeout)
+
+def _build_http_session():
+    """Keep-alive session shared by every plain HTTP fetch in this process."""
+    if requests is None:
+        return None
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503]),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Connection"] = "keep-alive"
+    if PROXY_URL:
+        session.proxies = {"http": PROXY_URL, "https": PROXY_URL}
+    if _CA_BUNDLE:
+        session.verify = _CA_BUNDLE
+    return session
+
+HTTP_SESSION = _build_http_session()
+
+def fetch_bytes(url: str, headers: dict, timeout: float) -> bytes:
+    if HTTP_SESSION is not None:
+        resp = HTTP_SESSION.get(url, headers=headers, timeout=timeout)
+        # An error page must not pass for the real document
+        resp.raise_for_status()
+        return resp.content
+    req = urllib.request.Request(url, headers=headers)
+    with open_url(req, timeout=timeout) as resp:
+        return resp.read()
 
 def _get_camoufox():
     try:
@@ -84,19 +135,84 @@ def _get_camoufox():
     except ImportError:
         return None
 
+FAST_PATH_TIMEOUT_SECONDS = 20
+# After og:image resolves, how long yt-dlp's direct URLs may still take to win
+YTDLP_GRACE_SECONDS = 2.5
+
+# Single pass over the raw HTML bytes; lookaheads make attribute order irrelevant
+_OG_IMAGE_RE = re.compile(rb'<meta(?=[^>]+property="og:image")(?=[^>]+content="([^"]+)")', re.I)
+_OG_IMAGE_FALLBACK_RES = (
+    re.compile(rb'<meta[^>]+property="og:image"[^>]+content="([^"]+)"'),
+    re.compile(rb'content="([^"]+)"[^>]+property="og:image"'),
+)
+
 INSTAGRAM_PAGE_REGEX = re.compile(
     r"^https?://(?:www\.)?instagram\.com/(?:[^/]+/)?(p|reel|tv)/([A-Za-z0-9_-]+)",
     re.I,
 )
 
 
+MEDIA_CACHE_DIR = os.environ.get("INSTAGRAM_MEDIA_CACHE_DIR") or os.path.join(
+    tempfile.gettempdir(), "camoufox_insta_cache"
+)
+MEDIA_CACHE_TTL_SECONDS = int(os.environ.get("INSTAGRAM_MEDIA_CACHE_TTL_SECONDS", "3600"))
+
+
+def _media_cache_path(shortcode: str) -> str:
+    return os.path.join(MEDIA_CACHE_DIR, f"{shortcode}.json")
+
+
+def read_cached_result(shortcode: str):
+    """Return a previously resolved result for this shortcode if still fresh."""
+    if MEDIA_CACHE_TTL_SECONDS <= 0:
+        return None
+    path = _media_cache_path(shortcode)
+    try:
+        if time.time() - os.path.getmtime(path) > MEDIA_CACHE_TTL_SECONDS:
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_cached_result(shortcode: str, result: dict) -> None:
+    """Persist a successful result; written atomically since callers run in parallel."""
+    if MEDIA_CACHE_TTL_SECONDS <= 0 or not result.get("success"):
+        return
+    path = _media_cache_path(shortcode)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(MEDIA_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+MEDIA_READY_JS = """
+() => !!(
+    (window._sharedData && window._sharedData.entry_data)
+    || document.querySelector('meta[property="og:image"]')
+    || document.querySelector('img[src*="cdninstagram"], img[src*="fbcdn"]')
+)
+"""
+
+
 def extract_media_js():
     """Return JS to extract media URLs from Instagram post page."""
     return r"""
     () => {
         const mediaUrls = [];
+        const seen = new Set();
         let thumbnailUrl = null;
-        const add = (url) => { if (url && (url.includes('cdninstagram') || url.includes('fbcdn')) && !mediaUrls.includes(url)) mediaUrls.push(url); };
+        const add = (url) => {
+            if (url && !seen.has(url) && (url.includes('cdninstagram') || url.includes('fbcdn'))) {
+                seen.add(url);
+                mediaUrls.push(url);
+            }
+        };
         try {
             if (window._sharedData && window._sharedData.entry_data) {
                 const keys = Object.keys(window._sharedData.entry_data);
@@ -119,8 +235,12 @@ def extract_media_js():
             }
             const scripts = document.querySelectorAll('script[type="application/json"]');
             for (const s of scripts) {
+                // Cheap substring reject: most tags carry no media and are tens of KB to parse
+                const txt = s.textContent || '';
+                if (!txt.includes('display_url') && !txt.includes('video_url') &&
+                    !txt.includes('image_versions2') && !txt.includes('video_versions')) continue;
                 try {
-                    const data = JSON.parse(s.textContent || '{}');
+                    const data = JSON.parse(txt);
                     const items = data.items || data.required?.sections?.flatMap(x =>
                         x?.layout?.content?.mediaset?.layout_content?.mediaset?.media || []
                     ) || [];
@@ -165,38 +285,175 @@ def extract_media_js():
     """
 
 
-def resolve_post(post_url: str, debug: bool = False) -> dict:
-    """Visit Instagram post page and extract direct media URLs."""
+def resolve_post(post_url: str, debug: bool = False, shared: "SharedBrowser" = None) -> dict:
+    """Visit Instagram post page and extract direct media URLs (cached by shortcode)."""
     post_url = post_url.strip()
-    if not INSTAGRAM_PAGE_REGEX.match(post_url):
+    match = INSTAGRAM_PAGE_REGEX.match(post_url)
+    if not match:
         return {"success": False, "mediaUrls": [], "error": "Invalid Instagram post URL"}
 
-    if "/?" in post_url:
-        post_url = post_url.split("/?")[0]
-    if not post_url.endswith("/"):
-        post_url += "/"
+    shortcode = match.group(2)
+    cached = read_cached_result(shortcode)
+    if cached:
+        return cached
+
+    result = _resolve_post_uncached(post_url, debug=debug, shared=shared)
+    write_cached_result(shortcode, result)
+    return result
 
-    collected_urls: list = []
 
+def _fetch_og_image(post_url: str, debug: bool = False):
+    """Cheap path: read og:image from the crawler-facing HTML."""
     try:
-        req = urllib.request.Request(
+        html = fetch_bytes(
             post_url,
             headers={"User-Agent": "facebookexternalhit/1.1 (+http://www.facebook.com/externalhit_uatext.php)"},
+            timeout=15,
         )
-        with open_url(req, timeout=15) as resp:
-            html = resp.read().decode("utf-8", errors="ignore")
-        m = re.search(r'<meta[^>]+property="og:image"[^>]+content="([^"]+)"', html)
+        m = _OG_IMAGE_RE.search(html)
         if not m:
-            m = re.search(r'content="([^"]+)"[^>]+property="og:image"', html)
+            for pattern in _OG_IMAGE_FALLBACK_RES:
+                m = pattern.search(html)
+                if m:
+                    break
         if debug and not m:
-            import sys
             print(f"[debug] og:image m={m is not None} html_len={len(html)}", file=sys.stderr)
         if m:
-            url = m.group(1).replace("&amp;", "&")
+            url = m.group(1).decode("utf-8", errors="ignore").replace("&amp;", "&")
             if url.startswith("http"):
                 return {"success": True, "mediaUrls": [url], "thumbnailUrl": url}
     except Exception:
         pass
+    return None
+
+
+def _try_ytdlp(post_url: str, procs: list, stop: threading.Event):
+    """
+    Cheap path: ask yt-dlp for direct URLs. The process is exposed via `procs` so the race can kill it.
+    Only a clean exit counts; a run that failed, timed out or was cut short by the race yields None.
+    """
+    try:
+        proc = subprocess.Popen(
+            with_proxy(["yt-dlp", "-g", "--no-playlist", post_url]),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        )
+    except Exception:
+        return None
+    procs.append(proc)
+    if stop.is_set():
+        proc.terminate()
+    # Killing the process closes stdout, which ends the read loop below
+    watchdog = threading.Timer(30, proc.kill)
+    watchdog.start()
+    urls = []
+    try:
+        for line in proc.stdout:
+            if stop.is_set():
+                proc.terminate()
+                break
+            line = line.strip()
+            if line.startswith("http"):
+                urls.append(line)
+    except Exception:
+        pass
+    finally:
+        watchdog.cancel()
+        proc.stdout.close()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+    if urls and proc.returncode == 0:
+        return {"success": True, "mediaUrls": urls, "thumbnailUrl": urls[0]}
+    return None
+
+
+def _race_fast_paths(post_url: str, debug: bool = False):
+    """
+    Run og:image and yt-dlp concurrently and return the first non-empty result. yt-dlp's direct
+    media URLs are preferred, but an og:image result only waits YTDLP_GRACE_SECONDS for them.
+    """
+    procs: list = []
+    stop = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=2)
+    og_future = executor.submit(_fetch_og_image, post_url, debug)
+    ytdlp_future = executor.submit(_try_ytdlp, post_url, procs, stop)
+    futures = [og_future, ytdlp_future]
+    deadline = time.monotonic() + FAST_PATH_TIMEOUT_SECONDS
+    og_result = None
+    try:
+        for future in as_completed(futures, timeout=FAST_PATH_TIMEOUT_SECONDS):
+            try:
+                result = future.result()
+            except Exception:
+                result = None
+            if not result:
+                continue
+            if future is ytdlp_future:
+                return result
+            og_result = result
+            break
+        if og_result:
+            grace = min(YTDLP_GRACE_SECONDS, deadline - time.monotonic())
+            try:
+                result = ytdlp_future.result(timeout=max(0, grace))
+            except Exception:
+                result = None
+            if result:
+                return result
+    except FuturesTimeoutError:
+        pass
+    finally:
+        stop.set()
+        for future in futures:
+            future.cancel()
+        for proc in procs:
+            if proc.poll() is None:
+                proc.terminate()
+        executor.shutdown(wait=False)
+    return og_result
+
+
+def _camoufox_launch_options() -> dict:
+    launch_options = {"headless": True, "humanize": True}
+    proxy_config = _resolve_camoufox_proxy_config()
+    if proxy_config:
+        launch_options["proxy"] = proxy_config
+    return launch_options
+
+
+class SharedBrowser:
+    """Lazily launch one Camoufox browser and reuse it for every page (worker mode)."""
+
+    def __init__(self):
+        self._manager = None
+        self._browser = None
+
+    def get(self):
+        if self._browser is not None and not self._browser.is_connected():
+            self.close()
+        if self._browser is None:
+            Camoufox = _get_camoufox()
+            if not Camoufox:
+                return None
+            self._manager = Camoufox(**_camoufox_launch_options())
+            self._browser = self._manager.__enter__()
+        return self._browser
+
+    def close(self):
+        if self._manager is not None:
+            try:
+                self._manager.__exit__(None, None, None)
+            except Exception:
+                pass
+        self._manager = None
+        self._browser = None
+
+
+def _extract_media_from_page(page, post_url: str, debug: bool = False):
+    collected_urls: list = []
+    collected_set: set = set()
 
     def capture_media_response(response):
         try:
@@ -207,69 +464,102 @@ def resolve_post(post_url: str, debug: bool = False) -> dict:
                 return
             if len(url) < 40:
                 return
-            if url not in collected_urls:
+            if url not in collected_set:
+                collected_set.add(url)
                 collected_urls.append(url)
         except Exception:
             pass
 
+    page.on("response", capture_media_response)
+    page.goto(post_url, wait_until="domcontentloaded", timeout=60000)
+    try:
+        # Return as soon as the page exposes media, instead of fixed sleeps
+        page.wait_for_function(MEDIA_READY_JS, timeout=15000)
+    except Exception:
+        pass
+
+    extracted = page.evaluate(extract_media_js())
+    media_urls = list(collected_urls)
+    if isinstance(extracted, dict) and not extracted.get("error"):
+        media_urls = list(extracted.get("mediaUrls", [])) + media_urls
+    media_urls = [u for u in media_urls if u and u.startswith("http") and "/p/" not in u and "/reel/" not in u]
+    media_urls = list(dict.fromkeys(media_urls))
+    if debug:
+        err_fd = int(os.environ.get("DEBUG_STDERR", 2))
+        os.write(err_fd, f"[debug] extracted={type(extracted).__name__} collected={len(collected_urls)} media_urls={len(media_urls)}\n".encode())
+        if isinstance(extracted, dict) and extracted.get("error"):
+            os.write(err_fd, f"[debug] extract_error={extracted.get('error')}\n".encode())
+    if media_urls:
+        thumb = (extracted.get("thumbnailUrl") if isinstance(extracted, dict) else None) or media_urls[0]
+        return {"success": True, "mediaUrls": media_urls, "thumbnailUrl": thumb}
+    return None
+
+
+def _resolve_with_camoufox(post_url: str, debug: bool = False, shared: SharedBrowser = None):
+    """Slow path: render the post page and collect media URLs from the DOM and network."""
     try:
+        if shared is not None:
+            browser = shared.get()
+            if browser is None:
+                return {"success": False, "mediaUrls": [], "error": "camoufox not installed. pip install camoufox[geoip]"}
+            page = browser.new_page()
+            try:
+                return _extract_media_from_page(page, post_url, debug)
+            finally:
+                page.close()
+
         Camoufox = _get_camoufox()
         if not Camoufox:
             return {"success": False, "mediaUrls": [], "error": "camoufox not installed. pip install camoufox[geoip]"}
-        launch_options = {"headless": True, "humanize": True}
-        proxy_config = _resolve_camoufox_proxy_config()
-        if proxy_config:
-            launch_options["proxy"] = proxy_config
-        with Camoufox(**launch_options) as browser:
+        with Camoufox(**_camoufox_launch_options()) as browser:
             page = browser.new_page()
-            page.on("response", capture_media_response)
-            page.goto(post_url, wait_until="domcontentloaded", timeout=60000)
-            time.sleep(5)
-            try:
-                page.wait_for_load_state("networkidle", timeout=25000)
-            except Exception:
-                pass
-            time.sleep(4)
-
-            extracted = page.evaluate(extract_media_js())
-            media_urls = list(collected_urls)
-            if isinstance(extracted, dict) and not extracted.get("error"):
-                media_urls = list(extracted.get("mediaUrls", [])) + media_urls
-            media_urls = [u for u in media_urls if u and u.startswith("http") and "/p/" not in u and "/reel/" not in u]
-            media_urls = list(dict.fromkeys(media_urls))
-            if debug:
-                import os
-                err_fd = int(os.environ.get("DEBUG_STDERR", 2))
-                os.write(err_fd, f"[debug] extracted={type(extracted).__name__} collected={len(collected_urls)} media_urls={len(media_urls)}\n".encode())
-                if isinstance(extracted, dict) and extracted.get("error"):
-                    os.write(err_fd, f"[debug] extract_error={extracted.get('error')}\n".encode())
-            if media_urls:
-                thumb = (extracted.get("thumbnailUrl") if isinstance(extracted, dict) else None) or media_urls[0]
-                return {"success": True, "mediaUrls": media_urls, "thumbnailUrl": thumb}
+            return _extract_media_from_page(page, post_url, debug)
     except Exception:
         pass
+    return None
 
-    try:
-        result = subprocess.run(
-            with_proxy(["yt-dlp", "-g", "--no-playlist", post_url]),
-            capture_output=True, text=True, timeout=30,
-        )
-        if result.returncode == 0 and result.stdout.strip():
-            urls = [u.strip() for u in result.stdout.strip().split("\n") if u.strip().startswith("http")]
-            if urls:
-                return {"success": True, "mediaUrls": urls, "thumbnailUrl": urls[0]}
-    except Exception:
-        pass
+
+def _resolve_post_uncached(post_url: str, debug: bool = False, shared: SharedBrowser = None) -> dict:
+    if "/?" in post_url:
+        post_url = post_url.split("/?")[0]
+    if not post_url.endswith("/"):
+        post_url += "/"
+
+    result = _race_fast_paths(post_url, debug=debug)
+    if result:
+        return result
+
+    result = _resolve_with_camoufox(post_url, debug=debug, shared=shared)
+    if result:
+        return result
 
     return {"success": False, "mediaUrls": [], "error": "No media URLs found"}
 
 
+def run_stdin_worker(debug: bool = False) -> None:
+    """Resolve one post URL per stdin line, printing one JSON result per line; the browser is shared."""
+    shared = SharedBrowser()
+    try:
+        for line in sys.stdin:
+            post_url = line.strip()
+            if not post_url:
+                continue
+            result = resolve_post(post_url, debug=debug, shared=shared)
+            print(json.dumps(result))
+            sys.stdout.flush()
+    finally:
+        shared.close()
+
+
 def main():
+    debug = "--debug" in sys.argv
+    if "--stdin" in sys.argv:
+        run_stdin_worker(debug=debug)
+        return
     if len(sys.argv) < 2:
-        print(json.dumps({"success": False, "mediaUrls": [], "error": "Usage: python3 camoufox_insta_downloader.py <post_url> [--debug]"}))
+        print(json.dumps({"success": False, "mediaUrls": [], "error": "Usage: python3 camoufox_insta_downloader.py <post_url> [--debug] | --stdin [--debug]"}))
         sys.exit(1)
     post_url = sys.argv[1]
-    debug = "--debug" in sys.argv
     result = resolve_post(post_url, debug=debug)
     print(json.dumps(result))
     if not result.get("success"):
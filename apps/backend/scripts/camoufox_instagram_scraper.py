@@ -8,13 +8,37 @@ Run: python3 camoufox_instagram_scraper.py <handle> [posts_limit]
 import json
 import os
 import sys
-import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from urllib.parse import unquote, urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+
+def _dumps(obj, pretty: bool = False) -> str:
+    """Serialize stdout JSON with orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
+
+
+def _loads(text):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 try:
     from camoufox.sync_api import Camoufox
 except ImportError:
-    print(json.dumps({"error": "camoufox not installed. pip install camoufox[geoip]"}))
+    print(_dumps({"error": "camoufox not installed. pip install camoufox[geoip]"}))
     sys.exit(1)
 
 
@@ -56,11 +80,42 @@ def _resolve_camoufox_proxy_config():
     return proxy
 
 
-def extract_profile_js() -> str:
-    """Return the page.evaluate JavaScript as a string."""
-    return r"""
+def _camoufox_launch_options() -> dict:
+    launch_options = {"headless": True}
+    proxy_config = _resolve_camoufox_proxy_config()
+    if proxy_config:
+        launch_options["proxy"] = proxy_config
+    return launch_options
+
+
+@contextmanager
+def _page_session(browser=None):
+    """Yield a page: an isolated context on a shared browser (worker mode), else a fresh Camoufox launch."""
+    if browser is not None:
+        context = browser.new_context()
+        try:
+            yield context.new_page()
+        finally:
+            context.close()
+        return
+    with Camoufox(**_camoufox_launch_options()) as owned:
+        yield owned.new_page()
+
+
+# Profile data is usable: legacy _sharedData, a rendered post grid, or a private-account notice
+PROFILE_READY_JS = """
+() => !!(
+    window._sharedData?.entry_data?.ProfilePage
+    || document.querySelector('a[href*="/p/"], a[href*="/reel/"]')
+    || (document.querySelector('meta[property="og:description"]')?.content || '').includes('This Account is Private')
+)
+"""
+
+# page.evaluate JavaScript, built once at import
+EXTRACT_PROFILE_JS = r"""
     () => {
         const result = { profile: null, posts: [] };
+        const LINK_RE = /\/(p|reel)\/([A-Za-z0-9_-]+)/;
         function parseNum(s) {
             if (!s) return 0;
             s = String(s).replace(/,/g,'');
@@ -69,6 +124,29 @@ def extract_profile_js() -> str:
             if (s.endsWith('B')) return Math.floor(parseFloat(s)*1000000000);
             return parseInt(s,10)||0;
         }
+        const mapPost = (n) => {
+            const isVideo = n.is_video || false;
+            const mediaUrls = [];
+            if (n.display_url) mediaUrls.push(n.display_url);
+            if (n.video_url) mediaUrls.push(n.video_url);
+            (n.edge_sidecar_to_children?.edges || []).forEach(c => {
+                if (c.node.display_url) mediaUrls.push(c.node.display_url);
+                if (c.node.video_url) mediaUrls.push(c.node.video_url);
+            });
+            return {
+                external_post_id: n.id || n.shortcode,
+                post_url: 'https://www.instagram.com/p/' + n.shortcode + '/',
+                caption: (n.edge_media_to_caption?.edges?.[0]?.node?.text) || '',
+                likes: n.edge_media_preview_like?.count || 0,
+                comments: n.edge_media_to_comment?.count || 0,
+                timestamp: n.taken_at_timestamp ? new Date(n.taken_at_timestamp * 1000).toISOString() : '',
+                media_url: n.display_url || n.video_url || '',
+                is_video: isVideo,
+                video_url: isVideo ? (n.video_url || null) : null,
+                typename: n.__typename || 'GraphImage',
+                media_urls: mediaUrls
+            };
+        };
         try {
             if (window._sharedData && window._sharedData.entry_data) {
                 const profilePage = Object.values(window._sharedData.entry_data.ProfilePage || {})[0];
@@ -85,30 +163,7 @@ def extract_profile_js() -> str:
                         total_posts: user.edge_owner_to_timeline_media?.count || 0
                     };
                     const edges = user.edge_owner_to_timeline_media?.edges || [];
-                    result.posts = edges.slice(0, 30).map(e => {
-                        const n = e.node;
-                        const isVideo = n.is_video || false;
-                        const mediaUrls = [];
-                        if (n.display_url) mediaUrls.push(n.display_url);
-                        if (n.video_url) mediaUrls.push(n.video_url);
-                        (n.edge_sidecar_to_children?.edges || []).forEach(c => {
-                            if (c.node.display_url) mediaUrls.push(c.node.display_url);
-                            if (c.node.video_url) mediaUrls.push(c.node.video_url);
-                        });
-                        return {
-                            external_post_id: n.id || n.shortcode,
-                            post_url: 'https://www.instagram.com/p/' + n.shortcode + '/',
-                            caption: (n.edge_media_to_caption?.edges?.[0]?.node?.text) || '',
-                            likes: n.edge_media_preview_like?.count || 0,
-                            comments: n.edge_media_to_comment?.count || 0,
-                            timestamp: n.taken_at_timestamp ? new Date(n.taken_at_timestamp * 1000).toISOString() : '',
-                            media_url: n.display_url || n.video_url || '',
-                            is_video: isVideo,
-                            video_url: isVideo ? (n.video_url || null) : null,
-                            typename: n.__typename || 'GraphImage',
-                            media_urls: mediaUrls
-                        };
-                    });
+                    result.posts = edges.slice(0, 30).map(e => mapPost(e.node));
                     return result;
                 }
             }
@@ -156,26 +211,7 @@ def extract_profile_js() -> str:
                         };
                         if (result.posts.length === 0 && user.edge_owner_to_timeline_media?.edges) {
                             const edges = user.edge_owner_to_timeline_media.edges;
-                            result.posts = edges.slice(0, 30).map(e => {
-                                const n = e.node;
-                                const isVideo = n.is_video || false;
-                                const mediaUrls = [];
-                                if (n.display_url) mediaUrls.push(n.display_url);
-                                if (n.video_url) mediaUrls.push(n.video_url);
-                                return {
-                                    external_post_id: n.id || n.shortcode,
-                                    post_url: 'https://www.instagram.com/p/' + n.shortcode + '/',
-                                    caption: (n.edge_media_to_caption?.edges?.[0]?.node?.text) || '',
-                                    likes: n.edge_media_preview_like?.count || 0,
-                                    comments: n.edge_media_to_comment?.count || 0,
-                                    timestamp: n.taken_at_timestamp ? new Date(n.taken_at_timestamp * 1000).toISOString() : '',
-                                    media_url: n.display_url || n.video_url || '',
-                                    is_video: isVideo,
-                                    video_url: isVideo ? (n.video_url || null) : null,
-                                    typename: n.__typename || 'GraphImage',
-                                    media_urls: mediaUrls
-                                };
-                            });
+                            result.posts = edges.slice(0, 30).map(e => mapPost(e.node));
                         }
                         return result;
                     }
@@ -202,11 +238,17 @@ def extract_profile_js() -> str:
                     is_private: metaDesc.content.includes('This Account is Private'),
                     total_posts: parseNum(m3?.[1])
                 };
-                const links = Array.from(document.querySelectorAll('a[href*="/p/"], a[href*="/reel/"]'));
+                // One anchor walk; indexOf rejects non-post links before the regex runs
+                const links = [];
+                for (const a of document.querySelectorAll('a[href]')) {
+                    const href = a.getAttribute('href');
+                    if (href.indexOf('/p/') !== -1 || href.indexOf('/reel/') !== -1) links.push(a);
+                    if (links.length >= 30) break;
+                }
                 const seen = new Set();
-                result.posts = links.slice(0, 30).map(a => {
+                result.posts = links.map(a => {
                     const href = a.getAttribute('href') || '';
-                    const match = href.match(/\/(p|reel)\/([A-Za-z0-9_-]+)/);
+                    const match = LINK_RE.exec(href);
                     if (!match || seen.has(match[2])) return null;
                     seen.add(match[2]);
                     const shortcode = match[2];
@@ -235,7 +277,131 @@ def extract_profile_js() -> str:
     """
 
 
-def scrape_profile(handle: str, posts_limit: int = 30) -> dict:
+def _iso_timestamp(seconds) -> str:
+    if not seconds:
+        return ""
+    return datetime.fromtimestamp(seconds, timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _post_from_media(m: dict) -> dict:
+    image_url = ((m.get("image_versions2") or {}).get("candidates") or [{}])[0].get("url")
+    video_url = (m.get("video_versions") or [{}])[0].get("url")
+    return {
+        "external_post_id": m.get("media_id") or m.get("id"),
+        "post_url": m.get("permalink") or f"https://www.instagram.com/p/{m.get('code') or ''}/",
+        "caption": (m.get("caption") or {}).get("text") or "",
+        "likes": m.get("like_count") or 0,
+        "comments": m.get("comment_count") or 0,
+        "timestamp": _iso_timestamp(m.get("taken_at")),
+        "media_url": image_url or video_url or "",
+        "is_video": bool(m.get("video_versions")),
+        "video_url": video_url,
+        "typename": "GraphVideo" if m.get("media_type") == 2 else "GraphImage",
+        "media_urls": [u for u in (image_url, video_url) if u],
+    }
+
+
+def _post_from_node(n: dict) -> dict:
+    is_video = bool(n.get("is_video"))
+    caption_edges = (n.get("edge_media_to_caption") or {}).get("edges") or []
+    sidecar = [c.get("node") or {} for c in (n.get("edge_sidecar_to_children") or {}).get("edges") or []]
+    return {
+        "external_post_id": n.get("id") or n.get("shortcode"),
+        "post_url": f"https://www.instagram.com/p/{n.get('shortcode')}/",
+        "caption": (caption_edges[0].get("node") or {}).get("text") or "" if caption_edges else "",
+        "likes": (n.get("edge_media_preview_like") or {}).get("count") or 0,
+        "comments": (n.get("edge_media_to_comment") or {}).get("count") or 0,
+        "timestamp": _iso_timestamp(n.get("taken_at_timestamp")),
+        "media_url": n.get("display_url") or n.get("video_url") or "",
+        "is_video": is_video,
+        "video_url": (n.get("video_url") or None) if is_video else None,
+        "typename": n.get("__typename") or "GraphImage",
+        "media_urls": [u for m in [n, *sidecar] for u in (m.get("display_url"), m.get("video_url")) if u],
+    }
+
+
+def _first_not_none(*values):
+    return next((v for v in values if v is not None), 0)
+
+
+def _profile_from_user(user: dict) -> dict:
+    timeline = user.get("edge_owner_to_timeline_media") or {}
+    return {
+        "handle": user.get("username") or "",
+        "follower_count": _first_not_none(user.get("follower_count"), (user.get("edge_followed_by") or {}).get("count")),
+        "following_count": _first_not_none(user.get("following_count"), (user.get("edge_follow") or {}).get("count")),
+        "bio": user.get("biography") or "",
+        "profile_pic": user.get("profile_pic_url_hd") or user.get("profile_pic_url") or "",
+        "is_verified": user.get("is_verified") or False,
+        "is_private": user.get("is_private") or False,
+        "total_posts": _first_not_none(user.get("media_count"), timeline.get("count")),
+    }
+
+
+def _extract_from_json_script(data: dict):
+    """Profile and posts from one embedded JSON payload, or None when it holds no profile."""
+    user = None
+    posts = []
+    for sec in (data.get("required") or {}).get("sections") or []:
+        content = ((sec or {}).get("layout") or {}).get("content") or {}
+        user = (content.get("usertag") or {}).get("user") or user
+        medias = ((content.get("mediaset") or {}).get("layout_content") or {}).get("mediaset")
+        if medias:
+            user = user or (medias.get("metadata") or {}).get("owner")
+            if user and medias.get("media"):
+                posts = [_post_from_media(m) for m in medias["media"][:30]]
+        if user:
+            break
+    if not user:
+        return None
+    if not posts:
+        edges = (user.get("edge_owner_to_timeline_media") or {}).get("edges") or []
+        posts = [_post_from_node(e.get("node") or {}) for e in edges[:30]]
+    return {"profile": _profile_from_user(user), "posts": posts}
+
+
+def extract_from_html(html: str):
+    """
+    Offline pass over the embedded application/json scripts of page.content(),
+    mirroring the JSON-script branch of EXTRACT_PROFILE_JS without a page.evaluate
+    round trip. Returns None when selectolax is missing or no profile is embedded.
+    """
+    if HTMLParser is None:
+        return None
+    for node in HTMLParser(html).css('script[type="application/json"]'):
+        try:
+            data = _loads(node.text())
+        except ValueError:
+            continue
+        if not isinstance(data, dict):
+            continue
+        # Fields of an unexpected shape skip the script, like the JS version's per-script try/catch
+        try:
+            extracted = _extract_from_json_script(data)
+        except (AttributeError, TypeError, KeyError):
+            continue
+        if extracted:
+            return extracted
+    return None
+
+
+def _install_extractor(page, name: str, source: str) -> None:
+    """Define the extractor on window via an init script, so it is parsed once per document."""
+    page.add_init_script(f"window.{name} = {source.strip()};")
+
+
+def _call_extractor(page, name: str, source: str):
+    """
+    Call the installed extractor with a few-byte evaluate. Falls back to shipping the
+    full source when the evaluation world cannot see the init script's window.
+    """
+    found = page.evaluate(f"() => typeof window.{name} === 'function' ? {{ value: window.{name}() }} : null")
+    if found is None:
+        return page.evaluate(source)
+    return found.get("value")
+
+
+def scrape_profile(handle: str, posts_limit: int = 30, browser=None) -> dict:
     """Scrape Instagram profile using Camoufox."""
     handle = handle.replace('@', '').strip()
     if not handle:
@@ -243,21 +409,19 @@ def scrape_profile(handle: str, posts_limit: int = 30) -> dict:
 
     url = f"https://www.instagram.com/{handle}/"
     try:
-        launch_options = {
-            "headless": True,
-        }
-        proxy_config = _resolve_camoufox_proxy_config()
-        if proxy_config:
-            launch_options["proxy"] = proxy_config
-
-        with Camoufox(**launch_options) as browser:
-            page = browser.new_page()
+        with _page_session(browser) as page:
+            _install_extractor(page, "__extractProfile", EXTRACT_PROFILE_JS)
             page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            time.sleep(3)
-            page.wait_for_load_state("networkidle", timeout=15000)
-            time.sleep(2)
+            # Return as soon as the data is in the DOM; on timeout the extractor's fallbacks still run
+            try:
+                page.wait_for_function(PROFILE_READY_JS, timeout=15000, polling=250)
+            except Exception:
+                pass
 
-            extracted = page.evaluate(extract_profile_js())
+            # Embedded JSON is parsed offline; the in-page extractor covers _sharedData and DOM fallbacks
+            extracted = extract_from_html(page.content()) if HTMLParser is not None else None
+            if extracted is None:
+                extracted = _call_extractor(page, "__extractProfile", EXTRACT_PROFILE_JS)
             if not extracted:
                 return {"error": "Could not extract profile data from page"}
 
@@ -289,12 +453,12 @@ def scrape_profile(handle: str, posts_limit: int = 30) -> dict:
 
 def main():
     if len(sys.argv) < 2:
-        print(json.dumps({"error": "Usage: python3 camoufox_instagram_scraper.py <handle> [posts_limit]"}))
+        print(_dumps({"error": "Usage: python3 camoufox_instagram_scraper.py <handle> [posts_limit]"}))
         sys.exit(1)
     handle = sys.argv[1]
     posts_limit = int(sys.argv[2]) if len(sys.argv) > 2 else 30
     result = scrape_profile(handle, posts_limit)
-    print(json.dumps(result, indent=2))
+    print(_dumps(result, pretty=True))
     if "error" in result:
         sys.exit(1)
 
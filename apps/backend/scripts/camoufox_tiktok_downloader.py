@@ -1,27 +1,54 @@
 #!/usr/bin/env python3
 """
 Camoufox-based TikTok video/photo downloader.
-Handles: /video/ URLs (video), /photo/ URLs (image carousel - downloads first image).
-Output: JSON {success, path?, error?} to stdout
+Handles: /video/ URLs (video), /photo/ URLs (image carousel - downloads every slide in parallel).
+Output: JSON {success, path?, paths?, error?} to stdout (path is the first image, paths every slide)
 Run: python3 camoufox_tiktok_downloader.py <tiktok_url> <output_path>
 """
 
 import json
+import mimetypes
 import os
+import pathlib
 import re
+import shutil
 import ssl
 import subprocess
 import sys
-import time
+import threading
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from urllib.parse import unquote, urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj, pretty: bool = False) -> str:
+    """Serialize stdout JSON with orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
 try:
     import certifi
-    _SSL_CTX = ssl.create_default_context(cafile=certifi.where())
+    _SSL_CTX = ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=certifi.where())
 except ImportError:
-    _SSL_CTX = ssl.create_default_context()
+    _SSL_CTX = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
+# The one client context for every download in this process (the worker reuses it across requests)
+_SSL_CTX.check_hostname = True
+if httpx is not None:
+    # Only the httpx client uses the context then; urllib must never see h2 negotiated
+    _SSL_CTX.set_alpn_protocols(["h2", "http/1.1"])
 
 def _env_true(name: str, fallback: bool = False) -> bool:
     raw = str(os.environ.get(name, "")).strip().lower()
@@ -62,6 +89,28 @@ def _resolve_camoufox_proxy_config():
     return proxy
 
 
+def _camoufox_launch_options() -> dict:
+    launch_options = {"headless": True, "humanize": True}
+    proxy_config = _resolve_camoufox_proxy_config()
+    if proxy_config:
+        launch_options["proxy"] = proxy_config
+    return launch_options
+
+
+@contextmanager
+def _page_session(browser=None):
+    """Yield a page: an isolated context on a shared browser (worker mode), else a fresh Camoufox launch."""
+    if browser is not None:
+        context = browser.new_context()
+        try:
+            yield context.new_page()
+        finally:
+            context.close()
+        return
+    with Camoufox(**_camoufox_launch_options()) as owned:
+        yield owned.new_page()
+
+
 PROXY_URL = _resolve_proxy_url()
 
 def with_proxy(cmd):
@@ -69,168 +118,327 @@ def with_proxy(cmd):
         return [*cmd, "--proxy", PROXY_URL]
     return cmd
 
-def open_url(req, timeout):
+def _build_opener():
+    """Build the urllib opener once; handlers and the SSL context are reused per request."""
     if PROXY_URL:
-        opener = urllib.request.build_opener(
+        return urllib.request.build_opener(
             urllib.request.ProxyHandler({"http": PROXY_URL, "https": PROXY_URL}),
             urllib.request.HTTPSHandler(context=_SSL_CTX),
         )
-        return opener.open(req, timeout=timeout)
-    return urllib.request.urlopen(req, timeout=timeout, context=_SSL_CTX)
+    return urllib.request.build_opener(urllib.request.HTTPSHandler(context=_SSL_CTX))
+
+_OPENER = _build_opener()
+
+def open_url(req, timeout):
+    return _OPENER.open(req, timeout=timeout)
+
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
+DOWNLOAD_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
+    "Referer": "https://www.tiktok.com/",
+}
+
+def _build_http_client():
+    """Keep-alive HTTP/2 client shared by every download; None falls back to urllib."""
+    if httpx is None:
+        return None
+    options = {
+        "verify": _SSL_CTX,
+        "timeout": 120,
+        "headers": DOWNLOAD_HEADERS,
+        "follow_redirects": True,
+    }
+    if PROXY_URL:
+        options["proxy"] = PROXY_URL
+    try:
+        return httpx.Client(http2=True, **options)
+    except ImportError:
+        # http2 needs the optional h2 package; HTTP/1.1 keep-alive still beats urllib
+        return httpx.Client(**options)
+
+HTTP_CLIENT = _build_http_client()
+
+# Parallel slide downloads for photo carousels (TikTok caps them at 35)
+CAROUSEL_DOWNLOAD_WORKERS = 8
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".webp"}
+
+def _typed_path(path, content_type):
+    """Append the extension for the served Content-Type (.webp is not misfiled as .jpg)."""
+    mime = (content_type or "image/jpeg").split(";")[0].strip()
+    return path.with_name(path.name + (mimetypes.guess_extension(mime) or ".jpg"))
+
+def _open_sequential(path):
+    f = open(path, "wb")
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return f
+
+def stream_to_file(url, output_path, cookies, timeout, headers=None, typed_suffix=False):
+    """
+    Copy the response body to disk in 1 MiB chunks instead of buffering it whole.
+    With typed_suffix the extension is taken from the response Content-Type.
+    Returns the path written.
+    """
+    # Sent as a header: per-request cookies= is deprecated in httpx
+    request_headers = {"Cookie": "; ".join(f"{c['name']}={c['value']}" for c in cookies), **(headers or {})}
+    path = pathlib.Path(output_path)
+    if HTTP_CLIENT is not None:
+        with HTTP_CLIENT.stream("GET", url, headers=request_headers, timeout=timeout) as resp:
+            resp.raise_for_status()
+            if typed_suffix:
+                path = _typed_path(path, resp.headers.get("content-type"))
+            with _open_sequential(path) as f:
+                for chunk in resp.iter_bytes(DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+        return str(path)
+    req = urllib.request.Request(url, headers={**DOWNLOAD_HEADERS, **request_headers})
+    with open_url(req, timeout=timeout) as resp:
+        if typed_suffix:
+            path = _typed_path(path, resp.headers.get("content-type"))
+        with _open_sequential(path) as f:
+            shutil.copyfileobj(resp, f, length=DOWNLOAD_CHUNK_SIZE)
+    return str(path)
 
 try:
     from camoufox.sync_api import Camoufox
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 except ImportError:
-    print(json.dumps({"success": False, "error": "camoufox not installed. pip install camoufox[geoip]"}))
+    print(_dumps({"success": False, "error": "camoufox not installed. pip install camoufox[geoip]"}))
     sys.exit(1)
 
 TIKTOK_VIDEO_RE = re.compile(r"/video/(\d+)", re.I)
 TIKTOK_PHOTO_RE = re.compile(r"/photo/(\d+)", re.I)
 
+# Response listeners see hundreds of URLs per page; one compiled search replaces each `or` chain.
+# Response URLs are lowercase already, so no IGNORECASE.
+_SKIP_URL_RE = re.compile(r"website-login|blob:")
+_STREAM_MARK_RE = re.compile(r"mime_type=video|video_mp4")
+_VIDEO_HOST_RE = re.compile(r"tiktok\.com|byteoversea|musical\.ly")
+_VIDEO_MARK_RE = re.compile(r"/video/|mime_type=video|video_mp4")
+_IMAGE_HOST_RE = re.compile(r"tiktok|byteoversea|bytedance|muscdn")
+_IMAGE_MARK_RE = re.compile(r"image|photo|p16-sign")
+
+
+# Photo post data is usable: the rehydration blob holding imagePost, or CDN images
+PHOTO_READY_JS = """
+() => !!(
+    document.querySelector('script#__UNIVERSAL_DATA_FOR_REHYDRATION__')
+    || document.querySelector('img[src*="tiktok"], img[src*="bytedance"], img[src*="muscdn"]')
+)
+"""
+
+# Carousel slides from the rehydration blob plus CDN <img> sources, built once at import
+EXTRACT_PHOTO_JS = r"""
+() => {
+    const urls = [];
+    const slides = [];
+    const imgs = document.querySelectorAll('img[src*="tiktok"], img[src*="bytedance"], img[src*="muscdn"]');
+    imgs.forEach(i => { const u = i.src || i.getAttribute('src'); if (u && u.length > 60) urls.push(u); });
+    try {
+        const scripts = document.querySelectorAll('script#__UNIVERSAL_DATA_FOR_REHYDRATION__');
+        for (const s of scripts) {
+            const d = JSON.parse(s.textContent || '{}');
+            const root = d?.__DEFAULT_SCOPE__?.['webapp.video-detail'] || d?.__DEFAULT_SCOPE__?.['webapp.photo-detail'];
+            const item = root?.itemInfo?.itemStruct;
+            const images = item?.imagePost?.images || [];
+            for (const im of images) {
+                const u = im?.imageURL?.urlList?.[0] || im?.displayImage?.urlList?.[0];
+                if (u) slides.push(u);
+            }
+            const single = item?.imagePost?.imageURL?.urlList?.[0];
+            if (single) slides.push(single);
+        }
+    } catch (_) {}
+    return { slides: [...new Set(slides)], images: [...new Set(urls)] };
+}
+"""
+
+# Video page navigation budget, and how much longer the stream response may take after it
+VIDEO_NAVIGATION_TIMEOUT_MS = 90000
+VIDEO_RESPONSE_TIMEOUT_MS = 30000
+
+# Budget for the last-resort yt-dlp download
+YTDLP_DOWNLOAD_TIMEOUT_S = 120
+
 
 def _is_photo_url(url: str) -> bool:
     return "/photo/" in url
 
 
-def download_photo(photo_url: str, output_path: str) -> dict:
-    """Download first image from TikTok photo post via Camoufox."""
-    image_urls = []
+def _install_extractor(page, name: str, source: str) -> None:
+    """Define the extractor on window via an init script, so it is parsed once per document."""
+    page.add_init_script(f"window.{name} = {source.strip()};")
+
+
+def _call_extractor(page, name: str, source: str):
+    """
+    Call the installed extractor with a few-byte evaluate. Falls back to shipping the
+    full source when the evaluation world cannot see the init script's window.
+    """
+    found = page.evaluate(f"() => typeof window.{name} === 'function' ? {{ value: window.{name}() }} : null")
+    if found is None:
+        return page.evaluate(source)
+    return found.get("value")
+
+
+def download_photo(photo_url: str, output_path: str, browser=None) -> dict:
+    """Download every slide of a TikTok photo post via Camoufox."""
+    image_urls: list[str] = []
+    image_seen: set[str] = set()
 
     def handle_response(response):
         try:
             url = response.url
-            if "website-login" in url or "blob:" in url:
-                return
-            if "tiktok" not in url and "byteoversea" not in url and "bytedance" not in url and "muscdn" not in url:
+            if _SKIP_URL_RE.search(url):
                 return
-            if "mime_type=video" in url or "video_mp4" in url:
+            if not _IMAGE_HOST_RE.search(url) or _STREAM_MARK_RE.search(url):
                 return
-            ct = ""
-            try:
-                headers = response.all_headers() if hasattr(response, "all_headers") else {}
-                ct = (headers.get("content-type") or "").lower()
-            except Exception:
-                pass
-            if "image/" in ct or "image" in url or "photo" in url or "p16-sign" in url:
-                if url not in image_urls and len(url) > 50:
+            # Decide from the URL when possible; only then look at headers. Response.headers
+            # ships with the event, whereas all_headers() is a bridge round trip per response
+            if _IMAGE_MARK_RE.search(url):
+                is_image = True
+            else:
+                is_image = "image/" in (response.headers.get("content-type") or "").lower()
+            if is_image:
+                if url not in image_seen and len(url) > 50:
+                    image_seen.add(url)
                     image_urls.append(url)
         except Exception:
             pass
 
-    extract_js = r"""
-    () => {
-        const urls = [];
-        const imgs = document.querySelectorAll('img[src*="tiktok"], img[src*="bytedance"], img[src*="muscdn"]');
-        imgs.forEach(i => { const u = i.src || i.getAttribute('src'); if (u && u.length > 60) urls.push(u); });
-        try {
-            const scripts = document.querySelectorAll('script#__UNIVERSAL_DATA_FOR_REHYDRATION__');
-            for (const s of scripts) {
-                const d = JSON.parse(s.textContent || '{}');
-                const root = d?.__DEFAULT_SCOPE__?.['webapp.video-detail'] || d?.__DEFAULT_SCOPE__?.['webapp.photo-detail'];
-                const item = root?.itemInfo?.itemStruct;
-                const images = item?.imagePost?.images || [];
-                for (const im of images) {
-                    const u = im?.imageURL?.urlList?.[0] || im?.displayImage?.urlList?.[0];
-                    if (u) urls.push(u);
-                }
-                const single = item?.imagePost?.imageURL?.urlList?.[0];
-                if (single) urls.push(single);
-            }
-        } catch (_) {}
-        return [...new Set(urls)];
-    }
-    """
-
     try:
-        launch_options = {"headless": True, "humanize": True}
-        proxy_config = _resolve_camoufox_proxy_config()
-        if proxy_config:
-            launch_options["proxy"] = proxy_config
-        with Camoufox(**launch_options) as browser:
-            page = browser.new_page()
+        with _page_session(browser) as page:
+            _install_extractor(page, "__extractPhoto", EXTRACT_PHOTO_JS)
             page.on("response", handle_response)
-            page.goto(photo_url, wait_until="networkidle", timeout=90000)
-            time.sleep(6)
+            page.goto(photo_url, wait_until="domcontentloaded", timeout=90000)
+            try:
+                page.wait_for_function(PHOTO_READY_JS, timeout=15000, polling=250)
+            except Exception:
+                pass
 
-            extracted = page.evaluate(extract_js)
-            if isinstance(extracted, list):
-                image_urls[:0] = extracted
+            extracted = _call_extractor(page, "__extractPhoto", EXTRACT_PHOTO_JS) or {}
+            slides = [u for u in extracted.get("slides", []) if u and u.startswith("http")]
+            # Page-extracted URLs go first; listener URLs are already unique, so only those are checked
+            page_urls = list(dict.fromkeys(slides + extracted.get("images", [])))
+            page_seen = set(page_urls)
+            image_urls = page_urls + [u for u in image_urls if u not in page_seen]
             image_urls = [u for u in image_urls if u and u.startswith("http") and "video" not in u.lower()]
-            image_urls = list(dict.fromkeys(image_urls))
 
             if not image_urls:
                 return {"success": False, "error": "No image URLs found (CAPTCHA or login wall?)"}
 
-            img_url = image_urls[0]
-            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
-
-            cookies = page.context.cookies()
-            cookie_str = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
-            req = urllib.request.Request(
-                img_url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                    "Cookie": cookie_str,
-                    "Referer": "https://www.tiktok.com/",
-                },
-            )
-            with open_url(req, timeout=60) as resp:
-                data = resp.read()
-            ext = ".jpg" if ".jpg" in img_url or "jpeg" in img_url else ".png"
-            if not output_path.lower().endswith((".jpg", ".jpeg", ".png", ".webp")):
-                output_path = output_path.rstrip("/") + ext
-            with open(output_path, "wb") as f:
-                f.write(data)
-            return {"success": True, "path": output_path}
+            # Only the post's own carousel is downloaded in full; sniffed page images
+            # (avatars, thumbnails) are a single-image fallback
+            slide_urls = slides or image_urls[:1]
+            out = pathlib.Path(output_path)
+            out.parent.mkdir(parents=True, exist_ok=True)
+
+            # Only the post page's and slide hosts' cookies cross the Playwright bridge, not the whole
+            # jar; every slide URL is listed since slides can sit on different CDN hosts
+            cookies = page.context.cookies(urls=[photo_url, *slide_urls])
+            # Without a known image extension, each slide gets the one its Content-Type names
+            typed = out.suffix.lower() not in IMAGE_SUFFIXES
+            targets = [out] + [out.with_name(f"{out.stem}_{i}{out.suffix}") for i in range(1, len(slide_urls))]
+
+            # The shared client is thread-safe, so slides overlap their CDN waits on one pool.
+            # Each slide succeeds or fails on its own; the post only fails without slide 1.
+            saved: dict[int, str] = {}
+            failed: list[dict] = []
+            with ThreadPoolExecutor(max_workers=min(CAROUSEL_DOWNLOAD_WORKERS, len(slide_urls))) as executor:
+                futures = {
+                    executor.submit(stream_to_file, url, target, cookies, timeout=60, typed_suffix=typed): i
+                    for i, (url, target) in enumerate(zip(slide_urls, targets))
+                }
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        saved[i] = future.result()
+                    except Exception as e:
+                        failed.append({"index": i, "url": slide_urls[i], "error": str(e)})
+
+            failed.sort(key=lambda f: f["index"])
+            if 0 not in saved:
+                # Without the first slide the post counts as failed; don't leave the rest behind
+                for path in saved.values():
+                    pathlib.Path(path).unlink(missing_ok=True)
+                return {"success": False, "error": failed[0]["error"], "failed_slides": failed}
+            result = {"success": True, "path": saved[0], "paths": [saved[i] for i in sorted(saved)]}
+            if failed:
+                result["failed_slides"] = failed
+            return result
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 
-def download_video(video_url: str, output_path: str) -> dict:
-    """Download TikTok video using Camoufox to get the stream URL."""
-    video_source_url = [None]
-
-    def handle_response(response):
+def _is_video_response(response) -> bool:
+    """The first playable stream response: a video content type or stream marker, not a tiny probe."""
+    try:
+        url = response.url
+        if _SKIP_URL_RE.search(url):
+            return False
+        if not _VIDEO_HOST_RE.search(url) or not _VIDEO_MARK_RE.search(url):
+            return False
+        # Response.headers ships with the event; all_headers() would be a bridge round trip
+        headers = response.headers or {}
+        ct = (headers.get("content-type") or "").lower()
         try:
-            url = response.url
-            if "website-login" in url or "blob:" in url:
-                return
-            if "tiktok.com" not in url and "byteoversea" not in url and "musical.ly" not in url:
-                return
-            if "/video/" not in url and "mime_type=video" not in url and "video_mp4" not in url:
-                return
-            headers = {}
-            try:
-                headers = response.all_headers() if hasattr(response, "all_headers") else (getattr(response, "headers", None) or {})
-            except Exception:
-                pass
-            ct = (headers.get("content-type") or "").lower()
-            try:
-                cl = headers.get("content-length", "0")
-                size = int(cl) if cl else 0
-            except (ValueError, TypeError):
-                size = 0
-            is_video = "video/mp4" in ct or "video/webm" in ct or "mime_type=video" in url or "video_mp4" in url
-            if is_video:
-                current = video_source_url[0]
-                if current is None or (size > 0 and size > 50000):
-                    if size == 0 or size > 50000:
-                        video_source_url[0] = url
-        except Exception:
-            pass
+            cl = headers.get("content-length", "0")
+            size = int(cl) if cl else 0
+        except (ValueError, TypeError):
+            size = 0
+        is_video = "video/mp4" in ct or "video/webm" in ct or _STREAM_MARK_RE.search(url) is not None
+        return is_video and (size == 0 or size > 50000)
+    except Exception:
+        return False
 
+
+def _ytdlp_download(video_url: str, output_path: str) -> bool:
+    """
+    Last-resort download straight to output_path. HLS/DASH fragments are fetched in parallel
+    and progress lines are forwarded to stderr as they arrive (stdout carries the JSON result).
+    A watchdog kills yt-dlp at the timeout instead of blocking on subprocess.run.
+    """
+    cmd = with_proxy([
+        "yt-dlp", "-f", "b", "--no-part", "--concurrent-fragments", "4", "--newline",
+        "-o", output_path, video_url,
+    ])
     try:
-        launch_options = {"headless": True, "humanize": True}
-        proxy_config = _resolve_camoufox_proxy_config()
-        if proxy_config:
-            launch_options["proxy"] = proxy_config
-        with Camoufox(**launch_options) as browser:
-            page = browser.new_page()
-            page.on("response", handle_response)
-            page.goto(video_url, wait_until="networkidle", timeout=90000)
-            time.sleep(8)
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    except Exception:
+        return False
+    # Killing the process closes stdout, which ends the read loop below
+    watchdog = threading.Timer(YTDLP_DOWNLOAD_TIMEOUT_S, proc.kill)
+    watchdog.start()
+    try:
+        for line in proc.stdout:
+            sys.stderr.write(line)
+    except Exception:
+        pass
+    finally:
+        watchdog.cancel()
+        proc.stdout.close()
+        proc.wait()
+    return proc.returncode == 0 and os.path.exists(output_path)
+
+
+def download_video(video_url: str, output_path: str, browser=None) -> dict:
+    """Download TikTok video using Camoufox to get the stream URL."""
+    try:
+        with _page_session(browser) as page:
+            url = None
+            # Resolves on the first stream response, so nothing waits past it
+            try:
+                with page.expect_response(
+                    _is_video_response,
+                    timeout=VIDEO_NAVIGATION_TIMEOUT_MS + VIDEO_RESPONSE_TIMEOUT_MS,
+                ) as response_info:
+                    page.goto(video_url, wait_until="domcontentloaded", timeout=VIDEO_NAVIGATION_TIMEOUT_MS)
+                url = response_info.value.url
+            except PlaywrightTimeoutError:
+                pass
 
-            url = video_source_url[0]
             if not url:
                 try:
                     result = subprocess.run(
@@ -246,44 +454,23 @@ def download_video(video_url: str, output_path: str) -> dict:
 
             os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
 
-            cookies = page.context.cookies()
-            cookie_str = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
-
-            req = urllib.request.Request(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36",
-                    "Cookie": cookie_str,
-                    "Referer": "https://www.tiktok.com/",
-                    "Origin": "https://www.tiktok.com",
-                },
-            )
-            with open_url(req, timeout=120) as resp:
-                data = resp.read()
-            with open(output_path, "wb") as f:
-                f.write(data)
+            cookies = page.context.cookies(urls=[video_url, url])
+            stream_to_file(url, output_path, cookies, timeout=120, headers={"Origin": "https://www.tiktok.com"})
             return {"success": True, "path": output_path}
     except Exception as e:
-        try:
-            result = subprocess.run(
-                with_proxy(["yt-dlp", "-f", "b", "-o", output_path, video_url]),
-                capture_output=True, text=True, timeout=120,
-            )
-            if result.returncode == 0 and os.path.exists(output_path):
-                return {"success": True, "path": output_path}
-        except Exception:
-            pass
+        if _ytdlp_download(video_url, output_path):
+            return {"success": True, "path": output_path}
         return {"success": False, "error": str(e)}
 
 
 def main():
     if len(sys.argv) < 3:
-        print(json.dumps({"success": False, "error": "Usage: python3 camoufox_tiktok_downloader.py <tiktok_url> <output_path>"}))
+        print(_dumps({"success": False, "error": "Usage: python3 camoufox_tiktok_downloader.py <tiktok_url> <output_path>"}))
         sys.exit(1)
     url = sys.argv[1]
     output_path = sys.argv[2]
     result = download_photo(url, output_path) if _is_photo_url(url) else download_video(url, output_path)
-    print(json.dumps(result))
+    print(_dumps(result))
     if not result.get("success"):
         sys.exit(1)
 
@@ -8,13 +8,44 @@ Run: python3 camoufox_tiktok_scraper.py profile <handle> [max_videos]
 import json
 import os
 import sys
-import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
 from urllib.parse import unquote, urlparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import simdjson
+    # One reusable parser: simdjson keeps its buffers between documents
+    _SIMDJSON_PARSER = simdjson.Parser()
+except ImportError:
+    _SIMDJSON_PARSER = None
+
+
+def _dumps(obj, pretty: bool = False) -> str:
+    """Serialize stdout JSON with orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0).decode()
+    return json.dumps(obj, indent=2 if pretty else None)
+
+
+def _loads(text):
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
 try:
     from camoufox.sync_api import Camoufox
 except ImportError:
-    print(json.dumps({"error": "camoufox not installed. pip install camoufox[geoip]"}))
+    print(_dumps({"error": "camoufox not installed. pip install camoufox[geoip]"}))
     sys.exit(1)
 
 
@@ -56,11 +87,41 @@ def _resolve_camoufox_proxy_config():
     return proxy
 
 
-def extract_tiktok_profile_js():
-    """Return JS to extract profile and video list from TikTok profile page."""
-    return r"""
+def _camoufox_launch_options() -> dict:
+    launch_options = {"headless": True}
+    proxy_config = _resolve_camoufox_proxy_config()
+    if proxy_config:
+        launch_options["proxy"] = proxy_config
+    return launch_options
+
+
+@contextmanager
+def _page_session(browser=None):
+    """Yield a page: an isolated context on a shared browser (worker mode), else a fresh Camoufox launch."""
+    if browser is not None:
+        context = browser.new_context()
+        try:
+            yield context.new_page()
+        finally:
+            context.close()
+        return
+    with Camoufox(**_camoufox_launch_options()) as owned:
+        yield owned.new_page()
+
+
+# Profile data is usable: the SIGI_STATE blob the extractor reads, or rendered video links
+PROFILE_READY_JS = """
+() => !!(
+    document.querySelector('script#SIGI_STATE')
+    || document.querySelector('a[href*="/video/"]')
+)
+"""
+
+# JS to extract profile and video list from TikTok profile page, built once at import
+EXTRACT_TIKTOK_PROFILE_JS = r"""
     () => {
         const result = { profile: null, videos: [] };
+        const VID_RE = /\/video\/(\d+)/;
         try {
             const scripts = document.querySelectorAll('script[id="SIGI_STATE"]');
             for (const s of scripts) {
@@ -105,11 +166,11 @@ def extract_tiktok_profile_js():
             if (ogDesc && ogDesc.content) {
                 const m = ogDesc.content.match(/@([a-zA-Z0-9._]+)/);
                 const handle = m ? m[1] : '';
-                const links = Array.from(document.querySelectorAll('a[href*="/video/"]'));
+                const links = document.querySelectorAll('a[href*="/video/"]');
                 const seen = new Set();
                 for (const a of links) {
                     const href = a.getAttribute('href') || '';
-                    const vidMatch = href.match(/\/video\/(\d+)/);
+                    const vidMatch = VID_RE.exec(href);
                     if (vidMatch && !seen.has(vidMatch[1])) {
                         seen.add(vidMatch[1]);
                         const img = a.querySelector('img');
@@ -146,7 +207,131 @@ def extract_tiktok_profile_js():
     """
 
 
-def scrape_profile(handle: str, max_videos: int = 30) -> dict:
+def _video_from_item(item: dict) -> dict:
+    stat = item.get("stats") or {}
+    video = item.get("video") or {}
+    created = item.get("createTime") or 0
+    return {
+        "video_id": item.get("id") or "",
+        "url": f"https://www.tiktok.com/@{item.get('author') or ''}/video/{item.get('id') or ''}",
+        "title": item.get("desc") or "",
+        "description": item.get("desc") or "",
+        "duration": video.get("duration") or 0,
+        "view_count": stat.get("playCount") or 0,
+        "like_count": stat.get("diggCount") or 0,
+        "comment_count": stat.get("commentCount") or 0,
+        "share_count": stat.get("shareCount") or 0,
+        "upload_date": datetime.fromtimestamp(int(created), timezone.utc).strftime("%Y%m%d") if created else "",
+        "timestamp": created,
+        "thumbnail": video.get("cover") or video.get("dynamicCover") or "",
+    }
+
+
+def _at(doc, pointer: str):
+    """
+    Resolve a JSON pointer in a parsed blob. With simdjson only the addressed value
+    is materialized into Python objects; the rest of the document is never converted.
+    """
+    if _SIMDJSON_PARSER is None:
+        value = doc
+        for key in pointer.strip("/").split("/"):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    try:
+        value = doc.at_pointer(pointer)
+    except Exception:
+        return None
+    if isinstance(value, simdjson.Object):
+        return value.as_dict()
+    if isinstance(value, simdjson.Array):
+        return value.as_list()
+    return value
+
+
+def _profile_from_user(user: dict, stats: dict = None) -> dict:
+    unique_id = user.get("uniqueId") or ""
+    return {
+        "handle": unique_id or user.get("nickname") or "",
+        "display_name": user.get("nickname") or unique_id,
+        "profile_url": f"https://www.tiktok.com/@{unique_id}",
+        "follower_count": (stats or user).get("followerCount") or 0,
+        "bio": user.get("signature") or "",
+    }
+
+
+def _extract_sigi(doc):
+    result = {"profile": None, "videos": []}
+    users = _at(doc, "/UserModule/users") or {}
+    user = next(iter(users.values()), None) if isinstance(users, dict) else None
+    if user:
+        result["profile"] = _profile_from_user(user)
+    item_ids = _at(doc, "/ItemList/user/post/itemList") or []
+    for item_id in item_ids[:30]:
+        item = _at(doc, f"/ItemModule/{item_id}")
+        if isinstance(item, dict):
+            result["videos"].append(_video_from_item(item))
+    return result
+
+
+def _extract_universal(doc):
+    # Newer profile pages only embed the user; videos still come from the in-page fallback
+    user_info = _at(doc, "/__DEFAULT_SCOPE__/webapp.user-detail/userInfo") or {}
+    user = user_info.get("user") if isinstance(user_info, dict) else None
+    if not user:
+        return {"profile": None, "videos": []}
+    return {"profile": _profile_from_user(user, user_info.get("stats")), "videos": []}
+
+
+def _parse_blob(text: str, extract):
+    try:
+        if _SIMDJSON_PARSER is not None:
+            # The document borrows the parser's buffers; it is dropped before the next parse
+            doc = _SIMDJSON_PARSER.parse(text.encode())
+        else:
+            doc = _loads(text)
+    except ValueError:
+        return None
+    if _SIMDJSON_PARSER is None and not isinstance(doc, dict):
+        return None
+    return extract(doc)
+
+
+def extract_from_html(html: str):
+    """
+    Offline pass over the SIGI_STATE / __UNIVERSAL_DATA_FOR_REHYDRATION__ blobs in
+    page.content(), mirroring the SIGI branch of EXTRACT_TIKTOK_PROFILE_JS. Returns None
+    when selectolax is missing or the blobs yield nothing, so the in-page extractor
+    and its DOM fallbacks run instead.
+    """
+    if HTMLParser is None:
+        return None
+    extractors = {"SIGI_STATE": _extract_sigi, "__UNIVERSAL_DATA_FOR_REHYDRATION__": _extract_universal}
+    for node in HTMLParser(html).css('script#SIGI_STATE, script#__UNIVERSAL_DATA_FOR_REHYDRATION__'):
+        result = _parse_blob(node.text() or "{}", extractors[node.attributes.get("id")])
+        if result and (result["profile"] or result["videos"]):
+            return result
+    return None
+
+
+def _install_extractor(page, name: str, source: str) -> None:
+    """Define the extractor on window via an init script, so it is parsed once per document."""
+    page.add_init_script(f"window.{name} = {source.strip()};")
+
+
+def _call_extractor(page, name: str, source: str):
+    """
+    Call the installed extractor with a few-byte evaluate. Falls back to shipping the
+    full source when the evaluation world cannot see the init script's window.
+    """
+    found = page.evaluate(f"() => typeof window.{name} === 'function' ? {{ value: window.{name}() }} : null")
+    if found is None:
+        return page.evaluate(source)
+    return found.get("value")
+
+
+def scrape_profile(handle: str, max_videos: int = 30, browser=None) -> dict:
     """Scrape TikTok profile using Camoufox."""
     handle = handle.replace('@', '').strip()
     if not handle:
@@ -154,24 +339,24 @@ def scrape_profile(handle: str, max_videos: int = 30) -> dict:
 
     url = f"https://www.tiktok.com/@{handle}"
     try:
-        launch_options = {
-            "headless": True,
-        }
-        proxy_config = _resolve_camoufox_proxy_config()
-        if proxy_config:
-            launch_options["proxy"] = proxy_config
-
-        with Camoufox(**launch_options) as browser:
-            page = browser.new_page()
+        with _page_session(browser) as page:
+            _install_extractor(page, "__extractTiktok", EXTRACT_TIKTOK_PROFILE_JS)
             page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            time.sleep(4)
+            # Return as soon as the data is in the DOM; on timeout the extractor's fallbacks still run
             try:
-                page.wait_for_load_state("networkidle", timeout=15000)
+                page.wait_for_function(PROFILE_READY_JS, timeout=15000, polling=250)
             except Exception:
                 pass
-            time.sleep(2)
 
-            extracted = page.evaluate(extract_tiktok_profile_js())
+            # SIGI_STATE is parsed offline; the in-page extractor covers the og:description/link fallback
+            offline = extract_from_html(page.content()) if HTMLParser is not None else None
+            extracted = offline
+            if not offline or not offline["videos"]:
+                extracted = _call_extractor(page, "__extractTiktok", EXTRACT_TIKTOK_PROFILE_JS)
+                # The embedded profile carries real counts; the og:description fallback does not
+                if offline and isinstance(extracted, dict) and not extracted.get("error"):
+                    extracted["profile"] = offline["profile"] or extracted.get("profile")
+                extracted = extracted or offline
             if not extracted:
                 return {"success": False, "error": "Could not extract profile from page"}
 
@@ -199,12 +384,12 @@ def scrape_profile(handle: str, max_videos: int = 30) -> dict:
 
 def main():
     if len(sys.argv) < 3 or sys.argv[1] != "profile":
-        print(json.dumps({"error": "Usage: python3 camoufox_tiktok_scraper.py profile <handle> [max_videos]"}))
+        print(_dumps({"error": "Usage: python3 camoufox_tiktok_scraper.py profile <handle> [max_videos]"}))
         sys.exit(1)
     handle = sys.argv[2]
     max_videos = int(sys.argv[3]) if len(sys.argv) > 3 else 30
     result = scrape_profile(handle, max_videos)
-    print(json.dumps(result))
+    print(_dumps(result))
     if not result.get("success"):
         sys.exit(1)
 
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Long-lived Camoufox worker: one browser process shared by every request.
+Each request gets its own browser context, so cookies and storage stay isolated.
+Protocol: one JSON request per stdin line, one JSON response per stdout line.
+    {"id": 1, "op": "instagram_profile", "args": {"handle": "nike", "posts_limit": 30}}
+    {"id": 1, "result": {...}}
+Ops: instagram_profile, instagram_media, tiktok_profile, tiktok_download
+Run: python3 camoufox_worker.py
+"""
+
+import json
+import sys
+
+import camoufox_insta_downloader
+import camoufox_instagram_scraper
+import camoufox_tiktok_downloader
+import camoufox_tiktok_scraper
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(line: str):
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def _tiktok_download(browser, url: str, output_path: str) -> dict:
+    if camoufox_tiktok_downloader._is_photo_url(url):
+        return camoufox_tiktok_downloader.download_photo(url, output_path, browser=browser)
+    return camoufox_tiktok_downloader.download_video(url, output_path, browser=browser)
+
+
+def dispatch(shared, op: str, args: dict) -> dict:
+    if op == "instagram_media":
+        # Only falls back to the browser when the fast paths miss, so launch stays lazy
+        return camoufox_insta_downloader.resolve_post(args["post_url"], shared=shared)
+
+    browser = shared.get()
+    if browser is None:
+        return {"success": False, "error": "camoufox not installed. pip install camoufox[geoip]"}
+    if op == "instagram_profile":
+        return camoufox_instagram_scraper.scrape_profile(args["handle"], int(args.get("posts_limit", 30)), browser=browser)
+    if op == "tiktok_profile":
+        return camoufox_tiktok_scraper.scrape_profile(args["handle"], int(args.get("max_videos", 30)), browser=browser)
+    if op == "tiktok_download":
+        return _tiktok_download(browser, args["url"], args["output_path"])
+    return {"success": False, "error": f"Unknown op: {op}"}
+
+
+def main():
+    shared = camoufox_insta_downloader.SharedBrowser()
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            request_id = None
+            try:
+                request = _loads(line)
+                request_id = request.get("id")
+                result = dispatch(shared, request.get("op", ""), request.get("args") or {})
+            except Exception as e:
+                result = {"success": False, "error": str(e)}
+            print(_dumps({"id": request_id, "result": result}))
+            sys.stdout.flush()
+    finally:
+        shared.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,39 +9,178 @@ Methods:
 3. Returns structured JSON
 """
 
+import asyncio
+import hashlib
 import json
+import random
 import sys
 import os
-from typing import List, Dict
+import time
+import weakref
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Optional
+import httpx
 import openai
+from openai import AsyncOpenAI
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Setup OpenAI
 openai.api_key = os.getenv('OPENAI_API_KEY')
 
-def discover_competitors(
-    client_handle: str,
-    client_bio: str,
-    client_niche: str,
-    platform: str = 'instagram',
-    count: int = 10
-) -> List[Dict]:
+# Input-token budget for one batched request; larger batches are split into sub-batches
+BATCH_INPUT_TOKEN_BUDGET = 8000
+# Prompt ceiling for one client; longer bios (pasted website copy) are truncated to fit
+MAX_INPUT_TOKENS = 6000
+
+# Proactive throttling: cap in-flight requests and spend the per-minute token budget
+# evenly, so concurrent discoveries stay under the rate limits instead of retrying 429s
+OPENAI_MAX_CONCURRENCY = int(os.getenv('OPENAI_MAX_CONCURRENCY', '20'))
+OPENAI_TPM_LIMIT = int(os.getenv('OPENAI_TPM_LIMIT', '30000'))
+MAX_ATTEMPTS = 5
+
+# Retrieval task, no frontier reasoning needed: default to the small, fast model
+COMPETITOR_MODEL = os.getenv('COMPETITOR_MODEL') or os.getenv('AI_MODEL_COMPETITOR_DISCOVERY') or 'gpt-4o-mini'
+# Decode time dominates once the prompt is fixed, so output is capped per requested competitor
+COMPLETION_TOKENS_PER_COMPETITOR = 200
+MAX_COMPLETION_TOKENS = 4000
+MAX_BATCH_COMPLETION_TOKENS = 16000
+
+# Canonical exchanges that pin the reply shape and keep reasons short for the small model
+FEW_SHOT_MESSAGES = [
+    {
+        'role': 'user',
+        'content': 'Find 2 competitor accounts. Client: @brewlab_coffee, Platform: Instagram, '
+                   'Bio: Small-batch coffee roastery in Austin, Niche: specialty coffee',
+    },
+    {
+        'role': 'assistant',
+        'content': '{"competitors": ['
+                   '{"handle": "onyxcoffeelab", "platform": "instagram", "discovery_reason": "Specialty roaster with the same single-origin, brew-guide content", "relevance_score": 0.92, "competitor_type": "direct"}, '
+                   '{"handle": "jameshoffmann", "platform": "instagram", "discovery_reason": "Coffee educator the roastery audience already follows", "relevance_score": 0.78, "competitor_type": "aspirational"}'
+                   ']}',
+    },
+    {
+        'role': 'user',
+        'content': 'Find 2 competitor accounts. Client: @liftwithlena, Platform: TikTok, '
+                   'Bio: Strength coach for women, home workouts, Niche: fitness',
+    },
+    {
+        'role': 'assistant',
+        'content': '{"competitors": ['
+                   '{"handle": "sydneycummings", "platform": "tiktok", "discovery_reason": "Home strength workouts aimed at the same audience", "relevance_score": 0.9, "competitor_type": "direct"}, '
+                   '{"handle": "nourishmovelove", "platform": "tiktok", "discovery_reason": "Adjacent at-home fitness programs for women", "relevance_score": 0.74, "competitor_type": "indirect"}'
+                   ']}',
+    },
+]
+
+# Competitor lists are stable for days, so repeat runs for a client are served from disk
+CACHE_DIR = os.path.expanduser(os.getenv('COMPETITOR_CACHE_DIR', '~/.cache/bsm/competitor_discovery'))
+CACHE_TTL = 7 * 24 * 3600
+CACHE_SIZE_LIMIT = 2 ** 30
+
+# Batch API jobs finish within 24 hours; polling more often than this buys nothing
+BATCH_API_POLL_INTERVAL = 60
+BATCH_API_FINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+# Keep-alive pool shared by every request, so only the first call pays TCP + TLS setup
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60)
+HTTP_TIMEOUT = 60
+WARMUP_TIMEOUT = 10
+
+
+class TokenBucket:
     """
-    Discover competitors using AI analysis
-    
-    For now: Pure AI-based discovery (no web scraping)
-    Future: Add SerpAPI/Google Search integration
+    Leaky bucket holding up to `per_minute` tokens, refilled at per_minute / 60 per second.
+    Waiters are served in order; one request larger than the bucket waits for a full bucket.
     """
+    def __init__(self, per_minute: int):
+        self.capacity = per_minute
+        self.tokens = float(per_minute)
+        self.fill_rate = per_minute / 60
+        self.updated = time.monotonic()
+        # The budget is process-wide, but an asyncio.Lock binds to one loop, so each loop gets its own
+        self._locks = weakref.WeakKeyDictionary()
     
-    prompt = f"""You are an expert social media strategist. Find {count} competitor accounts for this client.
+    def _lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        return lock
+    
+    async def consume(self, amount: int):
+        amount = min(amount, self.capacity)
+        async with self._lock():
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.fill_rate)
+
+
+_TPM_BUCKET = TokenBucket(OPENAI_TPM_LIMIT)
+# The concurrency semaphore and the AsyncOpenAI client (whose httpx pool is tied to its loop)
+# are created per event loop, so public coroutines survive repeated asyncio.run calls
+_LOOP_RESOURCES = weakref.WeakKeyDictionary()
+
+
+def _loop_resources() -> Dict:
+    loop = asyncio.get_running_loop()
+    resources = _LOOP_RESOURCES.get(loop)
+    if resources is None:
+        resources = _LOOP_RESOURCES[loop] = {}
+    return resources
+
+
+def _semaphore() -> asyncio.Semaphore:
+    resources = _loop_resources()
+    if 'semaphore' not in resources:
+        resources['semaphore'] = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+    return resources['semaphore']
+
+
+# Prompts are built once at import and filled with format_map per request
+PLATFORM_TITLES = {
+    'instagram': 'Instagram',
+    'tiktok': 'TikTok',
+    'youtube': 'YouTube',
+    'twitter': 'Twitter',
+    'linkedin': 'LinkedIn',
+    'facebook': 'Facebook',
+}
+
+PROMPT_TEMPLATE = """You are an expert social media strategist. Find {count} competitor accounts for this client.
 
 Client Information:
-- Handle: @{client_handle}
-- Platform: {platform.title()}
-- Bio: {client_bio}
-- Niche: {client_niche}
+- Handle: @{handle}
+- Platform: {platform_title}
+- Bio: {bio}
+- Niche: {niche}
 
 Task:
-Find {count} REAL {platform.title()} accounts that are:
+Find {count} REAL {platform_title} accounts that are:
 1. In the same niche as the client
 2. Have similar or larger audience size
 3. Create similar content
@@ -56,58 +195,684 @@ IMPORTANT:
   * Indirect competitors (adjacent niche)
   * Aspirational accounts (larger, client wants to emulate)
 
-Return JSON array:
-[
-  {{
-    "handle": "account_name",
-    "platform": "{platform}",
-    "discovery_reason": "Why this is a relevant competitor",
-    "relevance_score": 0.0-1.0,
-    "competitor_type": "direct/indirect/aspirational"
-  }}
-]
+Return a JSON object:
+{{
+  "competitors": [
+    {{
+      "handle": "account_name",
+      "platform": "{platform}",
+      "discovery_reason": "Why this is a relevant competitor (one short sentence)",
+      "relevance_score": 0.0-1.0,
+      "competitor_type": "direct/indirect/aspirational"
+    }}
+  ]
+}}
 
 Return ONLY valid JSON, no other text."""
 
+BATCH_CLIENT_TEMPLATE = "### Client {index}: handle=@{handle}, platform={platform_title}, bio={bio}, niche={niche}"
+
+BATCH_PROMPT_TEMPLATE = """You are an expert social media strategist. Find {count} competitor accounts for EACH client below.
+
+{clients}
+
+Task:
+For each client, find {count} REAL accounts on the client's platform that are:
+1. In the same niche as the client
+2. Have similar or larger audience size
+3. Create similar content
+4. Are active (post regularly)
+5. Are direct or indirect competitors
+
+IMPORTANT: 
+- Return REAL accounts that actually exist
+- Use specific, well-known accounts in each niche
+- Include a mix of direct, indirect and aspirational competitors
+
+Return a JSON object with one entry per client, using the client's number as client_index:
+{{
+  "results": [
+    {{
+      "client_index": 1,
+      "competitors": [
+        {{
+          "handle": "account_name",
+          "platform": "instagram",
+          "discovery_reason": "Why this is a relevant competitor (one short sentence)",
+          "relevance_score": 0.0-1.0,
+          "competitor_type": "direct/indirect/aspirational"
+        }}
+      ]
+    }}
+  ]
+}}
+
+Return ONLY valid JSON, no other text."""
+
+
+def _dumps(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _loads(content):
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _write_json(obj, pretty: bool = False):
+    """Write one JSON document to stdout; orjson's bytes skip the str encode step"""
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0))
+        sys.stdout.buffer.write(b'\n')
+        sys.stdout.buffer.flush()
+        return
+    print(json.dumps(obj, indent=2 if pretty else None))
+
+
+# Structured outputs pin the reply shape, so the competitor array is always under "competitors"
+_COMPETITOR_ITEM_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'handle': {'type': 'string'},
+        'platform': {'type': 'string'},
+        'discovery_reason': {'type': 'string'},
+        'relevance_score': {'type': 'number'},
+        'competitor_type': {'type': 'string', 'enum': ['direct', 'indirect', 'aspirational']},
+    },
+    # Strict mode requires every property to be listed as required
+    'required': ['handle', 'platform', 'discovery_reason', 'relevance_score', 'competitor_type'],
+    'additionalProperties': False,
+}
+
+COMPETITORS_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {
+        'name': 'competitors',
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'competitors': {'type': 'array', 'items': _COMPETITOR_ITEM_SCHEMA},
+            },
+            'required': ['competitors'],
+            'additionalProperties': False,
+        },
+    },
+}
+
+BATCH_RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {
+        'name': 'competitor_batch',
+        'strict': True,
+        'schema': {
+            'type': 'object',
+            'properties': {
+                'results': {
+                    'type': 'array',
+                    'items': {
+                        'type': 'object',
+                        'properties': {
+                            'client_index': {'type': 'integer'},
+                            'competitors': {'type': 'array', 'items': _COMPETITOR_ITEM_SCHEMA},
+                        },
+                        'required': ['client_index', 'competitors'],
+                        'additionalProperties': False,
+                    },
+                },
+            },
+            'required': ['results'],
+            'additionalProperties': False,
+        },
+    },
+}
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    return tiktoken.encoding_for_model('gpt-4o')
+
+
+def count_tokens(text: str) -> int:
+    """Prompt size in gpt-4o tokens (a chars/4 estimate when tiktoken is not installed)"""
+    if tiktoken is None:
+        return len(text) // 4 + 1
+    return len(_encoding().encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to at most max_tokens gpt-4o tokens (about 4 chars each without tiktoken)"""
+    if max_tokens <= 0:
+        return ''
+    if tiktoken is None:
+        return text[:max_tokens * 4]
+    tokens = _encoding().encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return _encoding().decode(tokens[:max_tokens])
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
     try:
-        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        
-        response = client.chat.completions.create(
-            model='gpt-4o',
-            messages=[{'role': 'user', 'content': prompt}],
-            response_format={'type': 'json_object'},
-            temperature=0.7,
+        # HTTP/2 multiplexes concurrent completions over one connection
+        return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+    except ImportError:
+        # http2 needs the optional h2 package; keep-alive still applies
+        return httpx.AsyncClient(limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
+
+
+def _async_client() -> AsyncOpenAI:
+    """
+    One AsyncOpenAI client per event loop, so concurrent discoveries share its connection pool.
+    Created on first use: the constructor raises when OPENAI_API_KEY is unset,
+    which should surface as a discovery error rather than an import failure.
+    """
+    resources = _loop_resources()
+    client = resources.get('client')
+    if client is None:
+        # max_retries=0: _create_completion owns 429 backoff; SDK retries would multiply under it
+        client = resources['client'] = AsyncOpenAI(
+            api_key=os.getenv('OPENAI_API_KEY'),
+            http_client=_build_async_http_client(),
+            max_retries=0,
         )
-        
-        content = response.choices[0].message.content
-        if not content:
-            print("[CompetitorDiscovery] Empty response from OpenAI", file=sys.stderr)
-            return []
-            
-        result = json.loads(content)
-        
-        # Extract array from result (handle different response formats)
-        competitors = []
-        if 'competitors' in result:
-            competitors = result['competitors']
-        elif isinstance(result, list):
-            competitors = result
-        else:
-            # Try to find the first array in the response
-            for value in result.values():
-                if isinstance(value, list):
-                    competitors = value
-                    break
-        
+    return client
+
+
+@lru_cache(maxsize=1)
+def _cache():
+    """The on-disk result cache, or None when diskcache is missing or the directory is unusable"""
+    if diskcache is None:
+        return None
+    try:
+        return diskcache.Cache(CACHE_DIR, size_limit=CACHE_SIZE_LIMIT)
+    except Exception as e:
+        print(f"[CompetitorDiscovery] Cache disabled: {str(e)}", file=sys.stderr)
+        return None
+
+
+def _cache_key(platform: str, client_handle: str, client_bio: str, client_niche: str, count: int, model: str) -> str:
+    # Unit separators keep field boundaries unambiguous before hashing
+    raw = '\x1f'.join((platform, client_handle, client_bio, client_niche, str(count), model))
+    return hashlib.blake2b(raw.encode()).hexdigest()
+
+
+async def warm_connection():
+    """
+    Open the pooled connection (DNS + TCP + TLS) with a cheap models request, so the
+    first completion does not pay the handshake. Failures are ignored; the real
+    request reports them.
+    """
+    try:
+        # with_options shares the client's connection pool
+        await _async_client().with_options(timeout=WARMUP_TIMEOUT, max_retries=0).models.list()
+    except Exception:
+        pass
+
+
+def _prepare_local_state():
+    """Blocking setup the first request needs: the result cache and the tokenizer"""
+    _cache()
+    if tiktoken is not None:
+        _encoding()
+
+
+async def close_clients():
+    """Close this loop's client connections; call before the event loop shuts down"""
+    client = _loop_resources().pop('client', None)
+    if client is not None:
+        await client.close()
+
+
+async def _create_completion(**kwargs):
+    """
+    Run one chat completion under the concurrency cap and token bucket,
+    backing off exponentially (with jitter) when OpenAI still rate limits
+    """
+    est_tokens = sum(count_tokens(m['content']) for m in kwargs['messages']) + kwargs['max_completion_tokens']
+    for attempt in range(MAX_ATTEMPTS):
+        async with _semaphore():
+            await _TPM_BUCKET.consume(est_tokens)
+            try:
+                return await _async_client().chat.completions.create(**kwargs)
+            except openai.RateLimitError:
+                if attempt == MAX_ATTEMPTS - 1:
+                    raise
+        delay = 2 ** attempt + random.random()
+        print(f"[CompetitorDiscovery] Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_ATTEMPTS})", file=sys.stderr)
+        await asyncio.sleep(delay)
+
+
+async def _request_json(
+    prompt: str,
+    model: str,
+    max_completion_tokens: int,
+    response_format: Dict
+) -> Optional[Dict]:
+    """Send one structured-output chat completion and parse the reply; None on an empty response"""
+    response = await _create_completion(
+        model=model,
+        messages=[{'role': 'user', 'content': prompt}],
+        response_format=response_format,
+        temperature=0.7,
+        max_completion_tokens=max_completion_tokens,
+    )
+    
+    content = response.choices[0].message.content
+    if not content:
+        print("[CompetitorDiscovery] Empty response from OpenAI", file=sys.stderr)
+        return None
+    return _loads(content)
+
+
+async def _stream_competitors(stream, count: int) -> AsyncIterator[Dict]:
+    """
+    Yield each competitor object as soon as its closing brace arrives. Falls back to
+    parsing the whole reply when ijson is not installed.
+    """
+    parts: List[str] = []
+    items = ijson.sendable_list() if ijson is not None else None
+    parser = ijson.items_coro(items, 'competitors.item', use_float=True) if ijson is not None else None
+    yielded = 0
+    try:
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            if parser is None:
+                continue
+            try:
+                parser.send(delta.encode())
+            except ijson.JSONError:
+                parser = None
+                continue
+            for item in items:
+                yield item
+                yielded += 1
+                if yielded >= count:
+                    return
+            del items[:]
+    finally:
+        # Stops the download once enough competitors are in
+        await stream.close()
+    
+    if parser is not None:
+        # Flush whatever the parser still holds at end of input
+        try:
+            parser.close()
+        except ijson.JSONError:
+            pass
+        for item in items[:count - yielded]:
+            yield item
+            yielded += 1
+    if yielded:
+        return
+    content = ''.join(parts)
+    if not content:
+        print("[CompetitorDiscovery] Empty response from OpenAI", file=sys.stderr)
+        return
+    for item in _loads(content)['competitors'][:count]:
+        yield item
+
+
+def _completion_body(
+    client_handle: str,
+    client_bio: str,
+    client_niche: str,
+    platform: str,
+    count: int,
+    model: str
+) -> Dict:
+    """Chat completion arguments for one client, shared by the online and Batch API paths"""
+    fields = {
+        'count': count,
+        'handle': client_handle,
+        'platform': platform,
+        'platform_title': _platform_title(platform),
+        'bio': client_bio,
+        'niche': client_niche,
+    }
+    prompt = PROMPT_TEMPLATE.format_map(fields)
+    n = count_tokens(prompt)
+    if n > MAX_INPUT_TOKENS:
+        # Pre-flight: shrink the bio instead of paying for an oversized prompt
+        bio_budget = MAX_INPUT_TOKENS - count_tokens(PROMPT_TEMPLATE.format_map({**fields, 'bio': ''}))
+        fields['bio'] = truncate_tokens(client_bio, bio_budget)
+        prompt = PROMPT_TEMPLATE.format_map(fields)
+        print(f"[CompetitorDiscovery] Prompt was {n} tokens; bio truncated to {max(bio_budget, 0)} tokens", file=sys.stderr)
+    return {
+        'model': model,
+        'messages': [*FEW_SHOT_MESSAGES, {'role': 'user', 'content': prompt}],
+        'response_format': COMPETITORS_RESPONSE_FORMAT,
+        'temperature': 0.7,
+        'max_completion_tokens': min(COMPLETION_TOKENS_PER_COMPETITOR * count, MAX_COMPLETION_TOKENS),
+    }
+
+
+async def discover_competitors_stream(
+    client_handle: str,
+    client_bio: str,
+    client_niche: str,
+    platform: str = 'instagram',
+    count: int = 10,
+    model: str = COMPETITOR_MODEL
+) -> AsyncIterator[Dict]:
+    """
+    Discover competitors using AI analysis, yielding each one as it streams in
+    
+    Callers can stop iterating early; the OpenAI stream is closed when they do.
+    Errors propagate to the caller.
+    """
+    cache = _cache()
+    key = _cache_key(platform, client_handle, client_bio, client_niche, count, model)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            print(f"[CompetitorDiscovery] Cache hit: {len(cached)} competitors", file=sys.stderr)
+            for item in cached:
+                yield item
+            return
+    
+    stream = await _create_completion(
+        **_completion_body(client_handle, client_bio, client_niche, platform, count, model),
+        stream=True,
+    )
+    competitors = []
+    async for competitor in _stream_competitors(stream, count):  # Limited to requested count
+        competitors.append(competitor)
+        yield competitor
+    
+    if cache is not None and competitors:
+        cache.set(key, competitors, expire=CACHE_TTL)
+
+
+async def discover_competitors(
+    client_handle: str,
+    client_bio: str,
+    client_niche: str,
+    platform: str = 'instagram',
+    count: int = 10,
+    model: str = COMPETITOR_MODEL
+) -> List[Dict]:
+    """
+    Discover competitors using AI analysis
+    
+    For now: Pure AI-based discovery (no web scraping)
+    Future: Add SerpAPI/Google Search integration
+    """
+    try:
+        competitors = [
+            c async for c in discover_competitors_stream(client_handle, client_bio, client_niche, platform, count, model)
+        ]
         print(f"[CompetitorDiscovery] Found {len(competitors)} competitors", file=sys.stderr)
-        
-        return competitors[:count]  # Limit to requested count
+        return competitors
         
     except Exception as e:
         print(f"[CompetitorDiscovery] Error: {str(e)}", file=sys.stderr)
         return []
 
 
+def _platform_title(platform: str) -> str:
+    return PLATFORM_TITLES.get(platform, platform.title())
+
+
+def _batch_client_block(index: int, client: Dict) -> str:
+    platform = client.get('platform', 'instagram')
+    return BATCH_CLIENT_TEMPLATE.format_map({
+        'index': index,
+        'handle': client['client_handle'],
+        'platform_title': _platform_title(platform),
+        'bio': client['client_bio'],
+        'niche': client['client_niche'],
+    })
+
+
+def _batch_prompt(blocks: List[str], count: int) -> str:
+    return BATCH_PROMPT_TEMPLATE.format_map({'count': count, 'clients': "\n".join(blocks)})
+
+
+def _fit_batch_bio(client: Dict, count: int) -> Dict:
+    """
+    Shrink an oversized bio so a batched prompt holding only this client stays under
+    MAX_INPUT_TOKENS, the same ceiling _completion_body applies to single requests
+    """
+    budget = MAX_INPUT_TOKENS - count_tokens(_batch_prompt([], count))
+    n = count_tokens(_batch_client_block(1, client))
+    if n <= budget:
+        return client
+    bio_budget = budget - count_tokens(_batch_client_block(1, {**client, 'client_bio': ''}))
+    print(f"[CompetitorDiscovery] Batch block for @{client['client_handle']} was {n} tokens; bio truncated to {max(bio_budget, 0)} tokens", file=sys.stderr)
+    return {**client, 'client_bio': truncate_tokens(client['client_bio'], bio_budget)}
+
+
+def _split_batches(clients: List[Dict], count: int, budget: int) -> List[List[int]]:
+    """Group client indexes so each batched prompt stays under the input-token budget"""
+    base_tokens = count_tokens(_batch_prompt([], count))
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = base_tokens
+    for i, client in enumerate(clients):
+        block_tokens = count_tokens(_batch_client_block(i + 1, client)) + 1
+        if current and current_tokens + block_tokens > budget:
+            batches.append(current)
+            current = []
+            current_tokens = base_tokens
+        current.append(i)
+        current_tokens += block_tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+async def _discover_sub_batch(
+    clients: List[Dict],
+    indexes: List[int],
+    count: int,
+    model: str,
+    results: List[List[Dict]]
+):
+    # Clients are numbered from 1 within each sub-batch prompt
+    blocks = [_batch_client_block(n + 1, clients[i]) for n, i in enumerate(indexes)]
+    max_tokens = min(COMPLETION_TOKENS_PER_COMPETITOR * count * len(indexes), MAX_BATCH_COMPLETION_TOKENS)
+    try:
+        result = await _request_json(_batch_prompt(blocks, count), model, max_tokens, BATCH_RESPONSE_FORMAT)
+    except Exception as e:
+        print(f"[CompetitorDiscovery] Batch error: {str(e)}", file=sys.stderr)
+        return
+    if result is None:
+        return
+    for entry in result['results']:
+        position = entry['client_index'] - 1
+        if 0 <= position < len(indexes):
+            results[indexes[position]] = entry['competitors'][:count]
+
+
+def _dedupe_key(client: Dict, count: int) -> tuple:
+    """Clients with the same platform, niche and (whitespace/case-normalized) bio get one generation"""
+    bio = ' '.join(client['client_bio'].lower().split())
+    return (
+        client.get('platform', 'instagram'),
+        client['client_niche'].lower().strip(),
+        hashlib.blake2b(bio.encode()).digest()[:8],
+        count,
+    )
+
+
+def _without_handle(competitors: List[Dict], handle: str) -> List[Dict]:
+    own = handle.lstrip('@').lower()
+    return [c for c in competitors if str(c.get('handle', '')).lstrip('@').lower() != own]
+
+
+async def discover_competitors_batch(
+    clients: List[Dict],
+    count: int = 10,
+    token_budget: int = BATCH_INPUT_TOKEN_BUDGET,
+    model: str = COMPETITOR_MODEL
+) -> List[List[Dict]]:
+    """
+    Discover competitors for several clients with one OpenAI request per sub-batch
+    
+    Each client is a dict of discover_competitors arguments (client_handle, client_bio,
+    client_niche, optional platform). Returns one competitor list per client, in input order.
+    Clients sharing a platform, niche and bio are sent once; sub-batches are sent concurrently.
+    """
+    keys = [_dedupe_key(c, count) for c in clients]
+    first_index: Dict[tuple, int] = {}
+    for i, key in enumerate(keys):
+        first_index.setdefault(key, i)
+    unique_clients = [_fit_batch_bio(clients[i], count) for i in first_index.values()]
+    slot = {key: n for n, key in enumerate(first_index)}
+    
+    unique_results: List[List[Dict]] = [[] for _ in unique_clients]
+    await asyncio.gather(*[
+        _discover_sub_batch(unique_clients, indexes, count, model, unique_results)
+        for indexes in _split_batches(unique_clients, count, token_budget)
+    ])
+    # Fan each generation back out to every client that shares its key. The prompt named only the
+    # first client, so a sharer may find itself in the list; each copy drops the client's own handle.
+    results = [
+        _without_handle(unique_results[slot[key]], client['client_handle'])
+        for client, key in zip(clients, keys)
+    ]
+    
+    print(
+        f"[CompetitorDiscovery] Batch found competitors for {sum(1 for r in results if r)}/{len(clients)} clients "
+        f"({len(unique_clients)} unique)",
+        file=sys.stderr,
+    )
+    return results
+
+
+async def discover_many(clients: List[Dict]) -> List[List[Dict]]:
+    """
+    Run one discover_competitors request per client concurrently
+    
+    Each client is a dict of discover_competitors keyword arguments.
+    """
+    return await asyncio.gather(*[discover_competitors(**c) for c in clients])
+
+
+async def discover_multi_platform(
+    client_handle: str,
+    client_bio: str,
+    client_niche: str,
+    platforms: List[str],
+    count: int = 10
+) -> Dict[str, List[Dict]]:
+    """
+    Discover competitors for one client on several platforms concurrently
+    
+    One process and one connection pool serve every platform, instead of a script run each.
+    """
+    results = await asyncio.gather(*[
+        discover_competitors(client_handle, client_bio, client_niche, p, count) for p in platforms
+    ])
+    return dict(zip(platforms, results))
+
+
+def _write_batch_requests(clients: List[Dict], path: str, count: int, model: str):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, client in enumerate(clients):
+            body = _completion_body(
+                client['client_handle'],
+                client['client_bio'],
+                client['client_niche'],
+                client.get('platform', 'instagram'),
+                count,
+                model,
+            )
+            # Handles can repeat across platforms, so the input position keeps custom_id unique
+            line = {
+                'custom_id': f"{i}:{client['client_handle']}",
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': body,
+            }
+            f.write(_dumps(line) + '\n')
+
+
+async def discover_competitors_batch_api(
+    clients: List[Dict],
+    output_path: str,
+    count: int = 10,
+    model: str = COMPETITOR_MODEL,
+    poll_interval: int = BATCH_API_POLL_INTERVAL
+) -> List[List[Dict]]:
+    """
+    Discover competitors for a large offline job through the OpenAI Batch API
+    
+    Half the price of online calls and outside the online rate limits, but may take
+    up to 24 hours. The request JSONL is written to output_path, uploaded and polled
+    until the batch finishes. Returns one competitor list per client, in input order.
+    """
+    # Upload/poll calls sit outside _create_completion's retry loop, so they keep the SDK default
+    client = _async_client().with_options(max_retries=2)
+    _write_batch_requests(clients, output_path, count, model)
+    with open(output_path, 'rb') as f:
+        input_file = await client.files.create(file=f, purpose='batch')
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint='/v1/chat/completions',
+        completion_window='24h',
+    )
+    print(f"[CompetitorDiscovery] Submitted batch {batch.id} for {len(clients)} clients", file=sys.stderr)
+    
+    while batch.status not in BATCH_API_FINAL_STATUSES:
+        await asyncio.sleep(poll_interval)
+        batch = await client.batches.retrieve(batch.id)
+        counts = batch.request_counts
+        if counts is not None:
+            print(f"[CompetitorDiscovery] Batch {batch.id}: {batch.status} ({counts.completed}/{counts.total})", file=sys.stderr)
+    
+    if batch.status != 'completed' or not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
+    
+    output = await client.files.content(batch.output_file_id)
+    results: List[List[Dict]] = [[] for _ in clients]
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        record = _loads(line)
+        response = record.get('response') or {}
+        if response.get('status_code') != 200:
+            continue
+        index = int(record['custom_id'].split(':', 1)[0])
+        content = response['body']['choices'][0]['message']['content']
+        if content:
+            results[index] = _loads(content)['competitors'][:count]
+    
+    print(f"[CompetitorDiscovery] Batch found competitors for {sum(1 for r in results if r)}/{len(clients)} clients", file=sys.stderr)
+    return results
+
+
+def _all_cached(cache_keys: Optional[List[str]]) -> bool:
+    cache = _cache()
+    return bool(cache_keys) and cache is not None and all(key in cache for key in cache_keys)
+
+
+async def _run_cli(coro, cache_keys: Optional[List[str]] = None):
+    """
+    Run one CLI coroutine, closing the shared client afterwards. Unless every result is
+    already cached under cache_keys, the connection is warmed alongside the real request
+    rather than ahead of it, so the warm-up never adds a round-trip.
+    """
+    warmup = None
+    try:
+        await asyncio.to_thread(_prepare_local_state)
+        if not _all_cached(cache_keys):
+            warmup = asyncio.create_task(warm_connection())
+        return await coro
+    finally:
+        if warmup is not None:
+            warmup.cancel()
+            await asyncio.gather(warmup, return_exceptions=True)
+        await close_clients()
+
+
 def discover_with_web_search(client_handle: str, client_niche: str, count: int = 10):
     """
     TODO: Implement web search using SerpAPI
@@ -122,22 +887,72 @@ def discover_with_web_search(client_handle: str, client_niche: str, count: int =
     pass
 
 
-if __name__ == '__main__':
-    if len(sys.argv) < 4:
+def _exit_with_error(e: Exception):
+    """
+    Report a failure as JSON on stderr and exit 1. stdout gets an empty document,
+    so readers never see a partial result followed by an error object.
+    """
+    error = {'error': str(e), 'type': type(e).__name__}
+    if orjson is not None:
+        sys.stderr.buffer.write(orjson.dumps(error) + b'\n')
+    else:
+        sys.stderr.write(json.dumps(error) + '\n')
+    sys.stderr.flush()
+    sys.stdout.write('{}\n')
+    sys.stdout.flush()
+    sys.exit(1)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        if len(sys.argv) < 4:
+            print(json.dumps({
+                'error': 'Usage: python3 competitor_discovery.py --batch <clients.json> <requests.jsonl> [count]'
+            }))
+            sys.exit(1)
+        try:
+            # clients.json holds a list of {client_handle, client_bio, client_niche, platform?} objects
+            with open(sys.argv[2], 'rb') as f:
+                clients = _loads(f.read())
+            count = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+            results = asyncio.run(_run_cli(discover_competitors_batch_api(clients, sys.argv[3], count)))
+            _write_json({'results': results}, pretty=True)
+        except Exception as e:
+            _exit_with_error(e)
+        return
+    
+    args = sys.argv[1:]
+    platforms = None
+    if '--platforms' in args:
+        flag = args.index('--platforms')
+        platforms = [p.strip() for p in (args[flag + 1] if flag + 1 < len(args) else '').split(',') if p.strip()]
+        del args[flag:flag + 2]
+    
+    if len(args) < 3 or platforms == []:
         print(json.dumps({
-            'error': 'Usage: python3 competitor_discovery.py <handle> <bio> <niche> [count] [platform]'
+            'error': 'Usage: python3 competitor_discovery.py <handle> <bio> <niche> [count] [platform] '
+                     '| <handle> <bio> <niche> [count] --platforms instagram,tiktok,youtube'
         }))
         sys.exit(1)
     
-    handle = sys.argv[1].replace('@', '')
-    bio = sys.argv[2]
-    niche = sys.argv[3]
-    count = int(sys.argv[4]) if len(sys.argv) > 4 else 10
-    platform = sys.argv[5] if len(sys.argv) > 5 else 'instagram'
+    handle = args[0].replace('@', '')
+    bio = args[1]
+    niche = args[2]
+    count = int(args[3]) if len(args) > 3 else 10
+    platform = args[4] if len(args) > 4 else 'instagram'
     
     try:
-        competitors = discover_competitors(handle, bio, niche, platform, count)
-        print(json.dumps({'competitors': competitors}, indent=2))
+        if platforms:
+            keys = [_cache_key(p, handle, bio, niche, count, COMPETITOR_MODEL) for p in platforms]
+            by_platform = asyncio.run(_run_cli(discover_multi_platform(handle, bio, niche, platforms, count), keys))
+            _write_json({'competitors_by_platform': by_platform}, pretty=True)
+            return
+        keys = [_cache_key(platform, handle, bio, niche, count, COMPETITOR_MODEL)]
+        competitors = asyncio.run(_run_cli(discover_competitors(handle, bio, niche, platform, count), keys))
+        _write_json({'competitors': competitors}, pretty=True)
     except Exception as e:
-        print(json.dumps({'error': str(e)}), file=sys.stdout)
-        sys.exit(1)
+        _exit_with_error(e)
+
+
+if __name__ == '__main__':
+    main()
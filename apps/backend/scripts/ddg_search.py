@@ -10,12 +10,19 @@ Capabilities:
 4. Raw Search (get all results for DB storage)
 """
 
+import asyncio
 import json
 import os
 import sys
 import re
+import threading
 import time
-from typing import List, Dict, Optional
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, List, Dict, Optional
+from urllib.parse import urlsplit
 from ddgs import DDGS
 from proxy_manager import (
     ProxyRotator,
@@ -25,11 +32,74 @@ from proxy_manager import (
     redact_proxy_url,
 )
 
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
+
 # Maximum results per query (DDG practical limit is around 100-200)
 MAX_RESULTS_PER_QUERY = 100
 PROXY_ROTATOR = ProxyRotator.from_env_and_file()
 MAX_PROXY_RETRIES = get_retry_attempts(default=4)
 
+# In-process memo for repeated query lists and brand lookups
+SEARCH_CACHE_TTL = 3600  # seconds
+SEARCH_CACHE_MAX_ENTRIES = 512
+
+# On-disk cache of ddgs responses, shared across CLI runs
+DDG_CACHE_DIR = os.path.expanduser(os.environ.get("DDG_CACHE_DIR", "~/.cache/bsm/ddg_search"))
+DDG_CACHE_TTL = 24 * 3600
+DDG_CACHE_SIZE_LIMIT = 2 ** 28
+
+# URL dedupe: a false positive silently drops a unique URL; at 1e-6 that is roughly
+# one lost hit per million checks for ~29 bits per URL
+SEEN_URLS_INITIAL_CAPACITY = 10_000
+SEEN_URLS_ERROR_RATE = 1e-6
+
+# Handle / stat patterns, compiled once for the per-result loops
+RE_INSTA = re.compile(r'instagram\.com/([a-zA-Z0-9_.]+)')
+RE_TIKTOK = re.compile(r'tiktok\.com/@([a-zA-Z0-9_.]+)')
+RE_TWITTER = re.compile(r'(?:twitter|x)\.com/([a-zA-Z0-9_]+)')
+RE_LINKEDIN = re.compile(r'linkedin\.com/(?:company|in)/([a-zA-Z0-9_-]+)')
+RE_YOUTUBE = re.compile(r'youtube\.com/(?:@|c/|channel/)([a-zA-Z0-9_-]+)')
+RE_FACEBOOK = re.compile(r'facebook\.com/([a-zA-Z0-9_.]+)')
+# Path segments that are site sections rather than account handles
+IG_RESERVED = frozenset({'p', 'explore', 'reel', 'reels', 'stories', 'tv', 'accounts'})
+TW_RESERVED = frozenset({'search', 'hashtag', 'i', 'intent', 'compose'})
+FB_RESERVED = frozenset({'pages', 'groups', 'events', 'watch', 'marketplace', 'gaming'})
+
+# Handle patterns anchored at the start of an already-classified URL path
+RE_IG_PATH = re.compile(r'/([a-zA-Z0-9_.]+)')
+RE_TT_PATH = re.compile(r'/@([a-zA-Z0-9_.]+)')
+RE_TW_PATH = re.compile(r'/([a-zA-Z0-9_]+)')
+RE_AT_HANDLE = re.compile(r'@([a-zA-Z0-9_.]{1,30})')
+RE_FOLLOWERS = re.compile(r'([\d.,]+[KkMmBb]?)\s+Followers', re.IGNORECASE)
+RE_FOLLOWING = re.compile(r'([\d.,]+[KkMmBb]?)\s+Following', re.IGNORECASE)
+RE_POSTS = re.compile(r'([\d.,]+[KkMmBb]?)\s+(?:Posts|Videos)', re.IGNORECASE)
+
+COMPETITOR_INTENTS = frozenset({'COMPANY_BRAND', 'CREATOR', 'LOCAL_BUSINESS', 'B2B_SAAS'})
+
+# Concurrent DDG requests; a wider fan-out trips DDG throttling
+DDG_MAX_CONCURRENCY = max(1, int(os.environ.get("DDG_MAX_CONCURRENCY", "8") or 8))
+# asyncio primitives bind to the first loop that waits on them, and each sync wrapper
+# runs its own asyncio.run loop, so every loop gets its own semaphore (see _ddg_semaphore)
+_DDG_SEMAPHORES = weakref.WeakKeyDictionary()
+# Blocking ddgs calls get their own pool, sized to the semaphore; the default executor
+# is min(32, cpus + 4) and would cap concurrency below DDG_MAX_CONCURRENCY on small boxes
+_EXECUTOR = ThreadPoolExecutor(max_workers=DDG_MAX_CONCURRENCY, thread_name_prefix="ddgs")
+DDG_BACKOFF_BASE_SECONDS = 0.5
+DDG_BACKOFF_MAX_SECONDS = 60.0
+
 
 def _env_true(name: str, fallback: bool = False) -> bool:
     raw = str(os.environ.get(name, "")).strip().lower()
@@ -42,6 +112,16 @@ def _self_rotation_disabled() -> bool:
     return _env_true("SCRAPER_PROXY_DISABLE_SELF_ROTATION", False)
 
 
+def _seen_urls():
+    """
+    Membership filter for URL dedupe. A scalable Bloom filter stays a few MB at
+    hundreds of thousands of URLs; falls back to a set when pybloom_live is missing.
+    """
+    if ScalableBloomFilter is not None:
+        return ScalableBloomFilter(initial_capacity=SEEN_URLS_INITIAL_CAPACITY, error_rate=SEEN_URLS_ERROR_RATE)
+    return set()
+
+
 def _allow_direct_fallback() -> bool:
     if _self_rotation_disabled():
         return False
@@ -51,16 +131,145 @@ def _allow_direct_fallback() -> bool:
     return raw in {"1", "true", "yes", "y", "on"}
 
 
-def _run_ddgs_call(callable_fn, *, action: str):
-    attempts = MAX_PROXY_RETRIES if _self_rotation_disabled() or PROXY_ROTATOR.has_proxies() else 1
+@dataclass(frozen=True, slots=True)
+class Hit:
+    """One text search result; kept as a compact record until the JSON boundary"""
+    query: str
+    title: str
+    href: str
+    body: str
+    
+    def to_dict(self) -> Dict:
+        return {'query': self.query, 'title': self.title, 'href': self.href, 'body': self.body}
+
+
+def _json_default(obj):
+    if isinstance(obj, Hit):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write_json(obj, pretty: bool = False):
+    """Write one JSON document to stdout, compact unless `pretty`; orjson's bytes skip the str encode step"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if pretty else 0
+        sys.stdout.buffer.write(orjson.dumps(obj, option=option, default=_json_default))
+        sys.stdout.buffer.write(b'\n')
+        sys.stdout.buffer.flush()
+        return
+    if pretty:
+        print(json.dumps(obj, indent=2, default=_json_default))
+    else:
+        print(json.dumps(obj, separators=(',', ':'), default=_json_default))
+
+
+def _write_ndjson(records):
+    """Write one compact JSON record per line, so readers can consume results as they arrive"""
+    for record in records:
+        if orjson is not None:
+            sys.stdout.buffer.write(orjson.dumps(record, default=_json_default) + b'\n')
+        else:
+            sys.stdout.write(json.dumps(record, separators=(',', ':'), default=_json_default) + '\n')
+    sys.stdout.flush()
+
+
+class TTLCache:
+    """Insertion-ordered memo; entries expire after `ttl` seconds and the oldest go past `maxsize`"""
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict = {}
+    
+    def get(self, key):
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        return value
+    
+    def set(self, key, value) -> None:
+        self._data.pop(key, None)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        while len(self._data) > self.maxsize:
+            del self._data[next(iter(self._data))]
+
+
+_RAW_SEARCH_CACHE = TTLCache(SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL)
+_BRAND_CONTEXT_CACHE = TTLCache(SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL)
+
+
+def _raise_if_transport_exhausted(
+    *,
+    action: str,
+    total_queries: int,
+    successful_queries: int,
+    retryable_failures: int,
+    last_retryable_error: Optional[Exception],
+) -> None:
+    if successful_queries > 0:
+        return
+    if total_queries <= 0:
+        return
+    if retryable_failures <= 0:
+        return
+    if last_retryable_error:
+        raise RuntimeError(
+            f"{action} exhausted due to transport/proxy failures: {last_retryable_error}"
+        ) from last_retryable_error
+    raise RuntimeError(f"{action} exhausted due to transport/proxy failures")
+
+
+# One DDGS per worker thread and proxy, so its HTTP client keeps connections alive across queries
+_DDGS_CLIENTS = threading.local()
+
+
+def _ddgs_client(proxy_url: Optional[str]) -> DDGS:
+    clients = getattr(_DDGS_CLIENTS, 'by_proxy', None)
+    if clients is None:
+        clients = _DDGS_CLIENTS.by_proxy = {}
+    client = clients.get(proxy_url)
+    if client is None:
+        client = clients[proxy_url] = DDGS(proxy=proxy_url) if proxy_url else DDGS()
+    return client
+
+
+def _call_ddgs(callable_fn, proxy_url: Optional[str]):
+    try:
+        return callable_fn(_ddgs_client(proxy_url))
+    except Exception:
+        # The failed client may hold a broken connection; the retry starts a fresh one
+        _DDGS_CLIENTS.by_proxy.pop(proxy_url, None)
+        raise
+
+
+def _ddg_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _DDG_SEMAPHORES.get(loop)
+    if sem is None:
+        sem = _DDG_SEMAPHORES[loop] = asyncio.Semaphore(DDG_MAX_CONCURRENCY)
+    return sem
+
+
+async def _bounded(callable_fn, proxy_url: Optional[str]):
+    # ddgs only ships a blocking client; run it off the event loop so queries overlap,
+    # but never more than DDG_MAX_CONCURRENCY at once
+    async with _ddg_semaphore():
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_EXECUTOR, _call_ddgs, callable_fn, proxy_url)
+
+
+async def _run_ddgs_call_async(callable_fn, *, action: str):
+    attempts = MAX_PROXY_RETRIES
     last_error: Optional[Exception] = None
 
     for attempt in range(1, attempts + 1):
         proxy_url = PROXY_ROTATOR.get_next_proxy_url()
         proxy_label = redact_proxy_url(proxy_url) if proxy_url else "direct"
         try:
-            ddgs = DDGS(proxy=proxy_url) if proxy_url else DDGS()
-            return callable_fn(ddgs)
+            return await _bounded(callable_fn, proxy_url)
         except Exception as exc:
             last_error = exc
             if proxy_url:
@@ -70,17 +279,22 @@ def _run_ddgs_call(callable_fn, *, action: str):
             if attempt >= attempts or not retryable:
                 break
 
-            wait_s = compute_backoff_seconds(attempt)
+            wait_s = compute_backoff_seconds(
+                attempt,
+                base_seconds=DDG_BACKOFF_BASE_SECONDS,
+                max_seconds=DDG_BACKOFF_MAX_SECONDS,
+            )
             print(
                 f"[DDG] {action} failed via {proxy_label} (attempt {attempt}/{attempts}): {exc}. Retrying in {wait_s:.2f}s",
                 file=sys.stderr,
             )
-            time.sleep(wait_s)
+            # Sleep outside the semaphore so other queries keep their slots
+            await asyncio.sleep(wait_s)
 
     if PROXY_ROTATOR.has_proxies() and _allow_direct_fallback():
         try:
             print(f"[DDG] {action} falling back to direct request", file=sys.stderr)
-            return callable_fn(DDGS())
+            return await _bounded(callable_fn, None)
         except Exception as exc:
             last_error = exc
 
@@ -89,83 +303,219 @@ def _run_ddgs_call(callable_fn, *, action: str):
     raise RuntimeError(f"DDGS call failed for {action}")
 
 
-def _raise_if_transport_exhausted(
-    *,
-    action: str,
-    total_queries: int,
-    successful_queries: int,
-    retryable_failures: int,
-    last_retryable_error: Optional[Exception],
-) -> None:
-    if successful_queries > 0:
-        return
-    if total_queries <= 0:
-        return
-    if retryable_failures <= 0:
-        return
-    if last_retryable_error:
-        raise RuntimeError(
-            f"{action} exhausted due to transport/proxy failures: {last_retryable_error}"
-        ) from last_retryable_error
-    raise RuntimeError(f"{action} exhausted due to transport/proxy failures")
+# Fields each search type's consumers read; everything else ddgs returns is dropped as results stream in
+RESULT_FIELDS = {
+    'text': ('title', 'href', 'body'),
+    'news': ('title', 'body', 'url', 'source', 'image', 'date'),
+    'videos': ('title', 'description', 'content', 'embed_url', 'duration', 'publisher', 'uploader', 'statistics', 'images', 'published'),
+    'images': ('title', 'image', 'thumbnail', 'url', 'width', 'height'),
+}
+
+
+def _stream_results(client, method: str, query: str, max_results: int) -> List[Dict]:
+    """Iterate the ddgs results directly, keeping only the projected fields of each hit"""
+    fields = RESULT_FIELDS[method]
+    return [
+        {field: r[field] for field in fields if field in r}
+        for r in getattr(client, method)(query, max_results=max_results)
+    ]
 
 
-def raw_search(queries: List[str], max_per_query: int = MAX_RESULTS_PER_QUERY) -> List[Dict]:
+@lru_cache(maxsize=None)
+def _response_cache():
+    """The on-disk response cache, or None when diskcache is missing or the directory is unusable"""
+    if diskcache is None:
+        return None
+    try:
+        return diskcache.Cache(DDG_CACHE_DIR, size_limit=DDG_CACHE_SIZE_LIMIT)
+    except Exception as e:
+        print(f"[DDG] Response cache disabled: {e}", file=sys.stderr)
+        return None
+
+
+async def _cached_search(method: str, query: str, max_results: int, *, action: str) -> List[Dict]:
+    """One ddgs search, answered from the on-disk cache when a previous run already made it"""
+    cache = _response_cache()
+    key = f"{method}\x1f{query.strip().lower()}\x1f{max_results}"
+    if cache is not None:
+        cached = await asyncio.to_thread(cache.get, key)
+        if cached is not None:
+            return cached
+    
+    results = await _run_ddgs_call_async(
+        lambda client: _stream_results(client, method, query, max_results),
+        action=action,
+    )
+    if cache is not None:
+        await asyncio.to_thread(cache.set, key, results, expire=DDG_CACHE_TTL)
+    return results
+
+
+class QueryBatcher:
     """
-    Execute multiple queries and return ALL raw results
-    This is for storing in DB for later processing
+    Collapses identical DDG searches issued by concurrent coroutines into one
+    in-flight request; every caller awaits the same task.
     """
-    all_results = []
-    seen_hrefs = set()  # Dedupe by URL
-    successful_queries = 0
-    retryable_failures = 0
-    last_retryable_error: Optional[Exception] = None
+    def __init__(self):
+        self._in_flight: Dict[tuple, asyncio.Task] = {}
+    
+    async def run(self, method: str, query: str, max_results: int, *, action: str) -> List[Dict]:
+        key = (method, query.strip().lower(), max_results)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(_cached_search(method, query, max_results, action=action))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded so one cancelled caller does not cancel the search for the others
+        return await asyncio.shield(task)
+
 
+QUERY_BATCHER = QueryBatcher()
+
+
+def _dedupe_queries(queries: List[str]) -> List[str]:
+    """Drop queries that only differ by case or surrounding whitespace, keeping the first spelling"""
+    unique: Dict[str, str] = {}
     for query in queries:
-        try:
-            print(f"[DDG] Searching: {query}", file=sys.stderr)
-            results = _run_ddgs_call(
-                lambda client: list(client.text(query, max_results=max_per_query)),
-                action=f"text search '{query}'",
-            )
-            successful_queries += 1
-            
-            for r in results:
-                href = r.get('href', '')
-                if href and href not in seen_hrefs:
-                    all_results.append({
-                        'query': query,
-                        'title': r.get('title', ''),
-                        'href': href,
-                        'body': r.get('body', ''),
-                    })
-                    seen_hrefs.add(href)
-                    
-            print(f"[DDG] Got {len(results)} results, total unique: {len(all_results)}", file=sys.stderr)
-            
-        except Exception as e:
-            print(f"[DDG] Query failed: {query} - {e}", file=sys.stderr)
-            if is_retryable_proxy_error(e):
+        query = query.strip()
+        unique.setdefault(query.lower(), query)
+    return list(unique.values())
+
+
+async def _search_queries(queries: List[str], method: str, max_per_query: int, *, action: str, label: str) -> List[tuple]:
+    """
+    Run the ddgs `method` search for every distinct query concurrently.
+    Returns (query, results) pairs for the queries that succeeded, in query order,
+    so dedupe downstream keeps the same first-seen winner as a serial run.
+    """
+    queries = _dedupe_queries(queries)
+    
+    async def run(query: str):
+        print(f"[DDG] {label}: {query}", file=sys.stderr)
+        return await QUERY_BATCHER.run(method, query, max_per_query, action=f"{action} '{query}'")
+
+    outcomes = await asyncio.gather(*(run(query) for query in queries), return_exceptions=True)
+
+    succeeded = []
+    retryable_failures = 0
+    last_retryable_error: Optional[Exception] = None
+    for query, outcome in zip(queries, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"[DDG] {label} failed: {query} - {outcome}", file=sys.stderr)
+            if is_retryable_proxy_error(outcome):
                 retryable_failures += 1
-                last_retryable_error = e
+                last_retryable_error = outcome
             continue
+        succeeded.append((query, outcome))
 
     _raise_if_transport_exhausted(
-        action="raw_search",
+        action=action,
         total_queries=len(queries),
-        successful_queries=successful_queries,
+        successful_queries=len(succeeded),
         retryable_failures=retryable_failures,
         last_retryable_error=last_retryable_error,
     )
+    return succeeded
 
-    return all_results
+
+async def raw_search_async(queries: List[str], max_per_query: int = MAX_RESULTS_PER_QUERY) -> List[Hit]:
+    """
+    Execute multiple queries concurrently and return ALL raw results
+    This is for storing in DB for later processing
+    Memoized per query set for SEARCH_CACHE_TTL seconds
+    """
+    cache_key = (tuple(sorted(queries)), max_per_query)
+    cached = _RAW_SEARCH_CACHE.get(cache_key)
+    if cached is not None:
+        print(f"[DDG] Reusing {len(cached)} cached results for {len(queries)} queries", file=sys.stderr)
+        return list(cached)
+    
+    all_results = []
+    seen_hrefs = _seen_urls()  # Dedupe by URL
+
+    searched = await _search_queries(
+        queries,
+        'text',
+        max_per_query,
+        action="raw_search",
+        label="Searching",
+    )
+    for query, results in searched:
+        for r in results:
+            href = r.get('href', '')
+            if href and href not in seen_hrefs:
+                all_results.append(Hit(query, r.get('title', ''), href, r.get('body', '')))
+                seen_hrefs.add(href)
+                
+        print(f"[DDG] Got {len(results)} results for {query}, total unique: {len(all_results)}", file=sys.stderr)
+
+    # A partial result (some queries failed) is returned but not memoized
+    if len(searched) == len(_dedupe_queries(queries)):
+        _RAW_SEARCH_CACHE.set(cache_key, all_results)
+    return list(all_results)
 
 
-def search_brand_context(brand_name: str) -> Dict:
+def _registered_domain(host: str) -> str:
+    """'www.instagram.com' -> 'instagram.com'; subdomains like m. or en. are dropped"""
+    return '.'.join(host.rsplit('.', 2)[-2:])
+
+
+def _brand_instagram(path: str, href: str, results: Dict) -> None:
+    match = RE_IG_PATH.match(path)
+    if match and not results['instagram_handle'] and match.group(1) not in IG_RESERVED:
+        results['instagram_handle'] = match.group(1)
+
+
+def _brand_tiktok(path: str, href: str, results: Dict) -> None:
+    match = RE_TT_PATH.match(path)
+    if match and not results['tiktok_handle']:
+        results['tiktok_handle'] = match.group(1)
+
+
+def _brand_twitter(path: str, href: str, results: Dict) -> None:
+    match = RE_TW_PATH.match(path)
+    if match and not results['twitter_handle'] and match.group(1) not in TW_RESERVED:
+        results['twitter_handle'] = match.group(1)
+
+
+def _brand_linkedin(path: str, href: str, results: Dict) -> None:
+    if not results['linkedin_url']:
+        results['linkedin_url'] = href
+
+
+def _brand_facebook(path: str, href: str, results: Dict) -> None:
+    if not results['facebook_url']:
+        results['facebook_url'] = href
+
+
+# Brand-context link extraction, dispatched on the href's registered domain
+BRAND_LINK_HANDLERS = {
+    'instagram.com': _brand_instagram,
+    'tiktok.com': _brand_tiktok,
+    'twitter.com': _brand_twitter,
+    'x.com': _brand_twitter,
+    'linkedin.com': _brand_linkedin,
+    'facebook.com': _brand_facebook,
+}
+# Domains that are never the brand's own website
+NON_WEBSITE_DOMAINS = frozenset(BRAND_LINK_HANDLERS) | {'youtube.com', 'youtu.be', 'wikipedia.org'}
+# Max length of the context_summary built from result snippets
+CONTEXT_SUMMARY_MAX_CHARS = 1000
+
+# Once all of these are filled, the remaining raw results cannot change the brand context
+BRAND_LINK_FIELDS = ('website_url', 'instagram_handle', 'facebook_url', 'tiktok_handle', 'linkedin_url', 'twitter_handle')
+
+
+async def search_brand_context(brand_name: str) -> Dict:
     """
     Deep search to gather brand context: website, socials, description
     Returns structured data + raw results for DB storage
     """
+    cache_key = brand_name.lower().strip()
+    cached = _BRAND_CONTEXT_CACHE.get(cache_key)
+    if cached is not None:
+        return dict(cached, brand_name=brand_name, raw_results=list(cached['raw_results']))
+    
     results = {
         'brand_name': brand_name,
         'website_url': None,
@@ -192,43 +542,43 @@ def search_brand_context(brand_name: str) -> Dict:
     ]
     
     try:
-        raw = raw_search(queries, max_per_query=50)
+        raw = await raw_search_async(queries, max_per_query=50)
         results['raw_results'] = raw
         
-        for r in raw:
-            href = r.get('href', '').lower()
+        # site:-limited hits land on the profile itself, so they get the first shot at each handle
+        for r in sorted(raw, key=lambda hit: not hit.query.startswith('site:')):
+            parts = urlsplit(r.href.lower())
+            domain = _registered_domain(parts.hostname or '')
             
-            # Extract website (first non-social link)
-            if not results['website_url']:
-                if not any(s in href for s in ['instagram.com', 'facebook.com', 'twitter.com', 'tiktok.com', 'linkedin.com', 'youtube.com', 'wikipedia.org']):
-                    results['website_url'] = r.get('href')
+            # Extract website (first non-social link outside the site:-limited queries)
+            site_limited = r.query.startswith('site:')
+            touched = False
+            if not results['website_url'] and not site_limited and domain not in NON_WEBSITE_DOMAINS:
+                results['website_url'] = r.href
+                touched = True
             
             # Extract socials
-            if 'instagram.com/' in href:
-                match = re.search(r'instagram\.com/([a-zA-Z0-9_.]+)', href)
-                if match and match.group(1) not in ['p', 'explore', 'reel', 'stories', 'reels']:
-                    if not results['instagram_handle']:
-                        results['instagram_handle'] = match.group(1)
-                        
-            if 'facebook.com/' in href and not results['facebook_url']:
-                results['facebook_url'] = r.get('href')
-                
-            if 'tiktok.com/@' in href:
-                match = re.search(r'tiktok\.com/@([a-zA-Z0-9_.]+)', href)
-                if match and not results['tiktok_handle']:
-                    results['tiktok_handle'] = match.group(1)
-                    
-            if 'linkedin.com/' in href and not results['linkedin_url']:
-                results['linkedin_url'] = r.get('href')
-                
-            if 'twitter.com/' in href or 'x.com/' in href:
-                match = re.search(r'(?:twitter|x)\.com/([a-zA-Z0-9_]+)', href)
-                if match and not results['twitter_handle']:
-                    results['twitter_handle'] = match.group(1)
+            handler = BRAND_LINK_HANDLERS.get(domain)
+            if handler:
+                handler(parts.path, r.href, results)
+                touched = True
+            
+            # Only a hit that could have filled a field can complete the set
+            if touched and all(results[field] for field in BRAND_LINK_FIELDS):
+                break
         
-        # Build context summary
-        snippets = [r.get('body', '') for r in raw[:10] if r.get('body')]
-        results['context_summary'] = ' | '.join(snippets)[:1000]
+        # Build context summary; stop collecting once the joined text would pass the cap
+        snippets = []
+        joined_len = -len(' | ')
+        for r in raw[:10]:
+            if not r.body:
+                continue
+            snippets.append(r.body)
+            joined_len += len(r.body) + len(' | ')
+            if joined_len >= CONTEXT_SUMMARY_MAX_CHARS:
+                break
+        results['context_summary'] = ' | '.join(snippets)[:CONTEXT_SUMMARY_MAX_CHARS]
+        _BRAND_CONTEXT_CACHE.set(cache_key, dict(results, raw_results=list(raw)))
         
     except Exception as e:
         if is_retryable_proxy_error(e):
@@ -240,7 +590,7 @@ def search_brand_context(brand_name: str) -> Dict:
 
 def _normalize_competitor_intent(intent: str) -> str:
     normalized = str(intent or '').strip().upper()
-    if normalized in {'COMPANY_BRAND', 'CREATOR', 'LOCAL_BUSINESS', 'B2B_SAAS'}:
+    if normalized in COMPETITOR_INTENTS:
         return normalized
     return 'COMPANY_BRAND'
 
@@ -301,33 +651,25 @@ def _build_competitor_queries(handle: str, niche: str, intent: str) -> List[str]
     ]
 
 
-def search_competitors(handle: str, niche: str, max_results: int = 100, intent: str = 'COMPANY_BRAND') -> Dict:
+async def search_competitors(handle: str, niche: str, max_results: int = 100, intent: str = 'COMPANY_BRAND') -> Dict:
     """
     Find competitor Instagram handles based on handle and niche
     Returns raw results + extracted handles
     """
     queries = _build_competitor_queries(handle, niche, intent)
     
-    raw = raw_search(queries, max_per_query=MAX_RESULTS_PER_QUERY)
+    raw = await raw_search_async(queries, max_per_query=MAX_RESULTS_PER_QUERY)
     
     # Extract all handles from results
     handles = set()
+    handle_lower = handle.lower()
     for r in raw:
-        text = f"{r.get('title', '')} {r.get('body', '')}"
-        
-        # Extract @handles from text
-        found = re.findall(r'@([a-zA-Z0-9_.]{1,30})', text)
-        for h in found:
-            if h.lower() != handle.lower() and h not in ['p', 'explore', 'reel', 'stories', 'reels']:
-                handles.add(h)
-        
-        # Extract from Instagram URLs
-        href = r.get('href', '')
-        match = re.search(r'instagram\.com/([a-zA-Z0-9_.]+)', href)
+        # @handles in the title/body, plus the account from Instagram URLs
+        found = RE_AT_HANDLE.findall(f"{r.title} {r.body}")
+        match = RE_INSTA.search(r.href)
         if match:
-            h = match.group(1)
-            if h.lower() != handle.lower() and h not in ['p', 'explore', 'reel', 'stories', 'reels']:
-                handles.add(h)
+            found.append(match.group(1))
+        handles.update(h for h in found if h.lower() != handle_lower and h not in IG_RESERVED)
     
     return {
         'competitors': list(handles)[:max_results],
@@ -339,7 +681,7 @@ def search_competitors(handle: str, niche: str, max_results: int = 100, intent:
     }
 
 
-def validate_handle(handle: str, platform: str = 'instagram') -> Dict:
+async def validate_handle(handle: str, platform: str = 'instagram') -> Dict:
     """
     Validate if a handle appears to be a real, active account
     """
@@ -359,19 +701,20 @@ def validate_handle(handle: str, platform: str = 'instagram') -> Dict:
         else:
             queries = [f'"{handle}" {platform}']
         
-        raw = raw_search(queries, max_per_query=20)
+        raw = await raw_search_async(queries, max_per_query=20)
         result['raw_results'] = raw
         
         exact_matches = 0
+        handle_lower = handle.lower()
+        ig_needle = f'instagram.com/{handle_lower}'
+        at_needle = f'@{handle_lower}'
         for r in raw:
-            href = r.get('href', '').lower()
-            text = f"{r.get('title', '')} {r.get('body', '')}".lower()
-            
-            if f'instagram.com/{handle.lower()}' in href:
+            if ig_needle in r.href.lower():
                 exact_matches += 1
-                result['found_urls'].append(r.get('href'))
+                result['found_urls'].append(r.href)
             
-            if f'@{handle.lower()}' in text:
+            # Title and body are checked separately to skip building a joined string per hit
+            if at_needle in r.title.lower() or at_needle in r.body.lower():
                 exact_matches += 1
         
         if exact_matches >= 3:
@@ -396,175 +739,138 @@ def validate_handle(handle: str, platform: str = 'instagram') -> Dict:
     return result
 
 
-def search_news(queries: List[str], max_per_query: int = 50) -> List[Dict]:
+async def search_news_async(queries: List[str], max_per_query: int = 50) -> List[Dict]:
     """
     Search for news articles about the brand/topic
     Returns structured news results
     """
     all_results = []
-    seen_urls = set()
-    successful_queries = 0
-    retryable_failures = 0
-    last_retryable_error: Optional[Exception] = None
+    seen_urls = _seen_urls()
 
-    for query in queries:
-        try:
-            print(f"[DDG] News search: {query}", file=sys.stderr)
-            results = _run_ddgs_call(
-                lambda client: list(client.news(query, max_results=max_per_query)),
-                action=f"news search '{query}'",
-            )
-            successful_queries += 1
-            
-            for r in results:
-                url = r.get('url', '')
-                if url and url not in seen_urls:
-                    all_results.append({
-                        'query': query,
-                        'title': r.get('title', ''),
-                        'body': r.get('body', ''),
-                        'url': url,
-                        'source': r.get('source', ''),
-                        'image_url': r.get('image', ''),
-                        'published_at': r.get('date', ''),
-                    })
-                    seen_urls.add(url)
-                    
-            print(f"[DDG] News: {len(results)} results, total: {len(all_results)}", file=sys.stderr)
-            
-        except Exception as e:
-            print(f"[DDG] News query failed: {query} - {e}", file=sys.stderr)
-            if is_retryable_proxy_error(e):
-                retryable_failures += 1
-                last_retryable_error = e
-            continue
-
-    _raise_if_transport_exhausted(
+    searched = await _search_queries(
+        queries,
+        'news',
+        max_per_query,
         action="search_news",
-        total_queries=len(queries),
-        successful_queries=successful_queries,
-        retryable_failures=retryable_failures,
-        last_retryable_error=last_retryable_error,
+        label="News search",
     )
+    for query, results in searched:
+        for r in results:
+            url = r.get('url', '')
+            if url and url not in seen_urls:
+                all_results.append({
+                    'query': query,
+                    'title': r.get('title', ''),
+                    'body': r.get('body', ''),
+                    'url': url,
+                    'source': r.get('source', ''),
+                    'image_url': r.get('image', ''),
+                    'published_at': r.get('date', ''),
+                })
+                seen_urls.add(url)
+                
+        print(f"[DDG] News: {len(results)} results for {query}, total: {len(all_results)}", file=sys.stderr)
 
     return all_results
 
 
-def search_videos(queries: List[str], max_per_query: int = 30) -> List[Dict]:
+async def search_videos_async(queries: List[str], max_per_query: int = 30) -> List[Dict]:
     """
     Search for videos about the brand/topic
     Returns structured video results (YouTube, etc.)
     """
     all_results = []
-    seen_urls = set()
-    successful_queries = 0
-    retryable_failures = 0
-    last_retryable_error: Optional[Exception] = None
-
-    for query in queries:
-        try:
-            print(f"[DDG] Video search: {query}", file=sys.stderr)
-            results = _run_ddgs_call(
-                lambda client: list(client.videos(query, max_results=max_per_query)),
-                action=f"video search '{query}'",
-            )
-            successful_queries += 1
-            
-            for r in results:
-                url = r.get('content', '')
-                if url and url not in seen_urls:
-                    stats = r.get('statistics', {})
-                    images = r.get('images', {})
-                    all_results.append({
-                        'query': query,
-                        'title': r.get('title', ''),
-                        'description': r.get('description', ''),
-                        'url': url,
-                        'embed_url': r.get('embed_url', ''),
-                        'duration': r.get('duration', ''),
-                        'publisher': r.get('publisher', ''),
-                        'uploader': r.get('uploader', ''),
-                        'view_count': stats.get('viewCount'),
-                        'thumbnail_url': images.get('medium', ''),
-                        'published_at': r.get('published', ''),
-                    })
-                    seen_urls.add(url)
-                    
-            print(f"[DDG] Videos: {len(results)} results, total: {len(all_results)}", file=sys.stderr)
-            
-        except Exception as e:
-            print(f"[DDG] Video query failed: {query} - {e}", file=sys.stderr)
-            if is_retryable_proxy_error(e):
-                retryable_failures += 1
-                last_retryable_error = e
-            continue
+    seen_urls = _seen_urls()
 
-    _raise_if_transport_exhausted(
+    searched = await _search_queries(
+        queries,
+        'videos',
+        max_per_query,
         action="search_videos",
-        total_queries=len(queries),
-        successful_queries=successful_queries,
-        retryable_failures=retryable_failures,
-        last_retryable_error=last_retryable_error,
+        label="Video search",
     )
+    for query, results in searched:
+        for r in results:
+            url = r.get('content', '')
+            if url and url not in seen_urls:
+                stats = r.get('statistics', {})
+                images = r.get('images', {})
+                all_results.append({
+                    'query': query,
+                    'title': r.get('title', ''),
+                    'description': r.get('description', ''),
+                    'url': url,
+                    'embed_url': r.get('embed_url', ''),
+                    'duration': r.get('duration', ''),
+                    'publisher': r.get('publisher', ''),
+                    'uploader': r.get('uploader', ''),
+                    'view_count': stats.get('viewCount'),
+                    'thumbnail_url': images.get('medium', ''),
+                    'published_at': r.get('published', ''),
+                })
+                seen_urls.add(url)
+                
+        print(f"[DDG] Videos: {len(results)} results for {query}, total: {len(all_results)}", file=sys.stderr)
 
     return all_results
 
 
-def search_images(queries: List[str], max_per_query: int = 50) -> List[Dict]:
+async def search_images_async(queries: List[str], max_per_query: int = 50) -> List[Dict]:
     """
     Search for images related to the brand/topic
     Returns structured image results
     """
     all_results = []
-    seen_urls = set()
-    successful_queries = 0
-    retryable_failures = 0
-    last_retryable_error: Optional[Exception] = None
+    seen_urls = _seen_urls()
 
-    for query in queries:
-        try:
-            print(f"[DDG] Image search: {query}", file=sys.stderr)
-            results = _run_ddgs_call(
-                lambda client: list(client.images(query, max_results=max_per_query)),
-                action=f"image search '{query}'",
-            )
-            successful_queries += 1
-            
-            for r in results:
-                image_url = r.get('image', '')
-                if image_url and image_url not in seen_urls:
-                    all_results.append({
-                        'query': query,
-                        'title': r.get('title', ''),
-                        'image_url': image_url,
-                        'thumbnail_url': r.get('thumbnail', ''),
-                        'source_url': r.get('url', ''),
-                        'width': r.get('width'),
-                        'height': r.get('height'),
-                    })
-                    seen_urls.add(image_url)
-                    
-            print(f"[DDG] Images: {len(results)} results, total: {len(all_results)}", file=sys.stderr)
-            
-        except Exception as e:
-            print(f"[DDG] Image query failed: {query} - {e}", file=sys.stderr)
-            if is_retryable_proxy_error(e):
-                retryable_failures += 1
-                last_retryable_error = e
-            continue
-
-    _raise_if_transport_exhausted(
+    searched = await _search_queries(
+        queries,
+        'images',
+        max_per_query,
         action="search_images",
-        total_queries=len(queries),
-        successful_queries=successful_queries,
-        retryable_failures=retryable_failures,
-        last_retryable_error=last_retryable_error,
+        label="Image search",
     )
+    for query, results in searched:
+        for r in results:
+            image_url = r.get('image', '')
+            if image_url and image_url not in seen_urls:
+                all_results.append({
+                    'query': query,
+                    'title': r.get('title', ''),
+                    'image_url': image_url,
+                    'thumbnail_url': r.get('thumbnail', ''),
+                    'source_url': r.get('url', ''),
+                    'width': r.get('width'),
+                    'height': r.get('height'),
+                })
+                seen_urls.add(image_url)
+                
+        print(f"[DDG] Images: {len(results)} results for {query}, total: {len(all_results)}", file=sys.stderr)
 
     return all_results
 
 
-def gather_all(brand_name: str, niche: str = 'business') -> Dict:
+def raw_search(queries: List[str], max_per_query: int = MAX_RESULTS_PER_QUERY) -> List[Hit]:
+    """Blocking wrapper around raw_search_async for synchronous callers"""
+    return asyncio.run(raw_search_async(queries, max_per_query))
+
+
+def search_news(queries: List[str], max_per_query: int = 50) -> List[Dict]:
+    """Blocking wrapper around search_news_async for synchronous callers"""
+    return asyncio.run(search_news_async(queries, max_per_query))
+
+
+def search_videos(queries: List[str], max_per_query: int = 30) -> List[Dict]:
+    """Blocking wrapper around search_videos_async for synchronous callers"""
+    return asyncio.run(search_videos_async(queries, max_per_query))
+
+
+def search_images(queries: List[str], max_per_query: int = 50) -> List[Dict]:
+    """Blocking wrapper around search_images_async for synchronous callers"""
+    return asyncio.run(search_images_async(queries, max_per_query))
+
+
+async def gather_all(brand_name: str, niche: str = 'business') -> Dict:
     """
     COMPREHENSIVE: Gather ALL possible data for a brand
     Runs text and news searches with multiple queries
@@ -596,11 +902,25 @@ def gather_all(brand_name: str, niche: str = 'business') -> Dict:
     # queries_videos = [f'{brand_name}', f'{niche} tips']
     # queries_images = [f'{brand_name} instagram', f'{brand_name} logo']
     
+    # Brand and niche queries can coincide (e.g. niche == brand name); dedupe before the
+    # memo key is built so identical query sets share one raw_search cache entry.
+    # News goes to a different endpoint, so its overlap with text queries is not a repeat.
+    queries_all_text = _dedupe_queries(queries_text + queries_niche)
+    
+    # Text and news hit different endpoints, so neither waits on the other
+    text_results, news_results = await asyncio.gather(
+        raw_search_async(queries_all_text, max_per_query=50),
+        search_news_async(queries_news, max_per_query=30),
+    )
+    # A story often surfaces in both; keep the text hit and drop the news duplicate
+    text_hrefs = {r.href for r in text_results}
+    news_results = [n for n in news_results if n['url'] not in text_hrefs]
+    
     result = {
         'brand_name': brand_name,
         'niche': niche,
-        'text_results': raw_search(queries_text + queries_niche, max_per_query=50),
-        'news_results': search_news(queries_news, max_per_query=30),
+        'text_results': text_results,
+        'news_results': news_results,
         'video_results': [],  # DISABLED - use scrape_social_content instead
         'image_results': [],  # DISABLED - use scrape_social_content instead
     }
@@ -616,7 +936,49 @@ def gather_all(brand_name: str, niche: str = 'business') -> Dict:
     return result
 
 
-def search_social_profiles(brand_name: str, max_per_query: int = 30) -> Dict:
+def _extract_social_handle(platform: str, href: str) -> Optional[str]:
+    """Extract the account handle from a profile URL on the given platform"""
+    if platform == 'instagram' and 'instagram.com/' in href:
+        match = RE_INSTA.search(href)
+        if match:
+            h = match.group(1)
+            if h not in IG_RESERVED:
+                return h
+                
+    elif platform == 'tiktok' and 'tiktok.com/@' in href:
+        match = RE_TIKTOK.search(href)
+        if match:
+            return match.group(1)
+            
+    elif platform == 'youtube':
+        # Handles /@name, /c/name and /channel/id URL formats
+        match = RE_YOUTUBE.search(href)
+        if match:
+            return match.group(1)
+                
+    elif platform == 'twitter':
+        match = RE_TWITTER.search(href)
+        if match:
+            h = match.group(1)
+            if h not in TW_RESERVED:
+                return h
+                
+    elif platform == 'linkedin' and 'linkedin.com/' in href:
+        match = RE_LINKEDIN.search(href)
+        if match:
+            return match.group(1)
+            
+    elif platform == 'facebook' and 'facebook.com/' in href:
+        match = RE_FACEBOOK.search(href)
+        if match:
+            h = match.group(1)
+            if h not in FB_RESERVED:
+                return h
+    
+    return None
+
+
+async def search_social_profiles(brand_name: str, max_per_query: int = 30) -> Dict:
     """
     Site-limited search for social media profiles.
     Uses site: operator to find profiles on specific platforms.
@@ -661,83 +1023,39 @@ def search_social_profiles(brand_name: str, max_per_query: int = 30) -> Dict:
         ],
     }
     
-    seen_urls = set()
-    successful_queries = 0
-    retryable_failures = 0
-    last_retryable_error: Optional[Exception] = None
+    # Every (platform, query) pair goes out at once; results are regrouped by platform afterwards
+    jobs = [(platform, query) for platform, queries in platform_queries.items() for query in queries]
+    platform_of = {query: platform for platform, query in jobs}
+    searched = await _search_queries(
+        [query for _, query in jobs],
+        'text',
+        max_per_query,
+        action="search_social_profiles",
+        label="Social search",
+    )
     
-    for platform, queries in platform_queries.items():
-        handles = set()
-        
-        for query in queries:
-            try:
-                print(f"[DDG] Social search ({platform}): {query}", file=sys.stderr)
-                search_results = _run_ddgs_call(
-                    lambda client: list(client.text(query, max_results=max_per_query)),
-                    action=f"social text search '{query}'",
-                )
-                successful_queries += 1
-                
-                for r in search_results:
-                    href = r.get('href', '')
-                    
-                    if href and href not in seen_urls:
-                        seen_urls.add(href)
-                        results['raw_results'].append({
-                            'query': query,
-                            'platform': platform,
-                            'title': r.get('title', ''),
-                            'href': href,
-                            'body': r.get('body', ''),
-                        })
-                    
-                    # Extract handles based on platform
-                    if platform == 'instagram' and 'instagram.com/' in href:
-                        match = re.search(r'instagram\.com/([a-zA-Z0-9_.]+)', href)
-                        if match:
-                            h = match.group(1)
-                            if h not in ['p', 'explore', 'reel', 'stories', 'reels', 'tv', 'accounts']:
-                                handles.add(h)
-                                
-                    elif platform == 'tiktok' and 'tiktok.com/@' in href:
-                        match = re.search(r'tiktok\.com/@([a-zA-Z0-9_.]+)', href)
-                        if match:
-                            handles.add(match.group(1))
-                            
-                    elif platform == 'youtube':
-                        # Handle multiple URL formats
-                        for pattern in [r'youtube\.com/@([a-zA-Z0-9_-]+)', r'youtube\.com/c/([a-zA-Z0-9_-]+)', r'youtube\.com/channel/([a-zA-Z0-9_-]+)']:
-                            match = re.search(pattern, href)
-                            if match:
-                                handles.add(match.group(1))
-                                break
-                                
-                    elif platform == 'twitter':
-                        match = re.search(r'(?:twitter|x)\.com/([a-zA-Z0-9_]+)', href)
-                        if match:
-                            h = match.group(1)
-                            if h not in ['search', 'hashtag', 'i', 'intent', 'compose']:
-                                handles.add(h)
-                                
-                    elif platform == 'linkedin' and 'linkedin.com/' in href:
-                        match = re.search(r'linkedin\.com/(?:company|in)/([a-zA-Z0-9_-]+)', href)
-                        if match:
-                            handles.add(match.group(1))
-                            
-                    elif platform == 'facebook' and 'facebook.com/' in href:
-                        match = re.search(r'facebook\.com/([a-zA-Z0-9_.]+)', href)
-                        if match:
-                            h = match.group(1)
-                            if h not in ['pages', 'groups', 'events', 'watch', 'marketplace', 'gaming']:
-                                handles.add(h)
-                
-            except Exception as e:
-                print(f"[DDG] Social search error ({platform}): {e}", file=sys.stderr)
-                if is_retryable_proxy_error(e):
-                    retryable_failures += 1
-                    last_retryable_error = e
-                continue
-        
+    handles_by_platform = {platform: set() for platform in platform_queries}
+    seen_urls = _seen_urls()
+    for query, search_results in searched:
+        platform = platform_of[query]
+        for r in search_results:
+            href = r.get('href', '')
+            
+            if href and href not in seen_urls:
+                seen_urls.add(href)
+                results['raw_results'].append({
+                    'query': query,
+                    'platform': platform,
+                    'title': r.get('title', ''),
+                    'href': href,
+                    'body': r.get('body', ''),
+                })
+            
+            handle = _extract_social_handle(platform, href)
+            if handle:
+                handles_by_platform[platform].add(handle)
+    
+    for platform, handles in handles_by_platform.items():
         results[platform] = list(handles)
         print(f"[DDG] Found {len(handles)} {platform} handles", file=sys.stderr)
     
@@ -747,20 +1065,54 @@ def search_social_profiles(brand_name: str, max_per_query: int = 30) -> Dict:
     }
     results['totals']['total'] = sum(results['totals'].values())
     results['totals']['raw'] = len(results['raw_results'])
-
-    total_queries = sum(len(queries) for queries in platform_queries.values())
-    _raise_if_transport_exhausted(
-        action="search_social_profiles",
-        total_queries=total_queries,
-        successful_queries=successful_queries,
-        retryable_failures=retryable_failures,
-        last_retryable_error=last_retryable_error,
-    )
     
     return results
 
 
-def scrape_social_content(handles: Dict[str, str], max_items: int = 30) -> Dict:
+@dataclass(frozen=True)
+class PlatformSpec:
+    """How scrape_social_content searches one platform for a handle's media"""
+    image_queries: Callable[[str], List[str]]
+    video_queries: Callable[[str], List[str]]
+    # URL fragment marking a stats text hit as the handle's own profile; None skips stats parsing
+    profile_url: Optional[Callable[[str], str]] = None
+
+
+# Adding a platform to content scraping only needs an entry here
+PLATFORM_CFG = {
+    # User requested: site:instagram.com "{handler}" images
+    # We strip "images" from the query passed to ddgs.images() because implied, 
+    # but we keep the site and handle strictness.
+    'instagram': PlatformSpec(
+        image_queries=lambda handle: [
+            f'site:instagram.com "{handle}"',
+            f'site:instagram.com @{handle}',
+        ],
+        video_queries=lambda handle: [
+            f'site:instagram.com "{handle}"', # General video search
+            f'site:instagram.com/reel "{handle}"',
+        ],
+        profile_url=lambda handle: f'instagram.com/{handle}',
+    ),
+    # User requested: matching behavior for tiktok
+    'tiktok': PlatformSpec(
+        image_queries=lambda handle: [
+            f'site:tiktok.com "@{handle}"',
+        ],
+        video_queries=lambda handle: [
+            f'site:tiktok.com "@{handle}"',
+            f'tiktok.com/@{handle}',
+        ],
+        profile_url=lambda handle: f'tiktok.com/@{handle}',
+    ),
+    'youtube': PlatformSpec(
+        image_queries=lambda handle: [f'site:youtube.com "{handle}"'],
+        video_queries=lambda handle: [f'site:youtube.com "@{handle}"'],
+    ),
+}
+
+
+async def scrape_social_content(handles: Dict[str, str], max_items: int = 30) -> Dict:
     """
     Scrape images and videos for given social handles using site-limited search.
     This is a workaround for direct API access when rate-limited.
@@ -781,9 +1133,10 @@ def scrape_social_content(handles: Dict[str, str], max_items: int = 30) -> Dict:
         'totals': {}
     }
     
-    seen_images = set()
-    seen_videos = set()
+    limit_images = 20
+    limit_videos = 10
     
+    plans = []
     for platform, handle in handles.items():
         if not handle:
             continue
@@ -791,209 +1144,196 @@ def scrape_social_content(handles: Dict[str, str], max_items: int = 30) -> Dict:
         result['platforms_searched'].append(platform)
         print(f"[DDG] Scraping {platform} content for @{handle}...", file=sys.stderr)
         
-        # Build platform-specific queries
-        # Custom limits as requested
-        limit_images = 20
-        limit_videos = 10
-        
-        # Build platform-specific queries
-        if platform == 'instagram':
-            # User requested: site:instagram.com "{handler}" images
-            # We strip "images" from the query passed to ddgs.images() because implied, 
-            # but we keep the site and handle strictness.
-            queries_images = [
-                f'site:instagram.com "{handle}"',
-                f'site:instagram.com @{handle}',
-            ]
-            queries_videos = [
-                f'site:instagram.com "{handle}"', # General video search
-                f'site:instagram.com/reel "{handle}"',
-            ]
-        elif platform == 'tiktok':
-            queries_images = [
-                f'site:tiktok.com "@{handle}"',
-            ]
-            # User requested: matching behavior for tiktok
-            queries_videos = [
-                f'site:tiktok.com "@{handle}"',
-                f'tiktok.com/@{handle}',
-            ]
-        elif platform == 'youtube':
-            queries_images = [f'site:youtube.com "{handle}"']
-            queries_videos = [f'site:youtube.com "@{handle}"']
-        else:
+        spec = PLATFORM_CFG.get(platform)
+        if spec is None:
             continue
         
-        
-        # 1. Search for Profile Stats (Text Search)
-        # Images/Videos often don't have the "X Followers, Y Following" snippet. Text results do.
+        plans.append((platform, handle, spec.image_queries(handle), spec.video_queries(handle)))
+    
+    async def fetch(method: str, query: str, max_results: int, *, action: str, label: str) -> List[Dict]:
         try:
-            print(f"[DDG] looking for profile stats: site:{platform}.com @{handle}", file=sys.stderr)
-            stats_query = f'site:{platform}.com @{handle}'
-            # Fetch just top 3 results to find the main profile page
-            text_results = _run_ddgs_call(
-                lambda client: list(client.text(stats_query, max_results=3)),
-                action=f"profile stats search '{stats_query}'",
-            )
+            print(f"[DDG] {label}: {query}", file=sys.stderr)
+            return await QUERY_BATCHER.run(method, query, max_results, action=f"{action} '{query}'")
+        except Exception as e:
+            print(f"[DDG] {label} error: {e}", file=sys.stderr)
+            return []
+    
+    # Stats, image and video searches for every handle go out at once
+    # Images/Videos often don't have the "X Followers, Y Following" snippet. Text results do,
+    # so each handle also gets a top-3 text search to find the main profile page.
+    fetched = await asyncio.gather(*(
+        asyncio.gather(
+            fetch(
+                'text',
+                f'site:{platform}.com @{handle}',
+                3,
+                action="profile stats search",
+                label="Profile stats search",
+            ),
+            asyncio.gather(*(
+                fetch(
+                    'images',
+                    query,
+                    limit_images,
+                    action="social image search",
+                    label="Image search",
+                )
+                for query in queries_images
+            )),
+            asyncio.gather(*(
+                fetch(
+                    'videos',
+                    query,
+                    limit_videos,
+                    action="social video search",
+                    label="Video search",
+                )
+                for query in queries_videos
+            )),
+        )
+        for platform, handle, queries_images, queries_videos in plans
+    ))
+    
+    seen_images = _seen_urls()
+    seen_videos = _seen_urls()
+    # Running per-platform counts, so the limit checks don't rescan the accumulated lists
+    img_count = {plan[0]: 0 for plan in plans}
+    vid_count = {plan[0]: 0 for plan in plans}
+    
+    # Results are applied in the original per-platform order, so limits and dedupe match a serial run
+    for (platform, handle, queries_images, queries_videos), (text_results, image_batches, video_batches) in zip(plans, fetched):
+        # 1. Profile Stats (Text Search)
+        for r in text_results:
+            href = r.get('href', '')
+            body = r.get('body', '')
+            title = r.get('title', '')
+            
+            # Check if this is the profile URL
+            profile_url = PLATFORM_CFG[platform].profile_url
+            is_profile = profile_url is not None and profile_url(handle).lower() in href.lower()
             
-            for r in text_results:
-                href = r.get('href', '')
-                body = r.get('body', '')
-                title = r.get('title', '')
+            if is_profile:
+                print(f"[DDG] Found profile text result: {title}", file=sys.stderr)
+                # Attempt to parse stats
+                # Format: "12K Followers, 500 Following, 100 Posts..."
+                snippet = f"{title} {body}"
                 
-                # Check if this is the profile URL
-                is_profile = False
-                if platform == 'instagram' and f'instagram.com/{handle}'.lower() in href.lower():
-                     is_profile = True
-                elif platform == 'tiktok' and f'tiktok.com/@{handle}'.lower() in href.lower():
-                     is_profile = True
+                follower_match = RE_FOLLOWERS.search(snippet)
+                following_match = RE_FOLLOWING.search(snippet)
+                posts_match = RE_POSTS.search(snippet)
                 
-                if is_profile:
-                    print(f"[DDG] Found profile text result: {title}", file=sys.stderr)
-                    # Attempt to parse stats
-                    # Format: "12K Followers, 500 Following, 100 Posts..."
-                    snippet = f"{title} {body}"
-                    
-                    follower_match = re.search(r'([\d.,]+[KkMmBb]?)\s+Followers', snippet, re.IGNORECASE)
-                    following_match = re.search(r'([\d.,]+[KkMmBb]?)\s+Following', snippet, re.IGNORECASE)
-                    posts_match = re.search(r'([\d.,]+[KkMmBb]?)\s+(?:Posts|Videos)', snippet, re.IGNORECASE)
+                if follower_match or following_match:
+                     if 'profile_stats' not in result: result['profile_stats'] = {}
+                     if platform not in result['profile_stats']: result['profile_stats'][platform] = {}
+                     
+                     if follower_match:
+                          result['profile_stats'][platform]['followers'] = parse_count(follower_match.group(1))
+                          print(f"[DDG] Extracted Followers: {result['profile_stats'][platform]['followers']}", file=sys.stderr)
+                     
+                     if following_match:
+                          result['profile_stats'][platform]['following'] = parse_count(following_match.group(1))
                     
-                    if follower_match or following_match:
-                         if 'profile_stats' not in result: result['profile_stats'] = {}
-                         if platform not in result['profile_stats']: result['profile_stats'][platform] = {}
-                         
-                         if follower_match:
-                              result['profile_stats'][platform]['followers'] = parse_count(follower_match.group(1))
-                              print(f"[DDG] Extracted Followers: {result['profile_stats'][platform]['followers']}", file=sys.stderr)
-                         
-                         if following_match:
-                              result['profile_stats'][platform]['following'] = parse_count(following_match.group(1))
-                        
-                         if posts_match:
-                              # Optional: might be useful
-                              pass
-                    break 
-
-        except Exception as e:
-             print(f"[DDG] Stats search error: {e}", file=sys.stderr)
-
-        # 2. Search images (Limit 20)
-        for query in queries_images:
-            try:
-                print(f"[DDG] Image search: {query}", file=sys.stderr)
-                images = _run_ddgs_call(
-                    lambda client: list(client.images(query, max_results=limit_images)),
-                    action=f"social image search '{query}'",
-                )
+                     if posts_match:
+                          # Optional: might be useful
+                          pass
+                break 
+        
+        # 2. Images (Limit 20)
+        for query, images in zip(queries_images, image_batches):
+            for img in images:
+                image_url = img.get('image', '')
+                source_url = img.get('url', '')
                 
-                for img in images:
-                    image_url = img.get('image', '')
-                    source_url = img.get('url', '')
+                if img_count[platform] >= limit_images:
+                    break
                     
-                    if len([i for i in result['images'] if i['platform'] == platform]) >= limit_images:
-                        break
-                        
-                    # Filter for platform relevance
-                    if platform in source_url.lower() and image_url not in seen_images:
-                        seen_images.add(image_url)
-                        result['images'].append({
+                # Filter for platform relevance
+                if platform in source_url.lower() and image_url not in seen_images:
+                    seen_images.add(image_url)
+                    img_count[platform] += 1
+                    result['images'].append({
+                        'platform': platform,
+                        'handle': handle,
+                        'image_url': image_url,
+                        'thumbnail_url': img.get('thumbnail', ''),
+                        'source_url': source_url,
+                        'title': img.get('title', ''),
+                        'width': img.get('width'),
+                        'height': img.get('height'),
+                    })
+                    
+                    # Try to extract caption/post info from title
+                    title = img.get('title', '')
+                    if title:
+                        result['posts'].append({
                             'platform': platform,
                             'handle': handle,
-                            'image_url': image_url,
-                            'thumbnail_url': img.get('thumbnail', ''),
+                            'caption_snippet': title,
                             'source_url': source_url,
-                            'title': img.get('title', ''),
-                            'width': img.get('width'),
-                            'height': img.get('height'),
+                            'has_media': True,
                         })
                         
-                        # Try to extract caption/post info from title
-                        title = img.get('title', '')
-                        if title:
-                            result['posts'].append({
-                                'platform': platform,
-                                'handle': handle,
-                                'caption_snippet': title,
-                                'source_url': source_url,
-                                'has_media': True,
-                            })
-                            
-                            # Parse Profile Stats from typical title/snippet format
-                            # E.g. "Name (@handle) • Instagram photos and videos" - usually no stats here
-                            # But sometimes snippet has it. DDG Image search result doesn't always have 'body'.
-                            # Let's rely on the body check if available or title if it contains stats.
-                            
-                            # Regex for generic follower counts
-                            # "20K Followers, 500 Following"
-                            follower_match = re.search(r'([\d.,]+[KkMmBb]?)\s+Followers', title, re.IGNORECASE)
-                            following_match = re.search(r'([\d.,]+[KkMmBb]?)\s+Following', title, re.IGNORECASE)
-                            
-                            if follower_match or following_match:
-                                if 'profile_stats' not in result: result['profile_stats'] = {}
-                                if platform not in result['profile_stats']: result['profile_stats'][platform] = {}
-                                
-                                if follower_match:
-                                     result['profile_stats'][platform]['followers'] = parse_count(follower_match.group(1))
-                                if following_match:
-                                     result['profile_stats'][platform]['following'] = parse_count(following_match.group(1))
+                        # Parse Profile Stats from typical title/snippet format
+                        # E.g. "Name (@handle) • Instagram photos and videos" - usually no stats here
+                        # But sometimes snippet has it. DDG Image search result doesn't always have 'body'.
+                        # Let's rely on the body check if available or title if it contains stats.
+                        
+                        # Regex for generic follower counts
+                        # "20K Followers, 500 Following"
+                        follower_match = RE_FOLLOWERS.search(title)
+                        following_match = RE_FOLLOWING.search(title)
+                        
+                        if follower_match or following_match:
+                            if 'profile_stats' not in result: result['profile_stats'] = {}
+                            if platform not in result['profile_stats']: result['profile_stats'][platform] = {}
                             
-            except Exception as e:
-                print(f"[DDG] Image search error: {e}", file=sys.stderr)
-                continue
+                            if follower_match:
+                                 result['profile_stats'][platform]['followers'] = parse_count(follower_match.group(1))
+                            if following_match:
+                                 result['profile_stats'][platform]['following'] = parse_count(following_match.group(1))
         
-        # Search videos (Limit 10)
-        for query in queries_videos:
-            try:
-                print(f"[DDG] Video search: {query}", file=sys.stderr)
-                videos = _run_ddgs_call(
-                    lambda client: list(client.videos(query, max_results=limit_videos)),
-                    action=f"social video search '{query}'",
-                )
+        # 3. Videos (Limit 10)
+        for query, videos in zip(queries_videos, video_batches):
+            for vid in videos:
+                if vid_count[platform] >= limit_videos:
+                    break
+                    
+                video_url = vid.get('content', '')
                 
-                for vid in videos:
-                    if len([v for v in result['videos'] if v['platform'] == platform]) >= limit_videos:
-                        break
-                        
-                    video_url = vid.get('content', '')
+                if video_url and video_url not in seen_videos:
+                    is_relevant = (
+                        platform in video_url.lower() or
+                        handle.lower() in vid.get('title', '').lower()
+                    )
                     
-                    if video_url and video_url not in seen_videos:
-                        is_relevant = (
-                            platform in video_url.lower() or
-                            handle.lower() in vid.get('title', '').lower()
-                        )
+                    if is_relevant:
+                        seen_videos.add(video_url)
+                        vid_count[platform] += 1
+                        images_obj = vid.get('images', {})
+                        result['videos'].append({
+                            'platform': platform,
+                            'handle': handle,
+                            'video_url': video_url,
+                            'embed_url': vid.get('embed_url', ''),
+                            'thumbnail_url': images_obj.get('medium', '') if isinstance(images_obj, dict) else '',
+                            'title': vid.get('title', ''),
+                            'description': vid.get('description', ''),
+                            'duration': vid.get('duration', ''),
+                            'publisher': vid.get('publisher', ''),
+                        })
                         
-                        if is_relevant:
-                            seen_videos.add(video_url)
-                            images_obj = vid.get('images', {})
-                            result['videos'].append({
+                        desc = vid.get('description', '')
+                        if desc:
+                            result['posts'].append({
                                 'platform': platform,
                                 'handle': handle,
-                                'video_url': video_url,
-                                'embed_url': vid.get('embed_url', ''),
-                                'thumbnail_url': images_obj.get('medium', '') if isinstance(images_obj, dict) else '',
-                                'title': vid.get('title', ''),
-                                'description': vid.get('description', ''),
-                                'duration': vid.get('duration', ''),
-                                'publisher': vid.get('publisher', ''),
+                                'caption_snippet': desc[:500],
+                                'source_url': video_url,
+                                'has_media': True,
+                                'is_video': True,
                             })
-                            
-                            desc = vid.get('description', '')
-                            if desc:
-                                result['posts'].append({
-                                    'platform': platform,
-                                    'handle': handle,
-                                    'caption_snippet': desc[:500],
-                                    'source_url': video_url,
-                                    'has_media': True,
-                                    'is_video': True,
-                                })
-                                
-            except Exception as e:
-                print(f"[DDG] Video search error: {e}", file=sys.stderr)
-                continue
-
-        print(f"[DDG] {platform}: {len([i for i in result['images'] if i['platform'] == platform])} images, "
-              f"{len([v for v in result['videos'] if v['platform'] == platform])} videos", file=sys.stderr)
+        
+        print(f"[DDG] {platform}: {img_count[platform]} images, {vid_count[platform]} videos", file=sys.stderr)
     
     result['totals'] = {
         'images': len(result['images']),
@@ -1004,30 +1344,32 @@ def scrape_social_content(handles: Dict[str, str], max_items: int = 30) -> Dict:
     
     return result
 
+_COUNT_STRIP = str.maketrans('', '', ',')
+COUNT_MULTIPLIERS = {'K': 1_000, 'M': 1_000_000, 'B': 1_000_000_000}
+
+
 def parse_count(count_str: str) -> int:
     """Helper to parse counts like '1.2K', '1M', '10,500'"""
     if not count_str:
         return 0
     
-    s = count_str.upper().replace(',', '').strip()
-    multiplier = 1
-    
-    if 'K' in s:
-        multiplier = 1000
-        s = s.replace('K', '')
-    elif 'M' in s:
-        multiplier = 1000000
-        s = s.replace('M', '')
-    elif 'B' in s:
-        multiplier = 1000000000
-        s = s.replace('B', '')
+    # Counts come from RE_FOLLOWERS-style matches, so a suffix can only be the last char
+    s = count_str.translate(_COUNT_STRIP).strip().upper()
+    multiplier = COUNT_MULTIPLIERS.get(s[-1:], 1)
+    if multiplier != 1:
+        s = s[:-1]
         
     try:
         return int(float(s) * multiplier)
-    except:
+    except ValueError:
         return 0
 
 if __name__ == '__main__':
+    # --pretty indents the output for debugging; --stream prints list results as NDJSON
+    pretty = '--pretty' in sys.argv
+    stream = '--stream' in sys.argv
+    sys.argv = [arg for arg in sys.argv if arg not in ('--pretty', '--stream')]
+
     if len(sys.argv) < 2:
         print(json.dumps({
             'error': 'Usage: python3 ddg_search.py <action> <args...>',
@@ -1041,7 +1383,8 @@ if __name__ == '__main__':
                 'gather_all <brand_name> [niche]',
                 'social_search <brand_name>',
                 'raw <query1> [query2] ...'
-            ]
+            ],
+            'flags': ['--pretty', '--stream'],
         }))
         sys.exit(1)
     
@@ -1049,8 +1392,8 @@ if __name__ == '__main__':
     
     if action == 'brand_context':
         brand_name = sys.argv[2]
-        result = search_brand_context(brand_name)
-        print(json.dumps(result, indent=2))
+        result = asyncio.run(search_brand_context(brand_name))
+        _write_json(result, pretty=pretty)
         
     elif action == 'competitors':
         handle = sys.argv[2]
@@ -1063,45 +1406,57 @@ if __name__ == '__main__':
                 intent = sys.argv[5] if len(sys.argv) > 5 else 'COMPANY_BRAND'
             except Exception:
                 intent = sys.argv[4]
-        result = search_competitors(handle, niche, max_results, intent)
-        print(json.dumps(result, indent=2))
+        result = asyncio.run(search_competitors(handle, niche, max_results, intent))
+        _write_json(result, pretty=pretty)
         
     elif action == 'validate':
         handle = sys.argv[2]
         platform = sys.argv[3] if len(sys.argv) > 3 else 'instagram'
-        result = validate_handle(handle, platform)
-        print(json.dumps(result, indent=2))
+        result = asyncio.run(validate_handle(handle, platform))
+        _write_json(result, pretty=pretty)
         
     elif action == 'news':
         queries = sys.argv[2:]
-        result = search_news(queries)
-        print(json.dumps({'news': result, 'total': len(result)}, indent=2))
+        result = asyncio.run(search_news_async(queries))
+        if stream:
+            _write_ndjson(result)
+        else:
+            _write_json({'news': result, 'total': len(result)}, pretty=pretty)
         
     elif action == 'videos':
         queries = sys.argv[2:]
-        result = search_videos(queries)
-        print(json.dumps({'videos': result, 'total': len(result)}, indent=2))
+        result = asyncio.run(search_videos_async(queries))
+        if stream:
+            _write_ndjson(result)
+        else:
+            _write_json({'videos': result, 'total': len(result)}, pretty=pretty)
         
     elif action == 'images':
         queries = sys.argv[2:]
-        result = search_images(queries)
-        print(json.dumps({'images': result, 'total': len(result)}, indent=2))
+        result = asyncio.run(search_images_async(queries))
+        if stream:
+            _write_ndjson(result)
+        else:
+            _write_json({'images': result, 'total': len(result)}, pretty=pretty)
         
     elif action == 'gather_all':
         brand_name = sys.argv[2]
         niche = sys.argv[3] if len(sys.argv) > 3 else 'business'
-        result = gather_all(brand_name, niche)
-        print(json.dumps(result, indent=2))
+        result = asyncio.run(gather_all(brand_name, niche))
+        _write_json(result, pretty=pretty)
         
     elif action == 'raw':
         queries = sys.argv[2:]
-        result = raw_search(queries)
-        print(json.dumps({'results': result, 'total': len(result)}, indent=2))
+        result = asyncio.run(raw_search_async(queries))
+        if stream:
+            _write_ndjson(result)
+        else:
+            _write_json({'results': result, 'total': len(result)}, pretty=pretty)
         
     elif action == 'social_search':
         brand_name = sys.argv[2]
-        result = search_social_profiles(brand_name)
-        print(json.dumps(result, indent=2))
+        result = asyncio.run(search_social_profiles(brand_name))
+        _write_json(result, pretty=pretty)
         
     elif action == 'scrape_content':
         # Usage: scrape_content instagram:handle tiktok:handle [max_items]
@@ -1117,8 +1472,8 @@ if __name__ == '__main__':
                     max_items = int(arg)
                 except:
                     pass
-        result = scrape_social_content(handles, max_items)
-        print(json.dumps(result, indent=2))
+        result = asyncio.run(scrape_social_content(handles, max_items))
+        _write_json(result, pretty=pretty)
         
     else:
         print(json.dumps({'error': f'Unknown action: {action}'}))
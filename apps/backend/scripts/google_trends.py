@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """
-Google Trends fetcher using pytrends with improved accuracy.
+Google Trends fetcher using pytrends with improved accuracy; the comprehensive
+action calls the Trends endpoints concurrently over one httpx client.
 Returns Interest Over Time, Related Queries, and Related Topics.
 
 Usage: python3 google_trends.py <action> [--region=XX] <keywords...>
@@ -18,107 +19,237 @@ import sys
 import json
 import time
 import random
-import sys
-import json
-import time
-import random
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
 from pytrends.request import TrendReq
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 MAX_RETRIES = 5
 RETRY_DELAY = 10  # seconds base delay for exponential backoff
 
+# Endpoints behind pytrends, used directly by the async comprehensive path
+TRENDS_BASE_URL = 'https://trends.google.com/trends'
+TRENDS_EXPLORE_URL = f'{TRENDS_BASE_URL}/api/explore'
+TRENDS_MULTILINE_URL = f'{TRENDS_BASE_URL}/api/widgetdata/multiline'
+TRENDS_RELATED_URL = f'{TRENDS_BASE_URL}/api/widgetdata/relatedsearches'
+TRENDS_HL = 'en-US'
+TRENDS_TZ = 360
+HTTP_TIMEOUT = httpx.Timeout(30, connect=10)
+# Interest-over-time keys, matching what pandas' to_json(date_format='iso') used to emit
+ISO_DATE_FORMAT = '%Y-%m-%dT%H:%M:%S.000Z'
 
-def get_interest_over_time(pytrends, keywords, region='', timeframe='today 12-m'):
-    """Fetch interest over time for up to 5 keywords."""
+
+def _write_json(obj):
+    """Write the result to stdout; orjson also covers any numpy scalars pandas leaves behind"""
+    if orjson is not None:
+        sys.stdout.buffer.write(orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY) + b'\n')
+        sys.stdout.buffer.flush()
+        return
+    print(json.dumps(obj))
+
+
+def _records(df):
+    """DataFrame rows as plain dicts; NaN becomes None so the output stays valid JSON."""
+    return df.astype(object).where(df.notna(), None).to_dict(orient='records')
+
+
+class RateLimitCooldown:
+    """
+    Process-wide pause after a 429: once any request is rate limited, every other
+    request waits out the same backoff instead of hitting Google again straight away.
+    """
+    def __init__(self):
+        self.until = 0.0
+
+    def backoff(self, attempt):
+        """Start (or extend) the pause for this retry attempt and return its length."""
+        # Exponential backoff with jitter: base * 2^attempt + random(0-3s)
+        wait = RETRY_DELAY * (2 ** attempt) + random.uniform(0, 3)
+        self.until = max(self.until, time.monotonic() + wait)
+        return wait
+
+    def remaining(self):
+        return max(0.0, self.until - time.monotonic())
+
+
+TRENDS_COOLDOWN = RateLimitCooldown()
+
+
+def _is_rate_limited(error):
+    error_str = str(error)
+    return 'Too Many Requests' in error_str or '429' in error_str
+
+
+def _with_retries(fetch):
+    """Run a pytrends fetch, retrying 429s under the shared cooldown; other errors become {"error": ...}."""
     for attempt in range(MAX_RETRIES):
+        time.sleep(TRENDS_COOLDOWN.remaining())
         try:
-            pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo=region, gprop='')
-            df = pytrends.interest_over_time()
-            
-            if df.empty:
-                return {"error": "No data returned", "keywords": keywords, "region": region}
-                
-            # Convert date index to string
-            if 'isPartial' in df.columns:
-                df = df.drop(columns=['isPartial'])
-                
-            result = json.loads(df.to_json(orient='index', date_format='iso'))
-            return {"data": result, "keywords": keywords, "region": region or "worldwide"}
-            
+            return fetch()
         except Exception as e:
-            error_str = str(e)
-            if 'Too Many Requests' in error_str or '429' in error_str:
-                if attempt < MAX_RETRIES - 1:
-                    # Exponential backoff with jitter: base * 2^attempt + random(0-3s)
-                    wait = RETRY_DELAY * (2 ** attempt) + random.uniform(0, 3)
-                    print(f"[GoogleTrends] Rate limited, waiting {wait:.1f}s (attempt {attempt+1}/{MAX_RETRIES})", file=sys.stderr)
-                    time.sleep(wait)
-                    continue
-            return {"error": error_str}
+            if _is_rate_limited(e) and attempt < MAX_RETRIES - 1:
+                wait = TRENDS_COOLDOWN.backoff(attempt)
+                print(f"[GoogleTrends] Rate limited, waiting {wait:.1f}s (attempt {attempt+1}/{MAX_RETRIES})", file=sys.stderr)
+                continue
+            return {"error": str(e)}
     return {"error": "Max retries exceeded"}
 
 
-def get_related_queries(pytrends, keywords, region='', timeframe='today 12-m'):
-    """Fetch related queries (rising and top)."""
-    for attempt in range(MAX_RETRIES):
-        try:
-            pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo=region, gprop='')
-            related = pytrends.related_queries()
+def _clean_related(related):
+    cleaned_result = {}
+    for kw, data in related.items():
+        cleaned_result[kw] = {}
+        if data.get('top') is not None:
+            cleaned_result[kw]['top'] = _records(data['top'])
+        if data.get('rising') is not None:
+            cleaned_result[kw]['rising'] = _records(data['rising'])
+    return cleaned_result
+
+
+def get_interest_over_time(pytrends, keywords, region='', timeframe='today 12-m'):
+    """Fetch interest over time for up to 5 keywords."""
+    def fetch():
+        pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo=region, gprop='')
+        df = pytrends.interest_over_time()
+        
+        if df.empty:
+            return {"error": "No data returned", "keywords": keywords, "region": region}
             
-            cleaned_result = {}
-            for kw, data in related.items():
-                cleaned_result[kw] = {}
-                if data.get('top') is not None:
-                    cleaned_result[kw]['top'] = json.loads(data['top'].to_json(orient='records'))
-                if data.get('rising') is not None:
-                    cleaned_result[kw]['rising'] = json.loads(data['rising'].to_json(orient='records'))
-                    
-            return {"data": cleaned_result, "keywords": keywords, "region": region or "worldwide"}
+        # Convert date index to string
+        if 'isPartial' in df.columns:
+            df = df.drop(columns=['isPartial'])
             
-        except Exception as e:
-            error_str = str(e)
-            if 'Too Many Requests' in error_str or '429' in error_str:
-                if attempt < MAX_RETRIES - 1:
-                    # Exponential backoff with jitter
-                    wait = RETRY_DELAY * (2 ** attempt) + random.uniform(0, 3)
-                    print(f"[GoogleTrends] Rate limited, waiting {wait:.1f}s", file=sys.stderr)
-                    time.sleep(wait)
-                    continue
-            return {"error": error_str}
-    return {"error": "Max retries exceeded"}
+        result = {ts.strftime(ISO_DATE_FORMAT): row for ts, row in df.to_dict(orient='index').items()}
+        return {"data": result, "keywords": keywords, "region": region or "worldwide"}
+
+    return _with_retries(fetch)
+
+
+def get_related_queries(pytrends, keywords, region='', timeframe='today 12-m'):
+    """Fetch related queries (rising and top)."""
+    def fetch():
+        pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo=region, gprop='')
+        cleaned_result = _clean_related(pytrends.related_queries())
+        return {"data": cleaned_result, "keywords": keywords, "region": region or "worldwide"}
+
+    return _with_retries(fetch)
 
 
 def get_related_topics(pytrends, keywords, region='', timeframe='today 12-m'):
     """Fetch related topics (rising and top)."""
+    def fetch():
+        pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo=region, gprop='')
+        cleaned_result = _clean_related(pytrends.related_topics())
+        return {"data": cleaned_result, "keywords": keywords, "region": region or "worldwide"}
+
+    return _with_retries(fetch)
+
+
+def _build_async_http_client() -> httpx.AsyncClient:
+    # One client for the whole run, so the NID cookie from the explore page rides on every call
+    options = dict(headers={'accept-language': TRENDS_HL}, timeout=HTTP_TIMEOUT, follow_redirects=True)
+    try:
+        return httpx.AsyncClient(http2=True, **options)
+    except ImportError:
+        # http2 needs the optional h2 package; keep-alive still applies
+        return httpx.AsyncClient(**options)
+
+
+async def _fetch_trends_json(client, method, url, params, trim_chars):
+    """Call a Trends endpoint, strip its anti-JSON-hijacking prefix, and back off on 429."""
     for attempt in range(MAX_RETRIES):
-        try:
-            pytrends.build_payload(keywords, cat=0, timeframe=timeframe, geo=region, gprop='')
-            topics = pytrends.related_topics()
-            
-            cleaned_result = {}
-            for kw, data in topics.items():
-                cleaned_result[kw] = {}
-                if data.get('top') is not None:
-                    cleaned_result[kw]['top'] = json.loads(data['top'].to_json(orient='records'))
-                if data.get('rising') is not None:
-                    cleaned_result[kw]['rising'] = json.loads(data['rising'].to_json(orient='records'))
-                    
-            return {"data": cleaned_result, "keywords": keywords, "region": region or "worldwide"}
-            
-        except Exception as e:
-            error_str = str(e)
-            if 'Too Many Requests' in error_str or '429' in error_str:
-                if attempt < MAX_RETRIES - 1:
-                    # Exponential backoff with jitter
-                    wait = RETRY_DELAY * (2 ** attempt) + random.uniform(0, 3)
-                    time.sleep(wait)
-                    continue
-            return {"error": error_str}
-    return {"error": "Max retries exceeded"}
+        # A 429 on any sibling request pauses this one too; asyncio.sleep keeps the loop free meanwhile
+        await asyncio.sleep(TRENDS_COOLDOWN.remaining())
+        response = await client.request(method, url, params=params)
+        if response.status_code == 429 and attempt < MAX_RETRIES - 1:
+            wait = TRENDS_COOLDOWN.backoff(attempt)
+            print(f"[GoogleTrends] Rate limited, waiting {wait:.1f}s (attempt {attempt+1}/{MAX_RETRIES})", file=sys.stderr)
+            continue
+        if response.status_code != 200:
+            raise RuntimeError(f"The request failed: Google returned a response with code {response.status_code}")
+        body = response.text[trim_chars:]
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+    raise RuntimeError("Max retries exceeded")
+
+
+async def _fetch_widgets(client, keywords, region, timeframe):
+    """One explore call returns the tokens for interest over time and every related widget."""
+    await client.get(f'{TRENDS_BASE_URL}/explore/', params={'geo': TRENDS_HL[-2:]})
+    req = {
+        'comparisonItem': [{'keyword': kw, 'time': timeframe, 'geo': region} for kw in keywords],
+        'category': 0,
+        'property': '',
+    }
+    params = {'hl': TRENDS_HL, 'tz': TRENDS_TZ, 'req': json.dumps(req)}
+    data = await _fetch_trends_json(client, 'POST', TRENDS_EXPLORE_URL, params, trim_chars=4)
+    return data['widgets']
+
+
+def _widget_params(widget):
+    return {'req': json.dumps(widget['request']), 'token': widget['token'], 'tz': TRENDS_TZ}
+
+
+def _widget_keyword(widget):
+    try:
+        return widget['request']['restriction']['complexKeywordsRestriction']['keyword'][0]['value']
+    except (KeyError, IndexError):
+        return ''
+
+
+async def _fetch_interest(client, widget, keywords):
+    data = await _fetch_trends_json(client, 'GET', TRENDS_MULTILINE_URL, _widget_params(widget), trim_chars=5)
+    timeline = sorted(data['default']['timelineData'], key=lambda point: int(point['time']))
+    if not timeline:
+        return {"error": "No data returned"}
+    return {
+        datetime.fromtimestamp(int(point['time']), timezone.utc).strftime(ISO_DATE_FORMAT):
+            dict(zip(keywords, point['value']))
+        for point in timeline
+    }
+
+
+def _flatten(row, prefix=''):
+    """Nested dicts to '_'-joined keys, as pd.json_normalize(sep='_') did for topics."""
+    flat = {}
+    for key, value in row.items():
+        name = f'{prefix}{key}'
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{name}_'))
+        else:
+            flat[name] = value
+    return flat
+
+
+async def _fetch_related(client, widgets, kind):
+    """Top/rising lists for each keyword; kind is 'queries' or 'topics'."""
+    async def fetch(widget):
+        data = await _fetch_trends_json(client, 'GET', TRENDS_RELATED_URL, _widget_params(widget), trim_chars=5)
+        ranked = data['default']['rankedList']
+        entry = {}
+        for name, index in (('top', 0), ('rising', 1)):
+            try:
+                rows = ranked[index]['rankedKeyword']
+            except (KeyError, IndexError):
+                continue
+            if kind == 'queries':
+                # pytrends dropped empty query lists entirely
+                if rows:
+                    entry[name] = [{'query': r['query'], 'value': r['value']} for r in rows]
+            else:
+                entry[name] = [_flatten(r) for r in rows]
+        return _widget_keyword(widget), entry
 
+    return dict(await asyncio.gather(*(fetch(widget) for widget in widgets)))
 
-def comprehensive_trends(pytrends, keywords, region='', timeframe='today 12-m'):
-    """Get all trend data in one call (interest, queries, topics)."""
+
+async def comprehensive_trends(keywords, region='', timeframe='today 12-m'):
+    """Get all trend data in one call (interest, queries, topics), fetched concurrently."""
     result = {
         "keywords": keywords,
         "region": region or "worldwide",
@@ -127,30 +258,34 @@ def comprehensive_trends(pytrends, keywords, region='', timeframe='today 12-m'):
         "related_queries": {},
         "related_topics": {}
     }
-    
-    # Interest over time
-    interest = get_interest_over_time(pytrends, keywords, region, timeframe)
-    if "data" in interest:
-        result["interest_over_time"] = interest["data"]
-    elif "error" in interest:
-        result["interest_over_time"] = {"error": interest["error"]}
-    
-    # Related queries
-    time.sleep(random.uniform(3, 7))
-    queries = get_related_queries(pytrends, keywords, region, timeframe)
-    if "data" in queries:
-        result["related_queries"] = queries["data"]
-    elif "error" in queries:
-        result["related_queries"] = {"error": queries["error"]}
-    
-    # Related topics
-    time.sleep(random.uniform(3, 7))
-    topics = get_related_topics(pytrends, keywords, region, timeframe)
-    if "data" in topics:
-        result["related_topics"] = topics["data"]
-    elif "error" in topics:
-        result["related_topics"] = {"error": topics["error"]}
-    
+
+    async with _build_async_http_client() as client:
+        try:
+            widgets = await _fetch_widgets(client, keywords, region, timeframe)
+        except Exception as e:
+            for section in ("interest_over_time", "related_queries", "related_topics"):
+                result[section] = {"error": str(e)}
+            return result
+
+        timeseries = next((w for w in widgets if w['id'] == 'TIMESERIES'), None)
+        query_widgets = [w for w in widgets if 'RELATED_QUERIES' in w['id']]
+        topic_widgets = [w for w in widgets if 'RELATED_TOPICS' in w['id']]
+
+        async def interest():
+            if timeseries is None:
+                return {"error": "No data returned"}
+            return await _fetch_interest(client, timeseries, keywords)
+
+        # The explore call already issued every token, so the three sections share nothing but the client
+        sections = await asyncio.gather(
+            interest(),
+            _fetch_related(client, query_widgets, 'queries'),
+            _fetch_related(client, topic_widgets, 'topics'),
+            return_exceptions=True,
+        )
+
+    for section, data in zip(("interest_over_time", "related_queries", "related_topics"), sections):
+        result[section] = {"error": str(data)} if isinstance(data, Exception) else data
     return result
 
 
@@ -182,12 +317,21 @@ def main():
         keywords = keywords[:5]
         print(f"[GoogleTrends] Warning: Limited to first 5 keywords", file=sys.stderr)
 
-    # Initialize pytrends without internal retry (we handle it manually to avoid urllib3 issues)
-    try:
-        pytrends = TrendReq(hl='en-US', tz=360, timeout=(10, 30))
-    except Exception as e:
-        print(json.dumps({"error": f"Failed to init pytrends: {str(e)}"}))
-        sys.exit(1)
+    fetchers = {
+        'interest_over_time': get_interest_over_time,
+        'related_queries': get_related_queries,
+        'related_topics': get_related_topics,
+    }
+
+    # comprehensive talks to the endpoints itself; only the single-section actions need a pytrends session
+    pytrends = None
+    if action in fetchers:
+        # Initialize pytrends without internal retry (we handle it manually to avoid urllib3 issues)
+        try:
+            pytrends = TrendReq(hl=TRENDS_HL, tz=TRENDS_TZ, timeout=(10, 30))
+        except Exception as e:
+            print(json.dumps({"error": f"Failed to init pytrends: {str(e)}"}))
+            sys.exit(1)
 
     # Random delay to avoid rate limiting
     time.sleep(random.uniform(2, 5))
@@ -195,18 +339,14 @@ def main():
     print(f"[GoogleTrends] Action: {action}, Region: {region or 'worldwide'}, Keywords: {keywords}", file=sys.stderr)
 
     result = {}
-    if action == 'interest_over_time':
-        result = get_interest_over_time(pytrends, keywords, region)
-    elif action == 'related_queries':
-        result = get_related_queries(pytrends, keywords, region)
-    elif action == 'related_topics':
-        result = get_related_topics(pytrends, keywords, region)
+    if action in fetchers:
+        result = fetchers[action](pytrends, keywords, region)
     elif action == 'comprehensive':
-        result = comprehensive_trends(pytrends, keywords, region)
+        result = asyncio.run(comprehensive_trends(keywords, region))
     else:
         result = {"error": f"Unknown action: {action}"}
 
-    print(json.dumps(result))
+    _write_json(result)
 
 
 if __name__ == "__main__":
@@ -158,9 +158,20 @@ def check_ytdlp_installed() -> bool:
         return False
 
 
-def _run_ddg_text_query(query: str, max_results: int = 10):
+# One DDGS per proxy, reused across fallback queries so connections stay alive (the CLI is single-threaded)
+_DDGS_CLIENTS = {}
+
+
+def _ddgs_client(proxy_url: Optional[str]):
     from ddgs import DDGS
 
+    client = _DDGS_CLIENTS.get(proxy_url)
+    if client is None:
+        client = _DDGS_CLIENTS[proxy_url] = DDGS(proxy=proxy_url) if proxy_url else DDGS()
+    return client
+
+
+def _run_ddg_text_query(query: str, max_results: int = 10):
     attempts = MAX_PROXY_RETRIES if SELF_ROTATION_DISABLED or PROXY_ROTATOR.has_proxies() else 1
     last_error = None
 
@@ -168,13 +179,14 @@ def _run_ddg_text_query(query: str, max_results: int = 10):
         proxy_url = _effective_proxy_url() if SELF_ROTATION_DISABLED else PROXY_ROTATOR.get_next_proxy_url()
         proxy_label = redact_proxy_url(proxy_url) if proxy_url else "direct"
         try:
-            ddgs = DDGS(proxy=proxy_url) if proxy_url else DDGS()
-            results = list(ddgs.text(query, max_results=max_results))
+            results = list(_ddgs_client(proxy_url).text(query, max_results=max_results))
             if proxy_url and not SELF_ROTATION_DISABLED:
                 PROXY_ROTATOR.mark_success(proxy_url)
             return results
         except Exception as exc:
             last_error = exc
+            # The failed client may hold a broken connection; the retry starts a fresh one
+            _DDGS_CLIENTS.pop(proxy_url, None)
             if proxy_url and not SELF_ROTATION_DISABLED:
                 PROXY_ROTATOR.mark_failed(proxy_url)
             retryable = is_retryable_proxy_error(exc)
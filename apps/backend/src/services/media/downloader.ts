@@ -38,6 +38,7 @@ async function resolveInstagramMediaViaCamoufox(sourceUrl: string): Promise<{
       executable: 'python3',
       scriptFileName: 'camoufox_insta_downloader.py',
       args: [sourceUrl],
+      worker: { op: 'instagram_media', args: { post_url: sourceUrl } },
       timeoutMs: 90_000,
       maxBufferBytes: 6 * 1024 * 1024,
       maxAttempts: Number(process.env.INSTAGRAM_MEDIA_RESOLVE_ATTEMPTS || 2),
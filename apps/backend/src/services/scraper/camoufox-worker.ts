@@ -0,0 +1,254 @@
+import { ChildProcessWithoutNullStreams, spawn } from 'child_process';
+import { createInterface } from 'readline';
+
+/**
+ * Long-lived camoufox_worker.py processes, pooled per proxy target and env, so the
+ * Camoufox browser launch is paid once instead of on every scrape/download.
+ * Each worker serves one request at a time; when none is idle the caller runs
+ * the one-shot script instead of queueing.
+ */
+
+export type CamoufoxWorkerOp = 'instagram_profile' | 'instagram_media' | 'tiktok_profile' | 'tiktok_download';
+
+export type CamoufoxWorkerRequest = {
+  op: CamoufoxWorkerOp;
+  args: Record<string, unknown>;
+};
+
+type PendingRequest = {
+  resolve: (value: unknown) => void;
+  reject: (error: Error) => void;
+  timer: NodeJS.Timeout;
+};
+
+export const CAMOUFOX_WORKER_SCRIPT = 'camoufox_worker.py';
+
+const CAMOUFOX_WORKER_MAX = Math.max(1, Number.parseInt(process.env.CAMOUFOX_WORKER_MAX || '4', 10) || 4);
+const CAMOUFOX_WORKER_PER_KEY = Math.max(
+  1,
+  Number.parseInt(process.env.CAMOUFOX_WORKER_PER_KEY || '2', 10) || 2
+);
+
+/** No worker could take the request (failed to start, died or all busy); callers fall back to a one-shot script run. */
+export class CamoufoxWorkerUnavailableError extends Error {
+  constructor(message: string) {
+    super(message);
+    this.name = 'CamoufoxWorkerUnavailableError';
+  }
+}
+
+export function isCamoufoxWorkerEnabled(): boolean {
+  return String(process.env.CAMOUFOX_WORKER_ENABLED || 'true').trim().toLowerCase() !== 'false';
+}
+
+/** Mirrors the exit-code rule of the one-shot scripts, so failed results still trigger proxy retries. */
+function isFailedResult(op: CamoufoxWorkerOp, result: any): boolean {
+  if (!result || typeof result !== 'object') return true;
+  if (op === 'instagram_profile') return 'error' in result;
+  return !result.success;
+}
+
+class CamoufoxWorker {
+  private child: ChildProcessWithoutNullStreams | null = null;
+  private nextId = 1;
+  private readonly pending = new Map<number, PendingRequest>();
+  // The Python side handles one request at a time; the pool only hands out idle workers
+  busy = false;
+  // Set once the current child answers; exiting before that means it could not start
+  private responded = false;
+
+  constructor(
+    private readonly executable: string,
+    private readonly scriptPath: string,
+    private readonly cwd: string,
+    private readonly env: NodeJS.ProcessEnv,
+    private readonly onStartFailure: () => void
+  ) {}
+
+  async request<T>(request: CamoufoxWorkerRequest, timeoutMs: number): Promise<T> {
+    this.busy = true;
+    try {
+      return await this.send<T>(request, timeoutMs);
+    } finally {
+      this.busy = false;
+    }
+  }
+
+  stop(): void {
+    const child = this.child;
+    this.child = null;
+    if (child) child.kill();
+  }
+
+  private send<T>(request: CamoufoxWorkerRequest, timeoutMs: number): Promise<T> {
+    const child = this.start();
+    const id = this.nextId++;
+    return new Promise<T>((resolve, reject) => {
+      const timer = setTimeout(() => {
+        this.pending.delete(id);
+        reject(new Error(`camoufox worker ${request.op} timed out after ${timeoutMs}ms`));
+        // A stuck browser would block every later request
+        this.stop();
+      }, timeoutMs);
+      this.pending.set(id, { resolve: resolve as (value: unknown) => void, reject, timer });
+      child.stdin.write(`${JSON.stringify({ id, op: request.op, args: request.args })}\n`);
+    });
+  }
+
+  private start(): ChildProcessWithoutNullStreams {
+    if (this.child) return this.child;
+
+    const child = spawn(this.executable, [this.scriptPath], {
+      cwd: this.cwd,
+      env: this.env,
+      stdio: ['pipe', 'pipe', 'pipe'],
+    });
+    this.responded = false;
+    // stderr is diagnostics only; drain it so the pipe never fills
+    child.stderr.resume();
+    createInterface({ input: child.stdout }).on('line', (line) => this.handleLine(line));
+    // A child replaced after stop() must not fail requests already sent to its successor
+    child.stdin.on('error', (error) => {
+      if (this.child !== child) return;
+      this.failPending(new CamoufoxWorkerUnavailableError(`camoufox worker stdin closed: ${error.message}`));
+    });
+    child.on('error', (error) => {
+      if (this.child !== child) return;
+      this.child = null;
+      this.onStartFailure();
+      this.failPending(new CamoufoxWorkerUnavailableError(`camoufox worker failed to start: ${error.message}`));
+    });
+    child.on('exit', (code, signal) => {
+      if (this.child !== child) return;
+      this.child = null;
+      if (!this.responded) this.onStartFailure();
+      this.failPending(new CamoufoxWorkerUnavailableError(`camoufox worker exited (code=${code}, signal=${signal})`));
+    });
+
+    this.child = child;
+    return child;
+  }
+
+  private handleLine(line: string): void {
+    let message: { id?: number; result?: unknown };
+    try {
+      message = JSON.parse(line);
+    } catch {
+      return;
+    }
+    const pending = typeof message.id === 'number' ? this.pending.get(message.id) : undefined;
+    if (!pending) return;
+    this.responded = true;
+    this.pending.delete(message.id as number);
+    clearTimeout(pending.timer);
+    pending.resolve(message.result);
+  }
+
+  private failPending(error: Error): void {
+    for (const [id, pending] of this.pending) {
+      clearTimeout(pending.timer);
+      pending.reject(error);
+      this.pending.delete(id);
+    }
+  }
+}
+
+const pools = new Map<string, CamoufoxWorker[]>();
+// Keys whose worker exited before answering (e.g. camoufox missing); retrying would fail every call
+const unavailableKeys = new Set<string>();
+
+process.once('exit', () => {
+  for (const pool of pools.values()) {
+    for (const worker of pool) worker.stop();
+  }
+});
+
+/** Env entries that differ from process.env: proxy target, proxy scope/attempt and extraEnv. */
+function envKey(env: NodeJS.ProcessEnv): string {
+  const names = new Set([...Object.keys(env), ...Object.keys(process.env)]);
+  const entries: string[] = [];
+  for (const name of names) {
+    if (env[name] !== process.env[name]) entries.push(`${name}=${env[name] ?? ''}`);
+  }
+  return entries.sort().join('\n');
+}
+
+function workerCount(): number {
+  let count = 0;
+  for (const pool of pools.values()) count += pool.length;
+  return count;
+}
+
+function removeWorker(key: string, worker: CamoufoxWorker): void {
+  const pool = pools.get(key);
+  if (!pool) return;
+  const index = pool.indexOf(worker);
+  if (index >= 0) pool.splice(index, 1);
+  if (!pool.length) pools.delete(key);
+}
+
+/** Stop the oldest idle worker of any key; busy workers are never evicted. */
+function evictIdleWorker(): boolean {
+  for (const [key, pool] of pools) {
+    const idle = pool.find((worker) => !worker.busy);
+    if (idle) {
+      idle.stop();
+      removeWorker(key, idle);
+      return true;
+    }
+  }
+  return false;
+}
+
+function markUnavailable(key: string, failed: CamoufoxWorker): void {
+  unavailableKeys.add(key);
+  removeWorker(key, failed);
+  for (const worker of [...(pools.get(key) || [])]) {
+    if (worker.busy) continue;
+    worker.stop();
+    removeWorker(key, worker);
+  }
+}
+
+function acquireWorker(executable: string, scriptPath: string, cwd: string, env: NodeJS.ProcessEnv): CamoufoxWorker {
+  // Env is read at spawn (proxy at browser launch), so workers are only shared between identical envs
+  const key = `${scriptPath}\n${envKey(env)}`;
+  if (unavailableKeys.has(key)) {
+    throw new CamoufoxWorkerUnavailableError('camoufox worker failed to start earlier for this target');
+  }
+  const pool = pools.get(key) || [];
+  const idle = pool.find((worker) => !worker.busy);
+  if (idle) return idle;
+  if (pool.length >= CAMOUFOX_WORKER_PER_KEY) {
+    throw new CamoufoxWorkerUnavailableError(`all ${pool.length} camoufox workers for this target are busy`);
+  }
+  if (workerCount() >= CAMOUFOX_WORKER_MAX && !evictIdleWorker()) {
+    throw new CamoufoxWorkerUnavailableError(`all ${CAMOUFOX_WORKER_MAX} camoufox workers are busy`);
+  }
+  const worker: CamoufoxWorker = new CamoufoxWorker(executable, scriptPath, cwd, env, () =>
+    markUnavailable(key, worker)
+  );
+  pool.push(worker);
+  pools.set(key, pool);
+  return worker;
+}
+
+export async function runCamoufoxWorkerRequest<T>(options: {
+  executable: string;
+  scriptPath: string;
+  cwd: string;
+  env: NodeJS.ProcessEnv;
+  request: CamoufoxWorkerRequest;
+  timeoutMs: number;
+}): Promise<T> {
+  const worker = acquireWorker(options.executable, options.scriptPath, options.cwd, options.env);
+  const result = await worker.request<T>(options.request, options.timeoutMs);
+  if (isFailedResult(options.request.op, result)) {
+    const reason = String((result as any)?.error || 'no result');
+    const error: any = new Error(`camoufox worker ${options.request.op} failed: ${reason}`);
+    error.stdout = JSON.stringify(result);
+    error.stderr = reason;
+    throw error;
+  }
+  return result;
+}
@@ -560,6 +560,7 @@ export async function scrapeInstagramProfile(
       executable: 'python3',
       scriptFileName: 'camoufox_instagram_scraper.py',
       args: [cleanHandle, String(postsLimit)],
+      worker: { op: 'instagram_profile', args: { handle: cleanHandle, posts_limit: postsLimit } },
       timeoutMs: 300_000,
       maxBufferBytes: 10 * 1024 * 1024,
       maxAttempts: Number(process.env.INSTAGRAM_CAMOUFOX_SCRAPE_ATTEMPTS || 2),
@@ -12,6 +12,13 @@ import {
   resolveAllowDirectForScope,
   RotatingProxyPool,
 } from '../network/proxy-rotation';
+import {
+  CAMOUFOX_WORKER_SCRIPT,
+  CamoufoxWorkerRequest,
+  CamoufoxWorkerUnavailableError,
+  isCamoufoxWorkerEnabled,
+  runCamoufoxWorkerRequest,
+} from './camoufox-worker';
 
 const execFileAsync = promisify(execFile);
 
@@ -46,6 +53,8 @@ type RunScriptJsonOptions = {
   proxyPool?: RotatingProxyPool;
   proxyPolicy?: Partial<ScriptRunnerProxyPolicy>;
   extraEnv?: Record<string, string | undefined>;
+  /** Serve the call from a long-lived camoufox_worker.py when enabled; the script is the fallback. */
+  worker?: CamoufoxWorkerRequest;
 };
 
 function normalizePositiveInt(value: number, fallback: number): number {
@@ -185,6 +194,25 @@ export async function runScriptJsonWithRetries<T>(
           }
         }
 
+        const workerScriptPath =
+          options.worker && isCamoufoxWorkerEnabled() ? resolveBackendScriptPath(CAMOUFOX_WORKER_SCRIPT) : null;
+        if (options.worker && workerScriptPath) {
+          try {
+            const parsed = await runCamoufoxWorkerRequest<T>({
+              executable: options.executable,
+              scriptPath: workerScriptPath,
+              cwd: options.cwd || process.cwd(),
+              env: envWithProxy,
+              request: options.worker,
+              timeoutMs: options.timeoutMs || 120_000,
+            });
+            return { stdout: JSON.stringify(parsed), stderr: '', parsed };
+          } catch (error: any) {
+            if (!(error instanceof CamoufoxWorkerUnavailableError)) throw error;
+            console.log(`[${options.label}] ${error.message}, running ${options.scriptFileName} directly`);
+          }
+        }
+
         const { stdout, stderr } = await execFileAsync(
           options.executable,
           [...(options.scriptArgsPrefix || []), scriptPath, ...(options.args || [])],
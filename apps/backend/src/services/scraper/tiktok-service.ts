@@ -76,6 +76,7 @@ export async function scrapeTikTokProfile(
       executable: 'python3',
       scriptFileName: 'camoufox_tiktok_scraper.py',
       args: ['profile', cleanHandle, String(maxVideos)],
+      worker: { op: 'tiktok_profile', args: { handle: cleanHandle, max_videos: maxVideos } },
       timeoutMs: 180_000,
       maxBufferBytes: 50 * 1024 * 1024,
       maxAttempts: Number(process.env.TIKTOK_CAMOUFOX_SCRAPE_ATTEMPTS || 2),
@@ -135,6 +136,7 @@ export async function downloadTikTokVideo(
       executable: 'python3',
       scriptFileName: 'camoufox_tiktok_downloader.py',
       args: [videoUrl, outputPath],
+      worker: { op: 'tiktok_download', args: { url: videoUrl, output_path: outputPath } },
       timeoutMs: 300_000,
       maxAttempts: Number(process.env.TIKTOK_CAMOUFOX_DOWNLOAD_ATTEMPTS || 2),
       proxyPool: tiktokDownloaderProxyPool,